@@ -0,0 +1,119 @@
+import os
+import json
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+from scipy import sparse
+from langchain_core.documents import Document as LangChainDocument
+
+from .rag_config import RAGConfig
+from .tokenizer import tokenize_many
+
+
+def top_k_indices(scores: np.ndarray, k: int) -> np.ndarray:
+    """점수 상위 k개 인덱스 (내림차순). 전체 정렬 대신 argpartition."""
+    k = min(k, len(scores))
+    if k <= 0:
+        return np.zeros(0, dtype=np.int64)
+    idx = np.argpartition(-scores, k - 1)[:k]
+    return idx[np.argsort(-scores[idx], kind="stable")]
+
+
+class SparseBM25:
+    """
+    문장 × 단어 CSR 행렬에 BM25 가중치를 미리 계산해 둔 인덱스.
+    - 행렬 값 = idf(t) · tf·(k1+1) / (tf + k1·(1 - b + b·dl/avgdl))
+      → 질의 점수는 희소 행렬 × 질의 단어 벡터 한 번으로 끝남 (문장별 파이썬 루프 없음)
+    - idf = log(1 + (N - df + 0.5) / (df + 0.5)) (Lucene 방식, 항상 양수)
+    - save()/load(): data/indices/indptr를 .npy로 저장해 np.load(mmap_mode="r")로 바로 매핑
+    """
+
+    _ARRAYS = ("data", "indices", "indptr")
+
+    def __init__(self, matrix: sparse.csr_matrix, vocab: Dict[str, int]):
+        self.matrix = matrix
+        self.vocab = vocab
+
+    @classmethod
+    def from_tokens(cls, corpus: Iterable[List[str]], k1: float = RAGConfig.BM25_K1,
+                    b: float = RAGConfig.BM25_B) -> "SparseBM25":
+        vocab: Dict[str, int] = {}
+        indptr = [0]
+        indices: List[int] = []
+        counts: List[int] = []
+        for tokens in corpus:
+            tf: Dict[int, int] = {}
+            for t in tokens:
+                col = vocab.setdefault(t, len(vocab))
+                tf[col] = tf.get(col, 0) + 1
+            indices.extend(tf.keys())
+            counts.extend(tf.values())
+            indptr.append(len(indices))
+
+        n_docs = len(indptr) - 1
+        indptr_arr = np.asarray(indptr, dtype=np.int64)
+        indices_arr = np.asarray(indices, dtype=np.int32)
+        tf_arr = np.asarray(counts, dtype=np.float32)
+
+        # 누적합 차분으로 문장 길이 (빈 문장 — 기호/이모지만 있는 줄 — 은 0, 끝이나 전부 비어 있어도 안전)
+        cum = np.concatenate(([0.0], np.cumsum(tf_arr, dtype=np.float64)))
+        doc_len = (cum[indptr_arr[1:]] - cum[indptr_arr[:-1]]).astype(np.float32)
+        avgdl = float(doc_len.mean()) if n_docs and doc_len.sum() > 0 else 1.0
+        df = np.bincount(indices_arr, minlength=len(vocab)).astype(np.float32)
+        idf = np.log1p((n_docs - df + 0.5) / (df + 0.5)).astype(np.float32)
+
+        norm = k1 * (1 - b + b * doc_len / avgdl)
+        row_norm = np.repeat(norm, np.diff(indptr_arr))
+        data = idf[indices_arr] * tf_arr * (k1 + 1) / (tf_arr + row_norm)
+
+        matrix = sparse.csr_matrix((data.astype(np.float32), indices_arr, indptr_arr),
+                                   shape=(n_docs, len(vocab)))
+        return cls(matrix, vocab)
+
+    def __len__(self) -> int:
+        return self.matrix.shape[0]
+
+    def _query_vector(self, tokens: List[str]) -> Optional[np.ndarray]:
+        cols = [self.vocab[t] for t in tokens if t in self.vocab]
+        if not cols:
+            return None
+        # 같은 단어가 질의에 두 번 나오면 두 번 더함 (rank_bm25와 같은 방식)
+        return np.bincount(cols, minlength=self.matrix.shape[1]).astype(np.float32)
+
+    def get_scores(self, tokens: List[str]) -> np.ndarray:
+        """모든 문장의 BM25 점수 (희소 행렬 × 질의 벡터)."""
+        q = self._query_vector(tokens)
+        if q is None:
+            return np.zeros(len(self), dtype=np.float32)
+        return self.matrix @ q
+
+    def search(self, tokens: List[str], k: int) -> np.ndarray:
+        """점수 > 0 인 상위 k개 문장 인덱스 (내림차순)."""
+        scores = self.get_scores(tokens)
+        idx = top_k_indices(scores, k)
+        return idx[scores[idx] > 0]
+
+    # ---------- 저장 / 로드 ----------
+    def save(self, path: str):
+        os.makedirs(path, exist_ok=True)
+        for name in self._ARRAYS:
+            np.save(os.path.join(path, f"{name}.npy"), getattr(self.matrix, name))
+        terms = [""] * len(self.vocab)
+        for t, col in self.vocab.items():
+            terms[col] = t
+        with open(os.path.join(path, "vocab.json"), "w", encoding="utf-8") as f:
+            json.dump({"shape": list(self.matrix.shape), "terms": terms}, f, ensure_ascii=False)
+
+    @classmethod
+    def load(cls, path: str, mmap: bool = True) -> "SparseBM25":
+        with open(os.path.join(path, "vocab.json"), encoding="utf-8") as f:
+            meta = json.load(f)
+        arrays = [np.load(os.path.join(path, f"{name}.npy"), mmap_mode="r" if mmap else None)
+                  for name in cls._ARRAYS]
+        matrix = sparse.csr_matrix(tuple(arrays), shape=tuple(meta["shape"]), copy=False)
+        return cls(matrix, {t: i for i, t in enumerate(meta["terms"])})
+
+
+def build_bm25(sentences: List[LangChainDocument]) -> SparseBM25:
+    """RAGConfig.BM25_K1/BM25_B와 한국어 토크나이저로 BM25 희소 인덱스 생성."""
+    return SparseBM25.from_tokens(tokenize_many(d.page_content for d in sentences))
@@ -6,6 +6,8 @@ from langchain_core.runnables import RunnableMap, RunnableLambda, RunnablePassth
 from langchain_openai import ChatOpenAI
 import os
 
+# 체인 공통 모델명 (LLM 결과 캐시 키에도 사용)
+DEFAULT_LLM_MODEL = "gpt-5-mini"
 
 
 def get_conversational_rag_chain(retriever, system_prompt):
@@ -13,7 +15,7 @@ def get_conversational_rag_chain(retriever, system_prompt):
     최종적으로 생성된 문장 단위의 출처를 사용하여 답변을 생성하는 RAG 체인을 구성합니다.
     """
     llm = ChatOpenAI(
-        model="gpt-5-mini",        # 🔑 nano 모델
+        model=DEFAULT_LLM_MODEL,   # 🔑 nano 모델
         temperature=1,
         api_key=os.getenv("OPENAI_API_KEY")
     )
@@ -73,7 +75,7 @@ def get_default_chain(system_prompt):
     )
     # ✅ OpenAI nano 계열 모델
     llm = ChatOpenAI(
-        model="gpt-5-mini",
+        model=DEFAULT_LLM_MODEL,
         temperature=1,
         api_key=os.getenv("OPENAI_API_KEY")
     )
@@ -1,60 +1,198 @@
+import os
+import time
 import asyncio
-import bs4
+import itertools
+from contextlib import asynccontextmanager
 from playwright.async_api import async_playwright
 from langchain_core.documents import Document as LangChainDocument
 
 from file_handler import get_documents_from_files
+from html_extract import extract_main_text
+from .rag_config import RAGConfig
 
-async def _scrape_url_with_playwright(url: str) -> list[LangChainDocument]:
+# 이미지/폰트/미디어는 텍스트 추출에 필요 없으므로 요청 단계에서 차단
+_BLOCKED_RESOURCE_TYPES = {"image", "font", "media"}
+
+
+def _tree_rss_mb() -> float:
+    """현재 프로세스 + 모든 하위 프로세스(Chromium 포함)의 RSS 합계(MB). /proc 없으면 자기 자신 peak."""
+    try:
+        me = os.getpid()
+        parent = {}
+        rss = {}
+        for pid in os.listdir("/proc"):
+            if not pid.isdigit():
+                continue
+            try:
+                with open(f"/proc/{pid}/stat", "rb") as f:
+                    fields = f.read().rsplit(b")", 1)[1].split()
+                parent[int(pid)] = int(fields[1])
+                rss[int(pid)] = int(fields[21]) * os.sysconf("SC_PAGE_SIZE")
+            except Exception:
+                continue
+        total = 0
+        for pid, nbytes in rss.items():
+            p = pid
+            while p and p != me and p in parent:
+                p = parent[p]
+            if p == me:
+                total += nbytes
+        return total / (1024 * 1024)
+    except Exception:
+        try:
+            import resource
+            return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+        except Exception:
+            return 0.0
+
+
+class _BrowserPool:
     """
-    Playwright를 사용하여 단일 URL의 동적 콘텐츠를 비동기적으로 스크래핑합니다.
+    Chromium 1개 + 재사용 컨텍스트 N개.
+    - 페이지 동시 오픈 수는 세마포어로 제한 (URL 30개여도 브라우저는 1개)
+    - 컨텍스트마다 이미지/폰트/미디어 요청 차단
+    - 실행 중 프로세스 트리 메모리를 주기적으로 샘플링해 peak 기록
+    """
+
+    def __init__(self, contexts: int = RAGConfig.BROWSER_CONTEXTS, max_pages: int = RAGConfig.BROWSER_MAX_PAGES):
+        self.n_contexts = max(1, contexts)
+        self.max_pages = max(1, max_pages)
+        self.peak_rss_mb = 0.0
+        self._sem = asyncio.Semaphore(self.max_pages)
+        self._contexts = []
+        self._rr = itertools.cycle(range(self.n_contexts))
+        self._pw = None
+        self._browser = None
+        self._sampler = None
+
+    async def __aenter__(self):
+        try:
+            self._pw = await async_playwright().start()
+            self._browser = await self._pw.chromium.launch(args=["--disable-dev-shm-usage", "--disable-gpu"])
+            for _ in range(self.n_contexts):
+                ctx = await self._browser.new_context()
+                self._contexts.append(ctx)
+                ctx.set_default_navigation_timeout(RAGConfig.PAGE_TIMEOUT_MS)
+                await ctx.route("**/*", self._route)
+            self._sampler = asyncio.create_task(self._sample_memory())
+        except BaseException:
+            # 일부만 시작된 상태(브라우저는 떴는데 컨텍스트 생성 실패 등)여도 정리
+            await self.__aexit__(None, None, None)
+            raise
+        return self
+
+    async def __aexit__(self, *exc):
+        if self._sampler:
+            self._sampler.cancel()
+            self._sampler = None
+        self.peak_rss_mb = max(self.peak_rss_mb, await asyncio.to_thread(_tree_rss_mb))
+        for ctx in self._contexts:
+            try:
+                await ctx.close()
+            except Exception:
+                pass
+        self._contexts = []
+        if self._browser:
+            try:
+                await self._browser.close()
+            except Exception:
+                pass
+            self._browser = None
+        if self._pw:
+            await self._pw.stop()
+            self._pw = None
+
+    @staticmethod
+    async def _route(route):
+        if route.request.resource_type in _BLOCKED_RESOURCE_TYPES:
+            await route.abort()
+        else:
+            await route.continue_()
+
+    async def _sample_memory(self):
+        while True:
+            # /proc 전체를 읽는 블로킹 작업이므로 이벤트 루프 밖(스레드)에서
+            self.peak_rss_mb = max(self.peak_rss_mb, await asyncio.to_thread(_tree_rss_mb))
+            await asyncio.sleep(0.5)
+
+    @asynccontextmanager
+    async def page(self):
+        async with self._sem:
+            page = await self._contexts[next(self._rr)].new_page()
+            try:
+                yield page
+            finally:
+                await page.close()
+
+
+async def _wait_content_stable(page):
+    """domcontentloaded 이후, 본문 텍스트 길이가 CONTENT_STABLE_MS 동안 변하지 않을 때까지 대기 (상한 있음)."""
+    interval = 0.25
+    need = max(1, int(RAGConfig.CONTENT_STABLE_MS / 1000 / interval))
+    deadline = time.monotonic() + RAGConfig.CONTENT_STABLE_MAX_MS / 1000
+    last, stable = -1, 0
+    while time.monotonic() < deadline:
+        try:
+            cur = await page.evaluate("document.body ? document.body.innerText.length : 0")
+        except Exception:
+            return
+        stable = stable + 1 if cur == last else 0
+        if stable >= need and cur > 0:
+            return
+        last = cur
+        await asyncio.sleep(interval)
+
+
+def _html_to_documents(url: str, title: str, html_content: str) -> list[LangChainDocument]:
+    # 불필요한 영역 제거 + 텍스트 밀도 점수로 본문 선택 (main/article/div.content/body 폴백은 html_extract에서 공유)
+    cleaned_text = extract_main_text(html_content, separator="\n")
+
+    if cleaned_text:
+        return [LangChainDocument(page_content=cleaned_text, metadata={"source": url, "title": title or "제목 없음"})]
+    return []
+
+
+async def _scrape_url_with_playwright(pool: _BrowserPool, url: str) -> list[LangChainDocument]:
+    """
+    브라우저 풀의 페이지 하나로 단일 URL의 동적 콘텐츠를 스크래핑합니다.
     """
     try:
-        async with async_playwright() as p:
-            browser = await p.chromium.launch()
-            page = await browser.new_page()
-            
-            # 네트워크가 안정될 때까지 기다려 동적 콘텐츠 로딩 보장
-            await page.goto(url, wait_until="networkidle") 
-            
+        async with pool.page() as page:
+            # networkidle 대신 DOM 로드 + 본문 안정화 대기 (광고/트래커 요청이 끝나길 기다리지 않음)
+            await page.goto(url, wait_until="domcontentloaded")
+            await _wait_content_stable(page)
+
             # 페이지 제목과 렌더링된 HTML 콘텐츠 가져오기
             title = await page.title()
             html_content = await page.content()
-            
-            await browser.close()
-
-            # BeautifulSoup으로 HTML 정제
-            soup = bs4.BeautifulSoup(html_content, "lxml")
-            
-            # 불필요한 태그 제거 (기존 로직 재사용)
-            for element in soup.select("script, style, nav, footer, aside, .ad, .advertisement, .banner, .menu, .header, .footer"):
-                element.decompose()
-
-            # 메인 콘텐츠 영역을 우선적으로 탐색하여 텍스트 추출
-            content_container = soup.find("main") or soup.find("article") or soup.find("div", class_="content") or soup.find("body")
-            cleaned_text = content_container.get_text(separator="\n", strip=True) if content_container else ""
-
-            if cleaned_text:
-                return [LangChainDocument(page_content=cleaned_text, metadata={"source": url, "title": title or "제목 없음"})]
-            return []
+
+        # 파싱은 CPU 작업 → 이벤트 루프 밖에서
+        return await asyncio.get_running_loop().run_in_executor(None, _html_to_documents, url, title, html_content)
     except Exception as e:
         print(f"Playwright로 URL 처리 실패 {url}: {e}")
         return []
 
 async def _get_documents_from_urls_async(urls: list[str]) -> list[LangChainDocument]:
     """
-    Playwright를 사용하여 여러 URL을 병렬로 크롤링하고 문서를 생성합니다.
+    브라우저 풀 하나로 여러 URL을 병렬(동시 페이지 수 제한) 크롤링하고 문서를 생성합니다.
     """
-    tasks = [_scrape_url_with_playwright(url) for url in urls]
-    results = await asyncio.gather(*tasks, return_exceptions=True)
-    
+    start = time.time()
+    async with _BrowserPool() as pool:
+        tasks = [_scrape_url_with_playwright(pool, url) for url in urls]
+        results = await asyncio.gather(*tasks, return_exceptions=True)
+
     all_documents = []
+    ok = 0
     for res in results:
         if isinstance(res, list):
             all_documents.extend(res)
+            ok += bool(res)
         elif isinstance(res, Exception):
             print(f"URL 처리 중 예외 발생: {res}")
-            
+
+    elapsed = max(time.time() - start, 1e-6)
+    print(f"[browser-pool] {ok}/{len(urls)} 페이지, {elapsed:.1f}초 ({len(urls) / elapsed:.2f} pages/s), "
+          f"peak RSS {pool.peak_rss_mb:.0f}MB (contexts={pool.n_contexts}, max_pages={pool.max_pages})")
     return all_documents
 
 async def load_documents(source_type: str, source_input) -> list[LangChainDocument]:
@@ -67,8 +205,7 @@ async def load_documents(source_type: str, source_input) -> list[LangChainDocume
         if not urls:
             print("입력된 URL이 없습니다.")
             return []
-        print(f"총 {len(urls)}개의 URL 병렬 크롤링 시작 (Playwright 사용)...")
-        # Playwright 기반의 새 함수 호출
+        print(f"총 {len(urls)}개의 URL 병렬 크롤링 시작 (Playwright 브라우저 풀 사용)...")
         documents = await _get_documents_from_urls_async(urls)
 
     elif source_type == "Files":
@@ -83,12 +220,12 @@ async def load_documents(source_type: str, source_input) -> list[LangChainDocume
                 documents.append(doc)
             except Exception as e:
                 print(f"Error reading .txt file {txt_file.name}: {e}")
-        
+
         if other_files:
             print(f"{len(other_files)}개의 파일(PDF, DOCX 등)을 LlamaParse로 분석합니다...")
             llama_documents = get_documents_from_files(other_files)
             if llama_documents:
                 langchain_docs = [LangChainDocument(page_content=doc.text, metadata=doc.metadata) for doc in llama_documents]
                 documents.extend(langchain_docs)
-    
+
     return documents
@@ -0,0 +1,191 @@
+import re
+import hashlib
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+from langchain_core.documents import Document as LangChainDocument
+
+from .rag_config import RAGConfig
+
+try:
+    import tiktoken
+    _ENCODER = tiktoken.get_encoding("cl100k_base")  # text-embedding-ada-002 토크나이저
+except Exception:
+    _ENCODER = None
+
+_WS_RE = re.compile(r"\s+")
+_NON_WORD_RE = re.compile(r"[\W_]+")
+# 문장 경계(구분자 보존): 종결부호 뒤 공백, 또는 줄바꿈
+_SENT_SPLIT_RE = re.compile(r"((?<=[.!?。])\s+|\n+)")
+_HASH_SEED = 0x5DEECE66D
+
+
+def count_tokens(text: str) -> int:
+    """임베딩 토큰 수 (tiktoken 없으면 문자 수/2로 추정)."""
+    if not text:
+        return 0
+    if _ENCODER is not None:
+        return len(_ENCODER.encode(text, disallowed_special=()))
+    return len(text) // 2
+
+
+class MinHasher:
+    """
+    문자 n-gram(shingle) 집합의 MinHash 서명.
+    - shingle 해시: 코드포인트 배열 위 다항식 롤링 해시 (numpy 벡터 연산)
+    - 순열: multiply-shift 해시 (a*x + b mod 2^64) >> 32
+    """
+
+    def __init__(self, num_perm: int = RAGConfig.DEDUP_NUM_PERM, shingle: int = RAGConfig.DEDUP_SHINGLE_CHARS):
+        self.num_perm = num_perm
+        self.shingle = shingle
+        rng = np.random.default_rng(_HASH_SEED)
+        self._a = (rng.integers(1, 2**63, size=(num_perm, 1), dtype=np.uint64) << np.uint64(1)) | np.uint64(1)
+        self._b = rng.integers(0, 2**63, size=(num_perm, 1), dtype=np.uint64)
+
+    def _shingle_hashes(self, text: str) -> np.ndarray:
+        norm = _WS_RE.sub(" ", text.lower()).strip()
+        cps = np.frombuffer(norm.encode("utf-32-le"), dtype=np.uint32).astype(np.uint64)
+        k = self.shingle
+        if len(cps) < k:
+            k = max(1, len(cps))
+        n = len(cps) - k + 1
+        if n <= 0:
+            return np.zeros(0, dtype=np.uint64)
+        h = np.zeros(n, dtype=np.uint64)
+        with np.errstate(over="ignore"):
+            for j in range(k):
+                h = h * np.uint64(1000003) + cps[j:j + n]
+        return np.unique(h)
+
+    def signature(self, text: str) -> np.ndarray:
+        sig = np.full(self.num_perm, np.iinfo(np.uint64).max, dtype=np.uint64)
+        hashes = self._shingle_hashes(text)
+        with np.errstate(over="ignore"):
+            # 긴 문서도 메모리 폭증 없이 블록 단위로 최소값 갱신
+            for start in range(0, len(hashes), 8192):
+                block = hashes[start:start + 8192]
+                permuted = (self._a * block + self._b) >> np.uint64(32)
+                np.minimum(sig, permuted.min(axis=1), out=sig)
+        return sig
+
+
+class MinHashLSH:
+    """밴드 단위 버킷으로 후보 쌍만 골라, 서명 일치율(추정 자카드)로 최종 판정."""
+
+    def __init__(self, num_perm: int = RAGConfig.DEDUP_NUM_PERM, bands: int = RAGConfig.DEDUP_LSH_BANDS,
+                 threshold: float = RAGConfig.DEDUP_JACCARD_THRESHOLD):
+        if num_perm % bands:
+            raise ValueError(f"num_perm({num_perm})은 bands({bands})의 배수여야 합니다.")
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.threshold = threshold
+        self._buckets: List[Dict[bytes, List[int]]] = [{} for _ in range(bands)]
+        self._sigs: List[np.ndarray] = []
+
+    def query(self, sig: np.ndarray) -> Optional[int]:
+        """이미 등록된 것 중 가장 비슷한 근사 중복의 번호 (없으면 None)."""
+        seen = set()
+        best, best_sim = None, self.threshold
+        for b in range(self.bands):
+            key = sig[b * self.rows:(b + 1) * self.rows].tobytes()
+            for idx in self._buckets[b].get(key, ()):
+                if idx in seen:
+                    continue
+                seen.add(idx)
+                sim = float(np.mean(self._sigs[idx] == sig))
+                if sim >= best_sim:
+                    best, best_sim = idx, sim
+        return best
+
+    def insert(self, sig: np.ndarray) -> int:
+        idx = len(self._sigs)
+        self._sigs.append(sig)
+        for b in range(self.bands):
+            key = sig[b * self.rows:(b + 1) * self.rows].tobytes()
+            self._buckets[b].setdefault(key, []).append(idx)
+        return idx
+
+
+def _sentence_key(sentence: str) -> bytes:
+    norm = _NON_WORD_RE.sub("", sentence.lower())
+    return hashlib.blake2b(norm.encode("utf-8"), digest_size=8).digest()
+
+
+def _drop_seen_sentences(text: str, seen: set) -> Tuple[str, int]:
+    """앞 문서에서 이미 나온 문장 제거 (남는 문장의 구분자는 그대로). 반환: (텍스트, 제거 문장 수)"""
+    parts = _SENT_SPLIT_RE.split(text)
+    out = []
+    dropped = 0
+    # parts = [문장, 구분자, 문장, 구분자, ..., 문장]
+    for i in range(0, len(parts), 2):
+        sent = parts[i]
+        sep = parts[i + 1] if i + 1 < len(parts) else ""
+        if len(sent.strip()) >= RAGConfig.DEDUP_MIN_SENTENCE_CHARS:
+            key = _sentence_key(sent)
+            if key in seen:
+                dropped += 1
+                continue
+            seen.add(key)
+        out.append(sent + sep)
+    return "".join(out).strip(), dropped
+
+
+def dedup_documents(documents: List[LangChainDocument], sentences: bool = True, min_chars: int = 0
+                    ) -> Tuple[List[LangChainDocument], Dict[str, int]]:
+    """
+    인덱싱 전 근사 중복 제거 (입력 순서 = 검색 순위이므로 먼저 나온 문서를 유지).
+    1) 문서 단위: MinHash/LSH로 추정 자카드 ≥ DEDUP_JACCARD_THRESHOLD 인 문서 제거
+       (남은 문서 metadata['duplicates']에 제거된 출처 기록)
+    2) 문장 단위: 앞 문서에 이미 나온 문장(대소문자/공백/문장부호 무시) 제거
+    3) 문장 제거 후 min_chars보다 짧아진 문서 제거 (호출 측 최소 길이 기준을 dedup 뒤에도 유지)
+    반환: (문서 리스트, 통계 — 임베딩 토큰 절감량 포함)
+    """
+    hasher = MinHasher()
+    lsh = MinHashLSH(num_perm=hasher.num_perm)
+    kept: List[LangChainDocument] = []
+    tokens_before = 0
+    dropped_docs = 0
+
+    for doc in documents:
+        text = doc.page_content or ""
+        tokens_before += count_tokens(text)
+        if not text.strip():
+            continue
+        sig = hasher.signature(text)
+        dup_of = lsh.query(sig)
+        if dup_of is not None:
+            dropped_docs += 1
+            src = doc.metadata.get("source")
+            if src:
+                kept[dup_of].metadata.setdefault("duplicates", []).append(src)
+            continue
+        lsh.insert(sig)
+        kept.append(LangChainDocument(page_content=text, metadata=dict(doc.metadata)))
+
+    dropped_sentences = 0
+    if sentences:
+        seen: set = set()
+        for doc in kept:
+            doc.page_content, n = _drop_seen_sentences(doc.page_content, seen)
+            dropped_sentences += n
+    before_short = len(kept)
+    kept = [d for d in kept if d.page_content.strip() and len(d.page_content.strip()) >= min_chars]
+    dropped_short = before_short - len(kept)
+
+    tokens_after = sum(count_tokens(d.page_content) for d in kept)
+    stats = {
+        "docs_in": len(documents),
+        "docs_out": len(kept),
+        "dropped_docs": dropped_docs,
+        "dropped_sentences": dropped_sentences,
+        "dropped_short": dropped_short,
+        "tokens_before": tokens_before,
+        "tokens_after": tokens_after,
+        "tokens_saved": tokens_before - tokens_after,
+    }
+    est = "" if _ENCODER is not None else " (추정)"
+    print(f"[dedup] 문서 {stats['docs_in']}→{stats['docs_out']} (근사 중복 {dropped_docs}개), "
+          f"중복 문장 {dropped_sentences}개 제거, 짧아진 문서 {dropped_short}개 제외, 임베딩 토큰 {tokens_before}→{tokens_after} "
+          f"({stats['tokens_saved']} 절감){est}")
+    return kept, stats
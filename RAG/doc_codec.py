@@ -0,0 +1,109 @@
+import json
+import zlib
+from typing import Any, Dict, List, Tuple
+
+from langchain_core.documents import Document as LangChainDocument
+
+# 캐시용 Document 리스트 바이너리 코덱
+#   [매직 b"RD"][버전 1바이트][형식 1바이트] + 압축된 페이로드
+#   형식 = 직렬화(msgpack|json) × 압축(zstd|zlib|없음) — 설치된 라이브러리에 따라 선택, 디코딩은 형식 바이트로 판별
+# 페이로드: {"s": [출처별 기준 metadata], "d": [[본문, 출처 번호, 기준과 다른 항목, 기준에서 빠진 키], ...]}
+#   같은 출처(source) 문장들의 공통 metadata(title, url 등)는 한 번만 저장하고 문장별로는 차이(점수 등)만 저장
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+MAGIC = b"RD"
+VERSION = 1
+_SER_JSON, _SER_MSGPACK = 0, 1
+_CMP_NONE, _CMP_ZLIB, _CMP_ZSTD = 0, 1, 2
+_MIN_COMPRESS = 256      # 이보다 짧은 페이로드는 압축하지 않음
+_ZSTD_LEVEL = 3
+
+
+def _dumps(obj: Any) -> Tuple[int, bytes]:
+    if msgpack is not None:
+        return _SER_MSGPACK, msgpack.packb(obj, use_bin_type=True, default=str)
+    return _SER_JSON, json.dumps(obj, ensure_ascii=False, separators=(",", ":"), default=str).encode("utf-8")
+
+
+def _loads(ser: int, raw: bytes) -> Any:
+    if ser == _SER_MSGPACK:
+        return msgpack.unpackb(raw, raw=False, strict_map_key=False)
+    return json.loads(raw)
+
+
+def _compress(raw: bytes) -> Tuple[int, bytes]:
+    if len(raw) < _MIN_COMPRESS:
+        return _CMP_NONE, raw
+    if zstandard is not None:
+        return _CMP_ZSTD, zstandard.ZstdCompressor(level=_ZSTD_LEVEL).compress(raw)
+    return _CMP_ZLIB, zlib.compress(raw, 6)
+
+
+def _decompress(cmp: int, raw: bytes) -> bytes:
+    if cmp == _CMP_ZSTD:
+        return zstandard.ZstdDecompressor().decompress(raw)
+    if cmp == _CMP_ZLIB:
+        return zlib.decompress(raw)
+    return raw
+
+
+def _intern(docs: List[LangChainDocument]) -> Dict[str, list]:
+    bases: List[Dict[str, Any]] = []
+    base_index: Dict[str, int] = {}
+    rows = []
+    for doc in docs:
+        meta = doc.metadata or {}
+        source = str(meta.get("source", ""))
+        i = base_index.get(source)
+        if i is None:
+            i = base_index[source] = len(bases)
+            bases.append(dict(meta))
+        base = bases[i]
+        diff = {k: v for k, v in meta.items() if k not in base or base[k] != v}
+        missing = [k for k in base if k not in meta]
+        row = [doc.page_content, i]
+        if diff or missing:
+            row.append(diff)
+        if missing:
+            row.append(missing)
+        rows.append(row)
+    return {"s": bases, "d": rows}
+
+
+def encode_documents(docs: List[LangChainDocument]) -> bytes:
+    ser, raw = _dumps(_intern(docs))
+    cmp, body = _compress(raw)
+    return MAGIC + bytes((VERSION, (ser << 4) | cmp)) + body
+
+
+def is_encoded(blob) -> bool:
+    return isinstance(blob, (bytes, bytearray)) and blob[:2] == MAGIC
+
+
+def decode_documents(blob: bytes) -> List[LangChainDocument]:
+    """encode_documents 결과 → Document 리스트. 예전 JSON 문자열(page_content/metadata 딕셔너리 리스트)도 읽음."""
+    if not is_encoded(blob):
+        items = json.loads(blob)
+        return [LangChainDocument(page_content=d["page_content"], metadata=d["metadata"]) for d in items]
+    if blob[2] != VERSION:
+        raise ValueError(f"지원하지 않는 문서 코덱 버전: {blob[2]}")
+    ser, cmp = blob[3] >> 4, blob[3] & 0x0F
+    payload = _loads(ser, _decompress(cmp, bytes(blob[4:])))
+    bases = payload["s"]
+    out = []
+    for row in payload["d"]:
+        meta = dict(bases[row[1]])
+        if len(row) > 2:
+            meta.update(row[2])
+        if len(row) > 3:
+            for k in row[3]:
+                meta.pop(k, None)
+        out.append(LangChainDocument(page_content=row[0], metadata=meta))
+    return out
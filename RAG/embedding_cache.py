@@ -0,0 +1,184 @@
+import os
+import time
+import sqlite3
+import hashlib
+import threading
+from array import array
+from typing import Dict, List, Optional
+
+import numpy as np
+from langchain_core.embeddings import Embeddings
+
+from cache_store import CACHE_DIR
+from .rag_config import RAGConfig
+
+# SQLite 한 쿼리에 넣을 키 수 (변수 개수 제한 999 이하)
+_SQL_CHUNK = 500
+_REDIS_TTL = 30 * 86400
+
+
+def _content_key(model: str, kind: str, text: str) -> str:
+    h = hashlib.sha256()
+    for part in (model, kind, text):
+        h.update(part.encode("utf-8"))
+        h.update(b"\x1f")
+    return h.hexdigest()
+
+
+def _pack(vec: List[float], dtype: str = "float32") -> bytes:
+    if dtype == "float16":
+        return np.asarray(vec, dtype=np.float16).tobytes()
+    if dtype == "int8":
+        # 벡터별 스케일(float32 4바이트) + int8 값: 원래 크기의 약 1/4
+        v = np.asarray(vec, dtype=np.float32)
+        scale = float(np.abs(v).max()) / 127 or 1.0
+        return np.float32(scale).tobytes() + np.round(v / scale).astype(np.int8).tobytes()
+    return array("f", vec).tobytes()
+
+
+def _unpack(blob: bytes, dtype: str = "float32") -> List[float]:
+    if dtype == "float16":
+        return np.frombuffer(blob, dtype=np.float16).astype(np.float32).tolist()
+    if dtype == "int8":
+        scale = np.frombuffer(blob[:4], dtype=np.float32)[0]
+        return (np.frombuffer(blob[4:], dtype=np.int8).astype(np.float32) * scale).tolist()
+    return array("f", blob).tolist()
+
+
+class CachedEmbeddings(Embeddings):
+    """
+    임베딩 객체 앞단의 영구 캐시 (내용 해시 → 벡터).
+    - 1단: 로컬 SQLite (assets/cache_store/embeddings.sqlite)
+    - 2단(선택): Redis — EMBEDDING_CACHE_REDIS=1 이고 redis_cache 연결이 살아 있을 때
+    - 미스만 모아 RAGConfig.EMBEDDING_BATCH_SIZE 단위로 원래 임베딩 호출, 같은 문장은 한 번만
+    - dtype: 저장 형식 "float32" | "float16" | "int8" (벡터별 스케일 양자화). 반환은 항상 float 리스트
+    - stats()로 hit/miss/hit_ratio 확인
+    """
+
+    def __init__(self, underlying: Embeddings, model: str, path: Optional[str] = None,
+                 batch_size: int = RAGConfig.EMBEDDING_BATCH_SIZE, use_redis: Optional[bool] = None,
+                 dtype: str = "float32"):
+        if dtype not in ("float32", "float16", "int8"):
+            raise ValueError(f"지원하지 않는 임베딩 저장 형식: {dtype}")
+        self.underlying = underlying
+        self.model = model
+        self.dtype = dtype
+        # 저장 형식이 다르면 다른 키 (float32는 기존 캐시 키 그대로)
+        self._key_model = model if dtype == "float32" else f"{model}@{dtype}"
+        self.batch_size = max(1, int(batch_size))
+        self.path = path or os.path.join(CACHE_DIR, "embeddings.sqlite")
+        if use_redis is None:
+            use_redis = os.getenv("EMBEDDING_CACHE_REDIS", "0") == "1"
+        self._redis = self._redis_client() if use_redis else None
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._stats = {"hits": 0, "redis_hits": 0, "misses": 0, "api_batches": 0}
+
+    @staticmethod
+    def _redis_client():
+        try:
+            from .redis_cache import get_redis_binary_client
+            return get_redis_binary_client()
+        except Exception:
+            return None
+
+    def _db(self) -> sqlite3.Connection:
+        if self._conn is None:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("CREATE TABLE IF NOT EXISTS vectors (k TEXT PRIMARY KEY, v BLOB NOT NULL, created REAL)")
+            self._conn = conn
+        return self._conn
+
+    # ---------- 저장소 ----------
+    def _load(self, keys: List[str]) -> Dict[str, List[float]]:
+        found: Dict[str, List[float]] = {}
+        with self._lock:
+            db = self._db()
+            for i in range(0, len(keys), _SQL_CHUNK):
+                chunk = keys[i:i + _SQL_CHUNK]
+                rows = db.execute(f"SELECT k, v FROM vectors WHERE k IN ({','.join('?' * len(chunk))})", chunk)
+                for k, v in rows:
+                    found[k] = _unpack(v, self.dtype)
+        self._stats["hits"] += len(found)
+
+        rest = [k for k in keys if k not in found]
+        if rest and self._redis is not None:
+            try:
+                from_redis = {}
+                for i in range(0, len(rest), _SQL_CHUNK):
+                    chunk = rest[i:i + _SQL_CHUNK]
+                    for k, v in zip(chunk, self._redis.mget([f"emb2:{k}" for k in chunk])):
+                        if v:
+                            from_redis[k] = _unpack(v, self.dtype)
+                if from_redis:
+                    self._stats["redis_hits"] += len(from_redis)
+                    self._save_local(from_redis)
+                    found.update(from_redis)
+            except Exception as e:
+                print(f"⚠️ Redis 임베딩 캐시 조회 실패: {e}")
+        return found
+
+    def _save_local(self, items: Dict[str, List[float]]):
+        now = time.time()
+        with self._lock:
+            db = self._db()
+            db.executemany("INSERT OR REPLACE INTO vectors (k, v, created) VALUES (?, ?, ?)",
+                           [(k, _pack(v, self.dtype), now) for k, v in items.items()])
+            db.commit()
+
+    def _save(self, items: Dict[str, List[float]]):
+        self._save_local(items)
+        if self._redis is not None:
+            try:
+                pipe = self._redis.pipeline(transaction=False)
+                for k, v in items.items():
+                    pipe.setex(f"emb2:{k}", _REDIS_TTL, _pack(v, self.dtype))  # 바이너리 클라이언트: base64 없이 그대로
+                pipe.execute()
+            except Exception as e:
+                print(f"⚠️ Redis 임베딩 캐시 저장 실패: {e}")
+
+    # ---------- Embeddings 인터페이스 ----------
+    def _embed(self, texts: List[str], kind: str) -> List[List[float]]:
+        keys = [_content_key(self._key_model, kind, t) for t in texts]
+        unique = list(dict.fromkeys(keys))
+        vectors = self._load(unique)
+
+        # 미스만 (중복 제거 후) 배치로 호출
+        todo: Dict[str, str] = {}
+        for k, t in zip(keys, texts):
+            if k not in vectors and k not in todo:
+                todo[k] = t
+        self._stats["misses"] += len(todo)
+        todo_keys = list(todo)
+        for i in range(0, len(todo_keys), self.batch_size):
+            batch = todo_keys[i:i + self.batch_size]
+            if kind == "query":
+                embedded = [self.underlying.embed_query(todo[k]) for k in batch]
+            else:
+                embedded = self.underlying.embed_documents([todo[k] for k in batch])
+            self._stats["api_batches"] += 1
+            new = dict(zip(batch, embedded))
+            self._save(new)
+            vectors.update(new)
+        return [vectors[k] for k in keys]
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return self._embed(list(texts), "doc")
+
+    def embed_query(self, text: str) -> List[float]:
+        return self._embed([text], "query")[0]
+
+    def stats(self) -> Dict[str, float]:
+        s = dict(self._stats)
+        total = s["hits"] + s["redis_hits"] + s["misses"]
+        s["hit_ratio"] = (s["hits"] + s["redis_hits"]) / total if total else 0.0
+        return s
+
+    def log_stats(self, label: str = ""):
+        s = self.stats()
+        print(f"[embedding-cache{(' ' + label) if label else ''}] hit {s['hits'] + s['redis_hits']} "
+              f"(redis {s['redis_hits']}) / miss {s['misses']} → hit ratio {s['hit_ratio']:.1%}, "
+              f"API 배치 {s['api_batches']}회")
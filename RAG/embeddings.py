@@ -0,0 +1,110 @@
+import os
+import threading
+from typing import Dict, List, Optional, Tuple
+
+from langchain_core.embeddings import Embeddings
+
+from .rag_config import RAGConfig
+from .embedding_cache import CachedEmbeddings
+
+# 임베딩 제공자 (EMBEDDING_PROVIDER 환경 변수 > RAGConfig.EMBEDDING_PROVIDER)
+# - "openai": OpenAIEmbeddings(RAGConfig.OPENAI_EMBEDDING_MODEL), 문장마다 네트워크 호출/토큰 비용
+# - "local":  sentence-transformers 다국어 모델을 CPU에서 배치 인코딩 (오프라인, 처리량 예측 가능)
+# 어느 쪽이든 CachedEmbeddings로 감싸 같은 문장은 한 번만 임베딩, 저장 형식은 RAGConfig.EMBEDDING_STORE_DTYPE
+
+_models: Dict[str, object] = {}
+_models_lock = threading.Lock()
+# (제공자, API 키) → 캐시 임베딩 (키가 다른 호출끼리 클라이언트를 섞어 쓰지 않도록)
+_embeddings: Dict[Tuple[str, Optional[str]], CachedEmbeddings] = {}
+_embeddings_lock = threading.Lock()
+_torch_threads_lock = threading.Lock()
+_torch_threads: Optional[int] = None
+
+
+def set_torch_threads() -> int:
+    """
+    torch CPU 스레드 수를 RAGConfig.TORCH_THREADS로 한 번만 설정.
+    torch.set_num_threads는 프로세스 전역이라 임베딩 모델과 cross-encoder가 같은 값을 씀
+    (먼저 로드된 쪽 설정이 나중 것에 덮이지 않도록 여기서만 호출).
+    """
+    global _torch_threads
+    with _torch_threads_lock:
+        if _torch_threads is None:
+            import torch
+            _torch_threads = max(1, RAGConfig.TORCH_THREADS)
+            torch.set_num_threads(_torch_threads)
+        return _torch_threads
+
+
+def _load_sentence_transformer(name: str):
+    """sentence-transformers 모델은 이름별로 프로세스에서 한 번만 로드."""
+    model = _models.get(name)
+    if model is None:
+        with _models_lock:
+            model = _models.get(name)
+            if model is None:
+                from sentence_transformers import SentenceTransformer
+                set_torch_threads()
+                model = SentenceTransformer(name, device="cpu")
+                _models[name] = model
+    return model
+
+
+class LocalEmbeddings(Embeddings):
+    """sentence-transformers 로컬 임베딩 (FAISS가 쓰는 embed_documents/embed_query 인터페이스)."""
+
+    def __init__(self, model_name: str = RAGConfig.LOCAL_EMBEDDING_MODEL,
+                 batch_size: int = RAGConfig.LOCAL_EMBEDDING_BATCH_SIZE):
+        self.model_name = model_name
+        self.batch_size = max(1, int(batch_size))
+
+    def _encode(self, texts: List[str]) -> List[List[float]]:
+        vectors = _load_sentence_transformer(self.model_name).encode(
+            texts, batch_size=self.batch_size, normalize_embeddings=True,
+            convert_to_numpy=True, show_progress_bar=False)
+        return vectors.astype("float32").tolist()
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return self._encode(list(texts)) if texts else []
+
+    def embed_query(self, text: str) -> List[float]:
+        return self._encode([text])[0]
+
+
+def _provider() -> str:
+    return (os.getenv("EMBEDDING_PROVIDER") or RAGConfig.EMBEDDING_PROVIDER).strip().lower()
+
+
+def get_embeddings(api_key: Optional[str] = None) -> CachedEmbeddings:
+    """
+    (제공자, API 키)별로 프로세스 전체에서 공유하는 캐시 임베딩 (local은 키를 쓰지 않으므로 제공자별 하나).
+    model 속성("openai:모델명" / "local:모델명")은 캐시 키와 인덱스 지문에 쓰임.
+    """
+    provider = _provider()
+    slot = (provider, api_key if provider == "openai" else None)
+    with _embeddings_lock:
+        cached = _embeddings.get(slot)
+        if cached is None:
+            if provider == "local":
+                name = RAGConfig.LOCAL_EMBEDDING_MODEL
+                underlying = LocalEmbeddings(name)
+                model = f"local:{name}"
+                batch_size = RAGConfig.LOCAL_EMBEDDING_BATCH_SIZE
+            elif provider == "openai":
+                from langchain_openai import OpenAIEmbeddings
+                name = RAGConfig.OPENAI_EMBEDDING_MODEL
+                underlying = (OpenAIEmbeddings(model=name, openai_api_key=api_key) if api_key
+                              else OpenAIEmbeddings(model=name))
+                model = name  # 기존 캐시 키와 호환
+                batch_size = RAGConfig.EMBEDDING_BATCH_SIZE
+            else:
+                raise ValueError(f"알 수 없는 EMBEDDING_PROVIDER: {provider}")
+            cached = CachedEmbeddings(underlying, model, batch_size=batch_size,
+                                      dtype=RAGConfig.EMBEDDING_STORE_DTYPE)
+            _embeddings[slot] = cached
+    return cached
+
+
+def embedding_signature(embeddings: CachedEmbeddings) -> str:
+    """인덱스 지문용: 모델 + 저장 형식 (둘 중 하나라도 바뀌면 FAISS 인덱스 재생성)."""
+    return f"{embeddings.model}@{embeddings.dtype}"
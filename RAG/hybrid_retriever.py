@@ -0,0 +1,65 @@
+from typing import Any, List
+
+import numpy as np
+from langchain_core.documents import Document as LangChainDocument
+from langchain_core.retrievers import BaseRetriever
+from langchain_core.callbacks import CallbackManagerForRetrieverRun
+
+from .rag_config import RAGConfig
+from .tokenizer import tokenize
+from .bm25_index import top_k_indices
+
+
+class HybridRetriever(BaseRetriever):
+    """
+    BM25(상위 BM25_TOP_K) + FAISS(상위 FAISS_TOP_K) 순위를 RRF로 합쳐 상위 HYBRID_TOP_K만 반환.
+    - RRF 점수 = Σ weight / (RRF_K + rank), NumPy 배열 위에서 계산
+    - 문장 i ↔ BM25 문서 i ↔ FAISS 벡터 i 가 같은 순서라고 가정 (FAISS.from_documents/인덱스 저장소 모두 보장)
+    - 반환 문서 metadata에 rrf_score 기록
+    """
+
+    docs: List[LangChainDocument]
+    bm25: Any  # SparseBM25
+    vectorstore: Any
+    embeddings: Any
+    bm25_k: int = RAGConfig.BM25_TOP_K
+    faiss_k: int = RAGConfig.FAISS_TOP_K
+    top_k: int = RAGConfig.HYBRID_TOP_K
+    rrf_k: int = RAGConfig.RRF_K
+    bm25_weight: float = RAGConfig.BM25_WEIGHT
+    faiss_weight: float = RAGConfig.FAISS_WEIGHT
+
+    def _bm25_ranking(self, query: str) -> np.ndarray:
+        tokens = tokenize(query)
+        if not tokens:
+            return np.zeros(0, dtype=np.int64)
+        return self.bm25.search(tokens, self.bm25_k)  # 질의 단어가 하나도 없는 문장은 제외
+
+    def _faiss_ranking(self, query: str) -> np.ndarray:
+        index = self.vectorstore.index
+        if index.ntotal != len(self.docs):
+            raise ValueError(f"FAISS 벡터 수({index.ntotal})와 문장 수({len(self.docs)})가 다릅니다.")
+        q = np.asarray([self.embeddings.embed_query(query)], dtype=np.float32)
+        _, ids = index.search(q, min(self.faiss_k, index.ntotal))
+        ids = ids[0]
+        return ids[ids >= 0].astype(np.int64)
+
+    def _get_relevant_documents(self, query: str, *, run_manager: CallbackManagerForRetrieverRun
+                                ) -> List[LangChainDocument]:
+        n = len(self.docs)
+        if n == 0:
+            return []
+        fused = np.zeros(n, dtype=np.float64)
+        for ranking, weight in ((self._bm25_ranking(query), self.bm25_weight),
+                                (self._faiss_ranking(query), self.faiss_weight)):
+            if len(ranking):
+                fused[ranking] += weight / (self.rrf_k + np.arange(1, len(ranking) + 1))
+
+        out = []
+        for i in top_k_indices(fused, self.top_k):
+            if fused[i] <= 0:
+                break
+            doc = self.docs[i]
+            out.append(LangChainDocument(page_content=doc.page_content,
+                                         metadata={**doc.metadata, "rrf_score": float(fused[i])}))
+        return out
@@ -0,0 +1,126 @@
+import os
+import json
+import time
+import shutil
+import hashlib
+import tempfile
+from typing import Any, List, Optional, Tuple
+
+import faiss
+from langchain_core.documents import Document as LangChainDocument
+from langchain_community.docstore.in_memory import InMemoryDocstore
+from langchain_community.vectorstores import FAISS
+
+from cache_store import CACHE_DIR
+from .rag_config import RAGConfig
+from .bm25_index import SparseBM25
+
+INDEX_DIR = os.path.join(CACHE_DIR, "rag_index")
+INDEX_FORMAT = "v3"  # 저장 형식이 바뀌면 올려서 기존 인덱스 무효화
+
+
+def fingerprint_documents(documents: List[LangChainDocument], *extra: Any) -> str:
+    """문서 집합(내용 + 메타데이터, 순서 포함) + 빌드 설정(임베딩 모델 등)의 지문."""
+    h = hashlib.sha256()
+    h.update(INDEX_FORMAT.encode())
+    for part in extra:
+        h.update(str(part).encode("utf-8"))
+        h.update(b"\x1f")
+    for doc in documents:
+        h.update((doc.page_content or "").encode("utf-8"))
+        h.update(b"\x1e")
+        h.update(json.dumps(doc.metadata or {}, sort_keys=True, ensure_ascii=False, default=str).encode("utf-8"))
+        h.update(b"\x1d")
+    return h.hexdigest()[:32]
+
+
+def _path(fp: str) -> str:
+    return os.path.join(INDEX_DIR, fp)
+
+
+def _read_faiss(path: str):
+    """가능하면 메모리 매핑으로 읽기 (인덱스 유형이 mmap을 지원하지 않으면 일반 읽기)."""
+    try:
+        return faiss.read_index(path, faiss.IO_FLAG_MMAP | faiss.IO_FLAG_READ_ONLY)
+    except Exception:
+        return faiss.read_index(path)
+
+
+def load_indexes(fp: str, embeddings) -> Optional[Tuple[List[LangChainDocument], FAISS, SparseBM25]]:
+    """저장된 (문장 리스트, FAISS 벡터 저장소, BM25 희소 인덱스). 없거나 깨졌으면 None."""
+    root = _path(fp)
+    if not os.path.exists(os.path.join(root, "meta.json")):
+        return None
+    try:
+        start = time.time()
+        with open(os.path.join(root, "docstore.json"), encoding="utf-8") as f:
+            stored = json.load(f)
+        sentences = [LangChainDocument(page_content=d["page_content"], metadata=d["metadata"]) for d in stored["docs"]]
+        ids = stored["ids"]
+
+        vectorstore = FAISS(
+            embedding_function=embeddings,
+            index=_read_faiss(os.path.join(root, "faiss.index")),
+            docstore=InMemoryDocstore(dict(zip(ids, sentences))),
+            index_to_docstore_id=dict(enumerate(ids)),
+        )
+        bm25 = SparseBM25.load(os.path.join(root, "bm25"))  # CSR 배열은 메모리 매핑
+
+        os.utime(os.path.join(root, "meta.json"))  # 최근 사용 시각 갱신 (정리 순서용)
+        print(f"[index-store] 저장된 인덱스 로드 {fp} ({len(sentences)}문장, {time.time() - start:.3f}초)")
+        return sentences, vectorstore, bm25
+    except Exception as e:
+        print(f"⚠️ 저장된 인덱스 로드 실패 → 재생성: {e}")
+        shutil.rmtree(root, ignore_errors=True)
+        return None
+
+
+def save_indexes(fp: str, sentences: List[LangChainDocument], vectorstore: FAISS, bm25: SparseBM25):
+    """문장 docstore(JSON), FAISS 인덱스, BM25 희소 행렬을 지문 디렉터리에 원자적으로 저장."""
+    root = _path(fp)
+    tmp = None
+    try:
+        os.makedirs(INDEX_DIR, exist_ok=True)
+        # 같은 지문을 여러 스레드/프로세스가 동시에 저장해도 서로의 임시 디렉터리를 건드리지 않도록 고유 이름
+        tmp = tempfile.mkdtemp(prefix=f"{fp}.tmp", dir=INDEX_DIR)
+        ids = [vectorstore.index_to_docstore_id[i] for i in range(len(vectorstore.index_to_docstore_id))]
+        docs = [vectorstore.docstore.search(i) for i in ids]
+        with open(os.path.join(tmp, "docstore.json"), "w", encoding="utf-8") as f:
+            json.dump({"ids": ids, "docs": [{"page_content": d.page_content, "metadata": d.metadata} for d in docs]},
+                      f, ensure_ascii=False, default=str)
+        faiss.write_index(vectorstore.index, os.path.join(tmp, "faiss.index"))
+        bm25.save(os.path.join(tmp, "bm25"))
+        with open(os.path.join(tmp, "meta.json"), "w", encoding="utf-8") as f:
+            json.dump({"format": INDEX_FORMAT, "sentences": len(sentences), "created": time.time()}, f)
+        shutil.rmtree(root, ignore_errors=True)
+        try:
+            os.replace(tmp, root)
+        except OSError:
+            # 그 사이 다른 저장이 같은 지문(= 같은 내용)을 먼저 옮겨 놓았으면 그것을 사용
+            if not os.path.exists(os.path.join(root, "meta.json")):
+                raise
+            shutil.rmtree(tmp, ignore_errors=True)
+        print(f"[index-store] 인덱스 저장 {fp} ({len(sentences)}문장)")
+    except Exception as e:
+        print(f"⚠️ 인덱스 저장 실패: {e}")
+        if tmp:
+            shutil.rmtree(tmp, ignore_errors=True)
+        return
+    _prune()
+
+
+def _prune(max_items: int = RAGConfig.INDEX_STORE_MAX):
+    """오래 안 쓴 인덱스부터 정리해 최대 개수 유지."""
+    try:
+        entries = []
+        for name in os.listdir(INDEX_DIR):
+            if ".tmp" in name:  # 저장 중인 임시 디렉터리
+                continue
+            meta = os.path.join(INDEX_DIR, name, "meta.json")
+            if os.path.exists(meta):
+                entries.append((os.path.getmtime(meta), name))
+        entries.sort(reverse=True)
+        for _, name in entries[max_items:]:
+            shutil.rmtree(os.path.join(INDEX_DIR, name), ignore_errors=True)
+    except Exception:
+        pass
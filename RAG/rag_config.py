@@ -4,17 +4,67 @@ class RAGConfig:
     CHUNK_SIZE = 400
     BM25_K1 = 1.2
     BM25_B = 0.75
+    BM25_CHAR_NGRAM = 2      # 한글 단어에 문자 n-gram 토큰 추가 (복합어 부분 일치용, 0이면 끔)
 
     # 2순위 (중간 영향)
     BM25_TOP_K = 50
     RERANK_1_TOP_N = 20
     FAISS_TOP_K = 15
-    RERANK_2_TOP_N = 5
+    RERANK_2_TOP_N = 5       # two-stage 리랭커 2단계(cross-encoder)에서만 사용
+
+    # 하이브리드 검색 (BM25 + FAISS 순위를 RRF로 결합)
+    HYBRID_TOP_K = 30        # RRF 결합 후 리랭커로 넘길 후보 수
+    RRF_K = 60               # RRF 상수: 1 / (RRF_K + 순위)
+    BM25_WEIGHT = 0.5
+    FAISS_WEIGHT = 0.5
 
     # 1순위 (성능에 가장 큰 영향)
-    RERANK_1_THRESHOLD = 0.5
+    RERANK_1_THRESHOLD = 0.5     # two-stage 리랭커 1단계(bi-encoder 코사인)에서만 사용; cohere/cross-encoder는 RERANK_2_THRESHOLD만 적용
     RERANK_2_THRESHOLD = 0.2
     FINAL_DOCS_COUNT = 5
+
+    # 리랭커 ("cohere" | "cross-encoder" | "two-stage", RERANK_BACKEND 환경 변수로 덮어쓰기 가능)
+    RERANK_BACKEND = "cohere"
+    CROSS_ENCODER_MODEL = "cross-encoder/mmarco-mMiniLMv2-L12-H384-v1"  # 다국어(한국어 포함) cross-encoder
+    RERANK_BATCH_SIZE = 32           # cross-encoder 한 번에 채점할 (질문, 문장) 쌍 수
+    RERANK_MAX_LENGTH = 256          # 질문+문장 토큰 상한
     
     # 임베딩 배치 설정
     EMBEDDING_BATCH_SIZE = 250
+
+    # 임베딩 제공자 ("openai" | "local", EMBEDDING_PROVIDER 환경 변수로 덮어쓰기 가능)
+    EMBEDDING_PROVIDER = "openai"
+    OPENAI_EMBEDDING_MODEL = "text-embedding-ada-002"
+    LOCAL_EMBEDDING_MODEL = "sentence-transformers/paraphrase-multilingual-MiniLM-L12-v2"
+    LOCAL_EMBEDDING_BATCH_SIZE = 64  # CPU 배치 인코딩 크기
+    TORCH_THREADS = 4                # CPU 추론 스레드 수 (torch.set_num_threads, 로컬 임베딩·cross-encoder 공용)
+    EMBEDDING_STORE_DTYPE = "float32"  # 임베딩 캐시 저장 형식: float32 | float16 | int8
+
+    # Playwright 브라우저 풀 설정 (브라우저 1개 + 재사용 컨텍스트 N개)
+    BROWSER_CONTEXTS = 3
+    BROWSER_MAX_PAGES = 6            # 동시에 열어 둘 페이지 수 상한
+    PAGE_TIMEOUT_MS = 20000
+    CONTENT_STABLE_MS = 500          # 본문 길이가 이 시간 동안 변하지 않으면 로딩 완료로 간주
+    CONTENT_STABLE_MAX_MS = 5000     # 안정화 대기 상한
+
+    # 인덱싱 전 근사 중복 제거 (MinHash/LSH)
+    DEDUP_JACCARD_THRESHOLD = 0.8    # 추정 자카드 유사도가 이 이상이면 같은 문서로 간주
+    DEDUP_SHINGLE_CHARS = 5          # 문자 n-gram 길이 (한국어는 단어보다 문자 단위가 안정적)
+    DEDUP_NUM_PERM = 128             # MinHash 서명 길이 = LSH 밴드 수 × 밴드당 행 수
+    DEDUP_LSH_BANDS = 32
+    DEDUP_MIN_SENTENCE_CHARS = 15    # 이보다 짧은 문장은 중복이어도 유지
+
+    # 문장 분할 (spaCy nlp.pipe)
+    SPACY_BATCH_SIZE = 64
+    SPACY_N_PROCESS = 4                    # 멀티프로세스 상한 (CPU 수와 비교해 작은 값 사용)
+    SPACY_MULTIPROC_MIN_CHARS = 2_000_000  # 전체 분량이 이 이상일 때만 멀티프로세스 (모델 로드 비용 때문)
+    SPLIT_CHUNK_CHARS = 100_000            # 긴 문서는 이 크기 이하 조각으로 나눠 처리
+
+    # RAG 결과 캐시 (인덱스 지문 + 정규화 질문 → 최종 문장)
+    RESULT_CACHE_MEM_ITEMS = 512             # 1단 프로세스 내 LRU 항목 수
+    RESULT_CACHE_SEMANTIC = False            # 의미 단계: 비슷한 질문의 결과 재사용
+    RESULT_CACHE_SEMANTIC_THRESHOLD = 0.95   # 질문 임베딩 코사인 유사도 하한
+    RESULT_CACHE_SEMANTIC_MAX = 256          # 인덱스별로 비교할 최근 질문 수
+
+    # 인덱스 저장소 (문서 집합 지문별 FAISS/BM25/docstore 보관)
+    INDEX_STORE_MAX = 50             # 보관할 인덱스 수 (오래 안 쓴 것부터 삭제)
@@ -1,75 +1,161 @@
 import redis
 import os
-import json
+import threading
 import hashlib
+from typing import Dict, List, Optional, Tuple
+from redis.retry import Retry
+from redis.backoff import ExponentialBackoff
 from langchain_core.documents import Document
 
+from .doc_codec import encode_documents, decode_documents
+
 # --- Redis 클라이언트 초기화 ---
-redis_client = None
-# 1. REDIS_URL 환경 변수 확인 (Upstash 등 클라우드 Redis용)
-redis_url = os.getenv("REDIS_URL")
-
-try:
-    if redis_url:
-        print("REDIS_URL을 사용하여 Redis에 연결합니다...")
-        # Upstash의 'tcp://' 프로토콜을 'redis://'로 변경
-        if redis_url.startswith("tcp://"):
-            redis_url = "redis://" + redis_url[len("tcp://"):]
-        
-        # URL에서 직접 연결
-        redis_client = redis.from_url(redis_url, decode_responses=True)
-    else:
-        # 2. REDIS_URL이 없으면 기존 방식으로 연결 (로컬 개발용)
-        print("REDIS_HOST/PORT를 사용하여 Redis에 연결합니다...")
-        redis_client = redis.Redis(
-            host=os.getenv("REDIS_HOST", "localhost"),
-            port=int(os.getenv("REDIS_PORT", 6379)),
-            password=os.getenv("REDIS_PASSWORD", None),
-            decode_responses=True
-        )
-
-    # 연결 테스트
-    redis_client.ping()
-    print("✅ Redis connection successful.")
-
-except redis.exceptions.ConnectionError as e:
-    print(f"⚠️ Redis connection failed: {e}. Caching will be disabled.")
-    redis_client = None
-except Exception as e:
-    print(f"⚠️ An unexpected error occurred with Redis: {e}. Caching will be disabled.")
-    redis_client = None
+# import 시점에 연결/ping 하지 않고, 캐시를 처음 쓸 때 한 번만 연결 (실패도 한 번만 시도)
+# - 연결 풀 공유 + 연결 오류/타임아웃은 지수 백오프로 재시도
+# - 문자열 클라이언트(decode_responses=True, 기존 사용처)와 문서 캐시용 바이너리 클라이언트를 따로 둠
+# - REDIS_MAX_CONNECTIONS는 프로세스 전체 상한: 바이너리 풀이 REDIS_BINARY_MAX_CONNECTIONS(기본 절반)를,
+#   문자열 풀이 나머지를 가짐 (풀이 두 개라고 서버 연결 수가 두 배가 되지 않도록)
+#   풀마다 최소 1개가 필요하므로 상한의 하한은 2 (1 이하로 주면 2로 올리고 경고)
+def _split_connection_budget(total: int, binary: Optional[int] = None) -> Tuple[int, int]:
+    """전체 연결 상한 → (문자열 풀, 바이너리 풀) 크기. 합은 항상 max(2, total)."""
+    total = max(2, int(total))
+    binary = total // 2 if binary is None else int(binary)
+    binary = min(max(1, binary), total - 1)
+    return total - binary, binary
+
+
+REDIS_MAX_CONNECTIONS = int(os.getenv("REDIS_MAX_CONNECTIONS", 16))
+if REDIS_MAX_CONNECTIONS < 2:
+    print(f"⚠️ REDIS_MAX_CONNECTIONS={REDIS_MAX_CONNECTIONS}: 문자열/바이너리 풀에 최소 1개씩 필요 → 2로 사용")
+REDIS_TEXT_MAX_CONNECTIONS, REDIS_BINARY_MAX_CONNECTIONS = _split_connection_budget(
+    REDIS_MAX_CONNECTIONS, os.getenv("REDIS_BINARY_MAX_CONNECTIONS"))
+REDIS_RETRIES = int(os.getenv("REDIS_RETRIES", 3))
+
+_redis_client = None
+_redis_ready = False
+_redis_lock = threading.Lock()
+_redis_binary_client = None
+_redis_binary_ready = False
+_redis_binary_lock = threading.Lock()
+
+
+def _connect(decode_responses: bool = True):
+    kwargs = dict(
+        decode_responses=decode_responses,
+        max_connections=REDIS_TEXT_MAX_CONNECTIONS if decode_responses else REDIS_BINARY_MAX_CONNECTIONS,
+        retry=Retry(ExponentialBackoff(cap=1.0, base=0.05), REDIS_RETRIES),
+        retry_on_error=[redis.exceptions.ConnectionError, redis.exceptions.TimeoutError],
+        health_check_interval=30,
+        socket_timeout=5,
+        socket_connect_timeout=5,
+    )
+    label = "" if decode_responses else " (binary)"
+    # 1. REDIS_URL 환경 변수 확인 (Upstash 등 클라우드 Redis용)
+    redis_url = os.getenv("REDIS_URL")
+    try:
+        if redis_url:
+            print(f"REDIS_URL을 사용하여 Redis에 연결합니다{label}...")
+            # Upstash의 'tcp://' 프로토콜을 'redis://'로 변경
+            if redis_url.startswith("tcp://"):
+                redis_url = "redis://" + redis_url[len("tcp://"):]
+
+            # URL에서 직접 연결
+            pool = redis.ConnectionPool.from_url(redis_url, **kwargs)
+        else:
+            # 2. REDIS_URL이 없으면 기존 방식으로 연결 (로컬 개발용)
+            print(f"REDIS_HOST/PORT를 사용하여 Redis에 연결합니다{label}...")
+            pool = redis.ConnectionPool(
+                host=os.getenv("REDIS_HOST", "localhost"),
+                port=int(os.getenv("REDIS_PORT", 6379)),
+                password=os.getenv("REDIS_PASSWORD", None),
+                **kwargs
+            )
+        client = redis.Redis(connection_pool=pool)
+
+        # 연결 테스트
+        client.ping()
+        print(f"✅ Redis connection successful{label}.")
+        return client
+
+    except redis.exceptions.ConnectionError as e:
+        print(f"⚠️ Redis connection failed: {e}. Caching will be disabled.")
+    except Exception as e:
+        print(f"⚠️ An unexpected error occurred with Redis: {e}. Caching will be disabled.")
+    return None
+
+
+def get_redis_client():
+    """연결된 Redis 클라이언트 (연결 불가면 None)."""
+    global _redis_client, _redis_ready
+    if not _redis_ready:
+        with _redis_lock:
+            if not _redis_ready:
+                _redis_client = _connect()
+                _redis_ready = True
+    return _redis_client
+
+
+def get_redis_binary_client():
+    """bytes를 그대로 주고받는 Redis 클라이언트 (문서 캐시용, 연결 불가면 None)."""
+    global _redis_binary_client, _redis_binary_ready
+    if not _redis_binary_ready:
+        with _redis_binary_lock:
+            if not _redis_binary_ready:
+                _redis_binary_client = _connect(decode_responses=False)
+                _redis_binary_ready = True
+    return _redis_binary_client
 
 
 # 캐시 유효 시간 (초), 24시간
 CACHE_TTL = 86400
 
+def get_many_from_cache(keys: List[str]) -> List[Optional[List[Document]]]:
+    """여러 키를 MGET 한 번으로 조회 (키 순서대로, 없으면 None)."""
+    redis_client = get_redis_binary_client()
+    if not redis_client or not keys:
+        return [None] * len(keys)
+
+    out = []
+    for key, blob in zip(keys, redis_client.mget(keys)):
+        if blob is None:
+            out.append(None)
+            continue
+        try:
+            # 바이너리 코덱(msgpack/JSON + zstd/zlib), 예전 JSON 문자열 항목도 그대로 읽힘
+            out.append(decode_documents(blob))
+        except Exception as e:
+            print(f"⚠️ 캐시 항목 디코딩 실패 ({key}): {e}")
+            out.append(None)
+    return out
+
+
 def get_from_cache(key: str) -> list[Document] | None:
     """지정된 키에 해당하는 캐시된 문서 리스트를 가져옵니다."""
-    if not redis_client:
-        return None
-    
-    cached_data = redis_client.get(key)
-    
-    if cached_data:
+    docs = get_many_from_cache([key])[0]
+    if docs is not None:
         print(f"⚡️ Cache HIT for key: {key}")
-        # JSON 문자열을 파싱하여 LangChain Document 객체 리스트로 복원
-        docs_as_dicts = json.loads(cached_data)
-        return [Document(page_content=d['page_content'], metadata=d['metadata']) for d in docs_as_dicts]
-        
-    print(f"🐢 Cache MISS for key: {key}")
-    return None
+    elif get_redis_binary_client():
+        print(f"🐢 Cache MISS for key: {key}")
+    return docs
 
-def set_to_cache(key: str, value: list[Document]):
-    """문서 리스트를 직렬화하여 Redis에 저장합니다."""
-    if not redis_client:
+
+def set_many_to_cache(items: Dict[str, List[Document]], ttl: int = CACHE_TTL):
+    """여러 문서 리스트를 바이너리로 직렬화해 파이프라인 한 번에 저장 (TTL 설정 포함)."""
+    redis_client = get_redis_binary_client()
+    if not redis_client or not items:
         return
 
-    # LangChain Document 객체 리스트를 JSON으로 직렬화 가능한 딕셔너리 리스트로 변환
-    docs_as_dicts = [{'page_content': doc.page_content, 'metadata': doc.metadata} for doc in value]
-    
-    # JSON 문자열로 변환하여 Redis에 저장 (TTL 설정 포함)
-    redis_client.setex(key, CACHE_TTL, json.dumps(docs_as_dicts))
-    print(f"📦 Cached result for key: {key}")
+    pipe = redis_client.pipeline(transaction=False)
+    for key, value in items.items():
+        pipe.setex(key, ttl, encode_documents(value))
+    pipe.execute()
+
+
+def set_to_cache(key: str, value: list[Document]):
+    """문서 리스트를 직렬화하여 Redis에 저장합니다."""
+    set_many_to_cache({key: value})
+    if get_redis_binary_client():
+        print(f"📦 Cached result for key: {key}")
 
 def create_cache_key(prefix: str, content: str) -> str:
     """콘텐츠의 해시값을 기반으로 안정적인 캐시 키를 생성합니다."""
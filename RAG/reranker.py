@@ -0,0 +1,157 @@
+import os
+import threading
+from abc import ABC, abstractmethod
+from typing import Dict, List, Optional
+
+import numpy as np
+from langchain_core.documents import Document as LangChainDocument
+
+from .rag_config import RAGConfig
+from .embeddings import set_torch_threads
+
+# 리랭커 백엔드 (RERANK_BACKEND 환경 변수 > RAGConfig.RERANK_BACKEND)
+# - "cohere":        CohereRerank API (기존 방식)
+# - "cross-encoder": 로컬 다국어 cross-encoder (sentence-transformers, CPU 배치)
+# - "two-stage":     1단계 bi-encoder 코사인 유사도(RERANK_1_THRESHOLD, RERANK_1_TOP_N)
+#                    → 2단계 cross-encoder(RERANK_2_THRESHOLD, RERANK_2_TOP_N)
+# 모든 백엔드는 같은 문장을 한 번만 채점하고, 점수를 metadata['relevance_score']에 기록해 내림차순으로 반환
+
+_cross_encoder = None
+_cross_encoder_lock = threading.Lock()
+_rerankers: Dict[str, "Reranker"] = {}
+_rerankers_lock = threading.Lock()
+
+
+def get_cross_encoder():
+    """프로세스 전체에서 공유하는 cross-encoder (첫 사용 시 한 번만 로드)."""
+    global _cross_encoder
+    if _cross_encoder is None:
+        with _cross_encoder_lock:
+            if _cross_encoder is None:
+                import torch
+                from sentence_transformers import CrossEncoder
+                set_torch_threads()
+                # 점수 눈금을 모델 설정/라이브러리 버전에 맡기지 않고 sigmoid(0~1)로 고정
+                # → RERANK_2_THRESHOLD(절대 컷오프)가 raw logit에 적용되는 일이 없도록
+                kwargs = dict(max_length=RAGConfig.RERANK_MAX_LENGTH, device="cpu")
+                try:
+                    _cross_encoder = CrossEncoder(RAGConfig.CROSS_ENCODER_MODEL, activation_fn=torch.nn.Sigmoid(),
+                                                  **kwargs)
+                except TypeError:  # sentence-transformers < 4
+                    _cross_encoder = CrossEncoder(RAGConfig.CROSS_ENCODER_MODEL,
+                                                  default_activation_function=torch.nn.Sigmoid(), **kwargs)
+    return _cross_encoder
+
+
+def _dedupe(docs: List[LangChainDocument]) -> List[LangChainDocument]:
+    """공백만 다른 같은 문장은 첫 번째만 남김 (순서 유지)."""
+    seen = set()
+    out = []
+    for doc in docs:
+        key = " ".join((doc.page_content or "").split())
+        if key and key not in seen:
+            seen.add(key)
+            out.append(doc)
+    return out
+
+
+def _scored(docs: List[LangChainDocument], scores, threshold: float, top_n: int) -> List[LangChainDocument]:
+    """점수 내림차순 → threshold 이상만 → 상위 top_n, relevance_score 기록."""
+    scores = np.asarray(scores, dtype=np.float64)
+    out = []
+    for i in np.argsort(-scores, kind="stable")[:top_n]:
+        if scores[i] < threshold:
+            break
+        doc = docs[i]
+        out.append(LangChainDocument(page_content=doc.page_content,
+                                     metadata={**doc.metadata, "relevance_score": float(scores[i])}))
+    return out
+
+
+class Reranker(ABC):
+    """리랭커 공통 인터페이스: rerank(query, docs) → relevance_score 내림차순 문서 리스트."""
+
+    name = "base"
+
+    def rerank(self, query: str, docs: List[LangChainDocument]) -> List[LangChainDocument]:
+        docs = _dedupe(docs)
+        if not docs:
+            return []
+        return self._rerank(query, docs)
+
+    @abstractmethod
+    def _rerank(self, query: str, docs: List[LangChainDocument]) -> List[LangChainDocument]:
+        """중복 제거된 비어 있지 않은 docs를 채점해 relevance_score 내림차순으로 반환."""
+
+
+class CohereReranker(Reranker):
+    name = "cohere"
+
+    def __init__(self, top_n: int = RAGConfig.RERANK_1_TOP_N):
+        from langchain_cohere import CohereRerank
+        self._cohere = CohereRerank(model="rerank-multilingual-v3.0", top_n=top_n)
+
+    def _rerank(self, query, docs):
+        return list(self._cohere.compress_documents(documents=docs, query=query))
+
+
+class CrossEncoderReranker(Reranker):
+    """로컬 cross-encoder로 (질문, 문장) 쌍을 RERANK_BATCH_SIZE 단위 배치 채점."""
+
+    name = "cross-encoder"
+
+    def __init__(self, top_n: int = RAGConfig.RERANK_1_TOP_N, threshold: float = float("-inf")):
+        self.top_n = top_n
+        self.threshold = threshold
+
+    def scores(self, query: str, docs: List[LangChainDocument]) -> np.ndarray:
+        # get_cross_encoder()가 sigmoid를 명시하므로 0~1 점수 → RERANK_2_THRESHOLD와 같은 눈금
+        return get_cross_encoder().predict([(query, d.page_content) for d in docs],
+                                           batch_size=RAGConfig.RERANK_BATCH_SIZE, show_progress_bar=False)
+
+    def _rerank(self, query, docs):
+        return _scored(docs, self.scores(query, docs), self.threshold, self.top_n)
+
+
+class TwoStageReranker(Reranker):
+    """
+    1단계: 검색에 쓴 임베딩(캐시됨)으로 질문-문장 코사인 유사도 → RERANK_1_THRESHOLD 이상 상위 RERANK_1_TOP_N
+    2단계: 남은 문장만 cross-encoder → RERANK_2_THRESHOLD 이상 상위 RERANK_2_TOP_N
+    """
+
+    name = "two-stage"
+
+    def __init__(self, embeddings):
+        self.embeddings = embeddings
+        self.cross = CrossEncoderReranker(top_n=RAGConfig.RERANK_2_TOP_N, threshold=RAGConfig.RERANK_2_THRESHOLD)
+
+    def _rerank(self, query, docs):
+        q = np.asarray(self.embeddings.embed_query(query), dtype=np.float32)
+        m = np.asarray(self.embeddings.embed_documents([d.page_content for d in docs]), dtype=np.float32)
+        sims = (m @ q) / (np.linalg.norm(m, axis=1) * np.linalg.norm(q) + 1e-12)
+        shortlist = _scored(docs, sims, RAGConfig.RERANK_1_THRESHOLD, RAGConfig.RERANK_1_TOP_N)
+        print(f"[rerank] bi-encoder 1단계 {len(docs)} → {len(shortlist)}개")
+        if not shortlist:
+            return []
+        return self.cross.rerank(query, shortlist)
+
+
+def get_reranker(embeddings=None, backend: Optional[str] = None) -> Reranker:
+    """백엔드별 리랭커 (프로세스 내 재사용). two-stage는 1단계용 embeddings 필요."""
+    backend = (backend or os.getenv("RERANK_BACKEND") or RAGConfig.RERANK_BACKEND).strip().lower()
+    key = f"{backend}:{id(embeddings)}" if backend == "two-stage" else backend
+    with _rerankers_lock:
+        reranker = _rerankers.get(key)
+        if reranker is None:
+            if backend == "cross-encoder":
+                reranker = CrossEncoderReranker()
+            elif backend == "two-stage":
+                if embeddings is None:
+                    raise ValueError("two-stage 리랭커에는 embeddings가 필요합니다.")
+                reranker = TwoStageReranker(embeddings)
+            elif backend == "cohere":
+                reranker = CohereReranker()
+            else:
+                raise ValueError(f"알 수 없는 RERANK_BACKEND: {backend}")
+            _rerankers[key] = reranker
+    return reranker
@@ -0,0 +1,216 @@
+import os
+import re
+import threading
+import unicodedata
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+from langchain_core.documents import Document as LangChainDocument
+
+from cache_store import TwoTierCache, make_key
+from .rag_config import RAGConfig
+from .redis_cache import CACHE_TTL, get_redis_binary_client, get_many_from_cache, set_many_to_cache
+
+# RAG 최종 결과 캐시: 키 = (인덱스 지문, 리랭커, 정규화된 질문)
+# - 1단: 프로세스 내 LRU (Document 객체 그대로 보관 → 적중 시 역직렬화 없음)
+# - 2단: Redis 바이너리 코덱(doc_codec, MGET/파이프라인) — 연결 불가면 cache_store.TwoTierCache(SQLite)
+# - 3단(선택, RAGConfig.RESULT_CACHE_SEMANTIC): 정확히 같은 질문이 없으면 같은 인덱스에서 캐시된 질문 중
+#   질문 임베딩 코사인 유사도가 RESULT_CACHE_SEMANTIC_THRESHOLD 이상인 것의 결과 재사용
+#   ("달이 폭발하면?" ↔ "달이 폭발한다면?")
+_PUNCT_RE = re.compile(r"[^\w\s]+")
+_SPACE_RE = re.compile(r"\s+")
+
+_store: Optional[TwoTierCache] = None
+_store_lock = threading.Lock()
+_lru: "OrderedDict[str, Tuple[LangChainDocument, ...]]" = OrderedDict()
+_lru_lock = threading.Lock()
+# (지문, 리랭커) → (캐시된 정규화 질문 리스트, 단위 벡터 행렬)
+_semantic: Dict[Tuple[str, str], Tuple[List[str], np.ndarray]] = {}
+_semantic_lock = threading.Lock()
+
+
+def _get_store() -> TwoTierCache:
+    """질문 목록(의미 단계) 보관 + Redis가 없을 때 결과 2단 폴백."""
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = TwoTierCache("rag_results", ttl_sec=CACHE_TTL, mem_max_items=64,
+                                      backend=os.getenv("RAG_RESULT_CACHE_BACKEND", "redis"))
+    return _store
+
+
+def _lru_get(key: str) -> Optional[List[LangChainDocument]]:
+    with _lru_lock:
+        docs = _lru.get(key)
+        if docs is None:
+            return None
+        _lru.move_to_end(key)
+        return list(docs)
+
+
+def _lru_put(key: str, docs: List[LangChainDocument]):
+    with _lru_lock:
+        _lru[key] = tuple(docs)
+        _lru.move_to_end(key)
+        while len(_lru) > RAGConfig.RESULT_CACHE_MEM_ITEMS:
+            _lru.popitem(last=False)
+
+
+def normalize_query(query: str) -> str:
+    """NFKC + 소문자 + 문장부호 제거 + 공백 정리 ("달이 폭발하면?" == "달이  폭발하면")."""
+    q = unicodedata.normalize("NFKC", query or "").lower()
+    return _SPACE_RE.sub(" ", _PUNCT_RE.sub(" ", q)).strip()
+
+
+def _to_docs(value) -> List[LangChainDocument]:
+    return [LangChainDocument(page_content=d["page_content"], metadata=d["metadata"]) for d in value]
+
+
+def _tier2_get_many(keys: List[str]) -> List[Optional[List[LangChainDocument]]]:
+    if get_redis_binary_client() is not None:
+        return get_many_from_cache(keys)
+    store = _get_store()
+    return [None if v is None else _to_docs(v) for v in (store.get(k) for k in keys)]
+
+
+def _tier2_set(key: str, docs: List[LangChainDocument]):
+    if get_redis_binary_client() is not None:
+        set_many_to_cache({key: docs})
+    else:
+        _get_store().set(key, [{"page_content": d.page_content, "metadata": d.metadata} for d in docs])
+
+
+def _unit(vec) -> np.ndarray:
+    v = np.asarray(vec, dtype=np.float32)
+    return v / (np.linalg.norm(v) + 1e-12)
+
+
+class ResultCache:
+    """
+    한 retriever(인덱스 지문 + 리랭커)에 묶인 결과 캐시.
+    get(query) → 문서 리스트 또는 None, set(query, docs), stats()/log_stats()로 단계별 적중률 확인.
+    """
+
+    def __init__(self, fingerprint: str, tag: str, embeddings=None):
+        self.fingerprint = fingerprint
+        self.tag = tag
+        self.embeddings = embeddings if RAGConfig.RESULT_CACHE_SEMANTIC else None
+        self._stats = {"lookups": 0, "lru_hits": 0, "tier2_hits": 0, "semantic_hits": 0, "misses": 0}
+
+    def _key(self, normalized: str) -> str:
+        return make_key("rag_result", self.fingerprint, self.tag, normalized)
+
+    def _index_key(self) -> str:
+        return make_key("rag_result_queries", self.fingerprint, self.tag)
+
+    # ---------- 의미 단계 ----------
+    def _semantic_index(self) -> Tuple[List[str], np.ndarray]:
+        """캐시된 질문 목록(2단 저장소에 보관) → 질문 임베딩 행렬 (임베딩 캐시를 거치므로 재시작 후에도 저렴)."""
+        sk = (self.fingerprint, self.tag)
+        with _semantic_lock:
+            entry = _semantic.get(sk)
+        if entry is not None:
+            return entry
+        # 임베딩(네트워크일 수 있음)은 잠금 밖에서 → 다른 지문/질문 조회를 막지 않음, 동시에 만든 쪽은 먼저 넣은 값 사용
+        queries = _get_store().get(self._index_key(), []) or []
+        vecs = [_unit(self.embeddings.embed_query(q)) for q in queries]
+        entry = (queries, np.vstack(vecs) if vecs else np.zeros((0, 0), dtype=np.float32))
+        with _semantic_lock:
+            return _semantic.setdefault(sk, entry)
+
+    def _semantic_lookup(self, normalized: str) -> Optional[List[LangChainDocument]]:
+        queries, matrix = self._semantic_index()
+        if not queries:
+            return None
+        sims = matrix @ _unit(self.embeddings.embed_query(normalized))
+        # 임계값을 넘는 후보 상위 3개 (만료된 항목이 있을 수 있으므로) → LRU, 나머지는 MGET 한 번
+        candidates = [int(i) for i in np.argsort(-sims)[:3] if sims[i] >= RAGConfig.RESULT_CACHE_SEMANTIC_THRESHOLD]
+        if not candidates:
+            return None
+        found = {i: _lru_get(self._key(queries[i])) for i in candidates}
+        rest = [i for i in candidates if found[i] is None]
+        if rest:
+            found.update(zip(rest, _tier2_get_many([self._key(queries[i]) for i in rest])))
+        for i in candidates:
+            if found[i] is not None:
+                print(f"⚡️ 결과 캐시 의미 일치: '{normalized}' ≈ '{queries[i]}' (cos {sims[i]:.3f})")
+                _lru_put(self._key(queries[i]), found[i])
+                return found[i]
+        return None
+
+    def _semantic_add(self, normalized: str):
+        queries, _ = self._semantic_index()
+        if normalized in queries:
+            return
+        vec = _unit(self.embeddings.embed_query(normalized))[None, :]
+        sk = (self.fingerprint, self.tag)
+        # 읽기-수정-쓰기와 저장은 잠금 안에서 (동시에 set된 다른 질문이 덮이거나 옛 목록이 나중에 저장되지 않도록)
+        with _semantic_lock:
+            queries, matrix = _semantic[sk]
+            if normalized in queries:
+                return
+            queries = (queries + [normalized])[-RAGConfig.RESULT_CACHE_SEMANTIC_MAX:]
+            matrix = (np.vstack([matrix, vec]) if len(matrix) else vec)[-RAGConfig.RESULT_CACHE_SEMANTIC_MAX:]
+            _semantic[sk] = (queries, matrix)
+            _get_store().set(self._index_key(), queries)
+
+    # ---------- 공개 API ----------
+    def get(self, query: str) -> Optional[List[LangChainDocument]]:
+        normalized = normalize_query(query)
+        key = self._key(normalized)
+        self._stats["lookups"] += 1
+        docs = _lru_get(key)
+        if docs is not None:
+            self._stats["lru_hits"] += 1
+            print(f"⚡️ 결과 캐시 HIT (LRU): '{normalized}'")
+            return docs
+        try:
+            docs = _tier2_get_many([key])[0]
+        except Exception as e:
+            print(f"⚠️ 결과 캐시 조회 실패: {e}")
+            docs = None
+        if docs is not None:
+            self._stats["tier2_hits"] += 1
+            print(f"⚡️ 결과 캐시 HIT (2단): '{normalized}'")
+            _lru_put(key, docs)
+            return docs
+        if self.embeddings is not None:
+            try:
+                docs = self._semantic_lookup(normalized)
+            except Exception as e:
+                print(f"⚠️ 결과 캐시 의미 조회 실패: {e}")
+                docs = None
+            if docs is not None:
+                self._stats["semantic_hits"] += 1
+                return docs
+        self._stats["misses"] += 1
+        print(f"🐢 결과 캐시 MISS: '{normalized}'")
+        return None
+
+    def set(self, query: str, docs: List[LangChainDocument]):
+        normalized = normalize_query(query)
+        key = self._key(normalized)
+        _lru_put(key, docs)
+        try:
+            _tier2_set(key, docs)
+        except Exception as e:
+            print(f"⚠️ 결과 캐시 저장 실패: {e}")
+        if self.embeddings is not None:
+            try:
+                self._semantic_add(normalized)
+            except Exception as e:
+                print(f"⚠️ 결과 캐시 의미 색인 실패: {e}")
+
+    def stats(self) -> Dict[str, float]:
+        """단계별(LRU / Redis·SQLite / 의미) 적중 수와 전체 적중률."""
+        s = dict(self._stats)
+        hits = s["lru_hits"] + s["tier2_hits"] + s["semantic_hits"]
+        s["hit_ratio"] = hits / s["lookups"] if s["lookups"] else 0.0
+        return s
+
+    def log_stats(self):
+        s = self.stats()
+        print(f"[rag-result-cache] 조회 {s['lookups']} → LRU {s['lru_hits']} / 2단 {s['tier2_hits']} / "
+              f"의미 {s['semantic_hits']} / 미스 {s['misses']} (hit ratio {s['hit_ratio']:.1%})")
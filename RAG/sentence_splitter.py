@@ -0,0 +1,144 @@
+import os
+import re
+import importlib.util
+import threading
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+from langchain_core.documents import Document as LangChainDocument
+
+from .rag_config import RAGConfig
+
+# 문장 분할에 필요 없는 컴포넌트 (문장 경계는 senter, 없으면 parser로)
+_UNUSED_PIPES = ["tagger", "morphologizer", "lemmatizer", "attribute_ruler", "ner"]
+_MODELS = {"ko": "ko_core_news_sm", "en": "en_core_web_sm"}
+SPLITTER_VERSION = "pipe-senter-v1"
+_FALLBACK_SPLIT_RE = re.compile(r"(?<=[.!?。])\s+|\n+")
+
+_nlp: Dict[str, object] = {}
+_nlp_lock = threading.Lock()
+
+
+def _load_spacy(lang: str):
+    """가벼운 파이프라인으로 spaCy 모델을 한 번만 로드 (실패 시 None)."""
+    with _nlp_lock:
+        if lang not in _nlp:
+            try:
+                import spacy
+                nlp = spacy.load(_MODELS[lang], exclude=_UNUSED_PIPES)
+                if "senter" in nlp.component_names:
+                    # senter(문장 경계 전용)가 있으면 의존 구문 분석 대신 사용
+                    if "parser" in nlp.pipe_names:
+                        nlp.disable_pipe("parser")
+                    if "senter" in nlp.disabled:
+                        nlp.enable_pipe("senter")
+                nlp.max_length = max(nlp.max_length, RAGConfig.SPLIT_CHUNK_CHARS * 2)
+                print(f"✅ spaCy {_MODELS[lang]} 로드 (pipes: {', '.join(nlp.pipe_names)})")
+                _nlp[lang] = nlp
+            except Exception as e:
+                print(f"⚠️ spaCy 모델 {_MODELS[lang]} 로드 실패: {e}")
+                _nlp[lang] = None
+        return _nlp[lang]
+
+
+def detect_language(text: str, sample_chars: int = 2000) -> str:
+    """앞부분 표본의 한글/라틴 문자 비율로 언어 판별 ('ko' | 'en')."""
+    sample = text[:sample_chars]
+    if not sample:
+        return "ko"
+    cps = np.frombuffer(sample.encode("utf-32-le"), dtype=np.uint32)
+    hangul = np.count_nonzero(((cps >= 0xAC00) & (cps <= 0xD7A3)) | ((cps >= 0x3131) & (cps <= 0x318E)))
+    lower = cps | 0x20  # ASCII 대소문자 통합
+    latin = np.count_nonzero((cps < 128) & (lower >= ord("a")) & (lower <= ord("z")))
+    # 기존 휴리스틱과 같은 기준(알파벳이 전체의 절반 초과) + 한글이 전혀 없는 라틴 텍스트
+    return "en" if latin / len(cps) > 0.5 or (hangul == 0 and latin > 0) else "ko"
+
+
+def _chunks(text: str, limit: int) -> List[str]:
+    """긴 문서를 줄바꿈/문장부호 경계에서 limit 이하 조각으로 (spaCy max_length·메모리 대비)."""
+    if len(text) <= limit:
+        return [text]
+    out = []
+    start = 0
+    while start < len(text):
+        end = min(start + limit, len(text))
+        if end < len(text):
+            cut = text.rfind("\n", start, end)
+            if cut <= start:
+                m = None
+                for m in re.finditer(r"[.!?。]\s", text[start:end]):
+                    pass
+                cut = start + m.end() if m else end
+            end = cut
+        out.append(text[start:end])
+        start = end
+    return out
+
+
+def _kss_split(text: str) -> Optional[List[str]]:
+    try:
+        import kss
+        return kss.split_sentences(text)
+    except Exception:
+        return None
+
+
+def _fallback_split(text: str, lang: str) -> List[str]:
+    if lang == "ko":
+        sents = _kss_split(text)
+        if sents is not None:
+            return sents
+    return _FALLBACK_SPLIT_RE.split(text)
+
+
+def splitter_signature() -> str:
+    """
+    현재 분할 방식 식별자 (인덱스 지문에 포함해 분할 방식이 바뀌면 재생성).
+    모델을 로드하지 않고 설치 여부만 확인 → 저장된 인덱스 재사용 경로를 느리게 하지 않음.
+    """
+    parts = [SPLITTER_VERSION]
+    for lang, name in _MODELS.items():
+        installed = importlib.util.find_spec(name) is not None
+        parts.append(f"{lang}:{'spacy' if installed else 'fallback'}")
+    return ";".join(parts)
+
+
+def split_documents(documents: List[LangChainDocument]) -> List[LangChainDocument]:
+    """
+    문서 리스트 → 문장 Document 리스트 (입력 순서 유지, metadata 복사).
+    - 언어별로 묶어 nlp.pipe(batch_size, n_process)로 한 번에 처리
+    - 전체 분량이 SPACY_MULTIPROC_MIN_CHARS 이상일 때만 멀티프로세스
+    - 모델이 없으면 한국어는 kss, 그 외는 문장부호 기준 분할
+    """
+    pieces: Dict[str, List[Tuple[str, int]]] = {"ko": [], "en": []}
+    for i, doc in enumerate(documents):
+        text = (doc.page_content or "").strip()
+        if not text:
+            continue
+        lang = detect_language(text)
+        for chunk in _chunks(text, RAGConfig.SPLIT_CHUNK_CHARS):
+            pieces[lang].append((chunk, i))
+
+    per_doc: Dict[int, List[str]] = {}
+    for lang, items in pieces.items():
+        if not items:
+            continue
+        nlp = _load_spacy(lang)
+        if nlp is None:
+            for chunk, i in items:
+                per_doc.setdefault(i, []).extend(_fallback_split(chunk, lang))
+            continue
+        total_chars = sum(len(c) for c, _ in items)
+        n_process = 1
+        if total_chars >= RAGConfig.SPACY_MULTIPROC_MIN_CHARS:
+            n_process = max(1, min(RAGConfig.SPACY_N_PROCESS, os.cpu_count() or 1, len(items)))
+        for sdoc, i in nlp.pipe(items, as_tuples=True, batch_size=RAGConfig.SPACY_BATCH_SIZE, n_process=n_process):
+            per_doc.setdefault(i, []).extend(s.text for s in sdoc.sents)
+
+    sentences = []
+    for i, doc in enumerate(documents):
+        for sent in per_doc.get(i, ()):
+            sent = sent.strip()
+            if sent:
+                sentences.append(LangChainDocument(page_content=sent, metadata=doc.metadata.copy()))
+    return sentences
@@ -0,0 +1,95 @@
+import re
+import threading
+from typing import Iterable, List
+
+from .rag_config import RAGConfig
+
+# BM25용 한국어 토크나이저
+# - kiwipiepy가 있으면 형태소 분석(체언/용언 어근/외국어/숫자만)
+# - 없으면 규칙 기반: 소문자화 + 단어 분리 + 조사 제거
+# - RAGConfig.BM25_CHAR_NGRAM > 0 이면 긴 한글 토큰에 문자 n-gram 추가 ('해운대해수욕장' ↔ '해수욕장')
+_KEEP_TAG_PREFIXES = ("NN", "NR", "NP", "VV", "VA", "XR", "SL", "SN", "SH", "MAG")
+_WORD_RE = re.compile(r"[가-힣]+|[a-zA-Z]+|\d+")
+# 긴 조사부터 검사 (예: '에서부터'가 '부터'보다 먼저)
+_JOSA = sorted([
+    "에서부터", "으로부터", "에게서", "한테서", "으로서", "으로써", "이라고", "에서", "에게", "한테", "까지",
+    "부터", "처럼", "보다", "으로", "이나", "이랑", "하고", "라고", "와", "과", "은", "는", "이", "가",
+    "을", "를", "의", "에", "도", "만", "로", "나", "랑",
+], key=len, reverse=True)
+_JOSA_SET = set(_JOSA)
+
+_kiwi = None
+_kiwi_ready = False
+_kiwi_lock = threading.Lock()
+
+
+def _get_kiwi():
+    global _kiwi, _kiwi_ready
+    if not _kiwi_ready:
+        with _kiwi_lock:
+            if not _kiwi_ready:
+                try:
+                    from kiwipiepy import Kiwi
+                    _kiwi = Kiwi()
+                except Exception:
+                    _kiwi = None
+                _kiwi_ready = True
+    return _kiwi
+
+
+def _strip_josa(word: str) -> str:
+    for josa in _JOSA:
+        if len(word) > len(josa) and word.endswith(josa):
+            return word[:-len(josa)]
+    return word
+
+
+def _rule_tokens(text: str) -> List[str]:
+    out = []
+    for w in _WORD_RE.findall((text or "").lower()):
+        if "가" <= w[0] <= "힣":
+            if w in _JOSA_SET:  # 'KTX를'처럼 영문/숫자 뒤에 떨어져 나온 조사
+                continue
+            w = _strip_josa(w)
+        out.append(w)
+    return out
+
+
+def _kiwi_tokens(tokens) -> List[str]:
+    return [t.form.lower() for t in tokens if t.tag.startswith(_KEEP_TAG_PREFIXES)]
+
+
+def _with_ngrams(tokens: List[str], n: int = RAGConfig.BM25_CHAR_NGRAM) -> List[str]:
+    if n <= 0:
+        return tokens
+    out = list(tokens)
+    for t in tokens:
+        if len(t) > n and "가" <= t[0] <= "힣":
+            out.extend(t[i:i + n] for i in range(len(t) - n + 1))
+    return out
+
+
+def tokenize(text: str) -> List[str]:
+    kiwi = _get_kiwi()
+    if kiwi is None:
+        return _with_ngrams(_rule_tokens(text))
+    return _with_ngrams(_kiwi_tokens(kiwi.tokenize(text or "")))
+
+
+def tokenize_many(texts: Iterable[str]) -> List[List[str]]:
+    """여러 문장을 한 번에 (kiwipiepy는 배치 입력을 내부 스레드로 병렬 처리)."""
+    texts = [t or "" for t in texts]
+    kiwi = _get_kiwi()
+    if kiwi is None:
+        return [_with_ngrams(_rule_tokens(t)) for t in texts]
+    return [_with_ngrams(_kiwi_tokens(toks)) for toks in kiwi.tokenize(texts)]
+
+
+def tokenizer_signature() -> str:
+    """
+    인덱스 지문용 (토크나이저가 바뀌면 BM25 통계 재생성).
+    설치 여부가 아니라 실제로 로드된 토크나이저 기준 — Kiwi() 생성이 실패해 규칙 기반으로 폴백했으면
+    그 상태로 만든 인덱스를 나중에 Kiwi 질의 토큰으로 재사용하지 않도록.
+    """
+    base = "kiwi" if _get_kiwi() is not None else "rule-josa-v1"
+    return f"{base}+ng{RAGConfig.BM25_CHAR_NGRAM}"
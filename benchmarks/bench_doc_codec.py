@@ -0,0 +1,137 @@
+# benchmarks/bench_doc_codec.py — 캐시 문서 직렬화: 기존 JSON 문자열 vs doc_codec(바이너리+압축)
+#   python benchmarks/bench_doc_codec.py [--docs 5] [--keys 200] [--redis]
+# - 페이로드 크기, 인코딩/디코딩 시간 (Document 복원 포함), 기존 JSON 대비 배율
+# - 기존 방식은 실제 저장 형태(json.dumps 기본값 ensure_ascii=True → 한글 1자 = \uXXXX 6바이트)와
+#   UTF-8 JSON(ensure_ascii=False)을 둘 다 보여줌 → 압축 효과와 이스케이프 제거 효과를 구분
+# - --redis: 실제 Redis에서 기존 방식(GET/SETEX 키마다, 문자열) vs 새 방식(파이프라인 SETEX + MGET, bytes) 왕복 시간
+# - 문서는 RAG 최종 결과와 비슷하게 합성 (같은 출처의 서로 다른 문장 여러 개 + 문장별 점수 metadata)
+#   같은 문장을 반복하면 압축률이 부풀려지므로 문장은 모두 다르게
+import os
+import sys
+import json
+import time
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from langchain_core.documents import Document as LangChainDocument
+
+from RAG import doc_codec
+from RAG.doc_codec import encode_documents, decode_documents
+
+_SENTENCES = [
+    "부산 해운대해수욕장은 여름 성수기마다 국내외 관광객으로 붐비며, 주변 상권도 함께 활기를 띤다.",
+    "기상청은 이번 주말 남부 지방에 최대 80mm의 비가 내릴 것으로 예보했다.",
+    "정부는 내년 예산안에서 연구개발 분야 지출을 전년 대비 12% 늘리기로 했다.",
+    "전문가들은 금리 인하가 가계 부채 증가로 이어질 수 있다고 경고했다.",
+    "서울시는 노후 버스 정류장 300곳을 스마트 쉼터로 교체한다고 밝혔다.",
+    "국립중앙박물관 특별전에는 개막 첫 주에만 5만 명이 다녀갔다.",
+    "연구팀은 새 배터리 소재가 기존보다 충전 속도를 두 배 높였다고 설명했다.",
+    "프로야구 정규 시즌 마지막 경기에서 홈팀이 연장 끝에 역전승을 거뒀다.",
+    "농림축산식품부는 배추 수급 안정을 위해 비축 물량을 조기 방출한다.",
+    "지역 의료원은 야간 소아 진료 시간을 밤 11시까지 연장 운영한다.",
+    "한국은행은 올해 경제성장률 전망치를 2.1%에서 1.9%로 낮췄다.",
+    "제주도는 관광객 증가에 대비해 공항 셔틀버스 노선을 확대했다.",
+]
+
+
+def make_docs(n: int, sources: int = 2):
+    docs = []
+    for i in range(n):
+        s = i % sources
+        docs.append(LangChainDocument(
+            page_content=_SENTENCES[i % len(_SENTENCES)],
+            metadata={"source": f"https://example.com/news/{s}", "title": f"기사 제목 {s}",
+                      "page": s, "relevance_score": 0.9 - i * 0.01, "rrf_score": 0.03 - i * 0.001},
+        ))
+    return docs
+
+
+def old_encode(docs, ensure_ascii: bool = True):
+    """기존 set_to_cache와 같은 직렬화 (json.dumps 기본값 → ensure_ascii=True)."""
+    return json.dumps([{"page_content": d.page_content, "metadata": d.metadata} for d in docs],
+                      ensure_ascii=ensure_ascii)
+
+
+def old_decode(raw):
+    return [LangChainDocument(page_content=d["page_content"], metadata=d["metadata"]) for d in json.loads(raw)]
+
+
+def timeit(fn, repeat: int):
+    t0 = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - t0) / repeat * 1e6
+
+
+def bench_codec(docs, repeat: int):
+    old_raw, utf8_raw, new_raw = old_encode(docs), old_encode(docs, ensure_ascii=False), encode_documents(docs)
+    assert [(d.page_content, d.metadata) for d in decode_documents(new_raw)] == \
+           [(d.page_content, d.metadata) for d in docs]
+    print(f"코덱: msgpack={'있음' if doc_codec.msgpack else '없음(JSON)'}, "
+          f"zstd={'있음' if doc_codec.zstandard else '없음(zlib)'}, 문서 {len(docs)}개")
+    rows = [
+        ("old json", len(old_raw.encode("utf-8")), timeit(lambda: old_encode(docs), repeat),
+         timeit(lambda: old_decode(old_raw), repeat)),
+        ("utf8 json", len(utf8_raw.encode("utf-8")), timeit(lambda: old_encode(docs, ensure_ascii=False), repeat),
+         timeit(lambda: old_decode(utf8_raw), repeat)),
+        ("codec", len(new_raw), timeit(lambda: encode_documents(docs), repeat),
+         timeit(lambda: decode_documents(new_raw), repeat)),
+    ]
+    base = rows[0]
+    print(f"{'':10s}{'bytes':>10s}{'encode us':>12s}{'decode us':>12s}   (old json 대비 bytes / encode / decode)")
+    for name, size, enc, dec in rows:
+        print(f"{name:10s}{size:10d}{enc:12.1f}{dec:12.1f}   "
+              f"x{size / base[1]:.2f} / x{enc / base[2]:.2f} / x{dec / base[3]:.2f}")
+    # 압축 때문에 인코딩은 보통 기존보다 느림 — 이득은 페이로드 크기(네트워크/메모리)와 Redis 왕복 수에서 나옴
+    if rows[2][2] > base[2]:
+        print(f"※ codec 인코딩이 기존 JSON보다 {rows[2][2] / base[2]:.1f}배 느림")
+
+
+def bench_redis(docs, n_keys: int):
+    from RAG.redis_cache import get_redis_client, get_redis_binary_client, get_many_from_cache, set_many_to_cache
+    text, binary = get_redis_client(), get_redis_binary_client()
+    if text is None or binary is None:
+        print("Redis 연결 불가 → 왕복 측정 생략")
+        return
+    old_keys = [f"bench:old:{i}" for i in range(n_keys)]
+    new_keys = [f"bench:new:{i}" for i in range(n_keys)]
+
+    t0 = time.perf_counter()
+    for k in old_keys:
+        text.setex(k, 60, old_encode(docs))
+    t_old_set = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    for k in old_keys:
+        old_decode(text.get(k))
+    t_old_get = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    set_many_to_cache({k: docs for k in new_keys}, ttl=60)
+    t_new_set = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    get_many_from_cache(new_keys)
+    t_new_get = time.perf_counter() - t0
+
+    print(f"\nRedis {n_keys}키: old set {t_old_set * 1e3:.1f}ms / get {t_old_get * 1e3:.1f}ms"
+          f"  →  new set {t_new_set * 1e3:.1f}ms / get {t_new_get * 1e3:.1f}ms")
+    text.delete(*old_keys)
+    binary.delete(*new_keys)
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--docs", type=int, default=5)
+    ap.add_argument("--keys", type=int, default=200)
+    ap.add_argument("--repeat", type=int, default=2000)
+    ap.add_argument("--redis", action="store_true")
+    args = ap.parse_args()
+
+    docs = make_docs(args.docs)
+    bench_codec(docs, args.repeat)
+    if args.redis:
+        bench_redis(docs, args.keys)
+
+
+if __name__ == "__main__":
+    main()
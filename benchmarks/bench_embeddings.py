@@ -0,0 +1,61 @@
+# benchmarks/bench_embeddings.py — 로컬 임베딩 처리량(문장/s)과 저장 형식별 용량
+#   python benchmarks/bench_embeddings.py [--corpus 파일] [--n 50000] [--batch 32 64 128] [--threads 4]
+# - RAG.embeddings.LocalEmbeddings(RAGConfig.LOCAL_EMBEDDING_MODEL)로 --n 문장을 배치 크기별로 인코딩
+# - 결과 벡터를 float32/float16/int8로 저장했을 때 크기와 최대 복원 오차
+# - 코퍼스가 없으면 한국어 샘플 문장을 변형해 합성
+import os
+import sys
+import time
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+
+from RAG.rag_config import RAGConfig
+from RAG.embeddings import LocalEmbeddings, _load_sentence_transformer
+from RAG.embedding_cache import _pack, _unpack
+
+_SAMPLE = ["오늘 정부는 새로운 경제 정책을 발표했다.", "전문가들은 이번 조치가 물가 안정에 기여할 것으로 내다봤다.",
+           "부산 해운대해수욕장은 여름마다 관광객으로 붐빈다.", "The market reaction was mixed on day {i}."]
+
+
+def load_sentences(path: str, n: int):
+    if path:
+        with open(path, encoding="utf-8", errors="ignore") as f:
+            lines = [line.strip() for line in f if line.strip()]
+        return (lines * (n // max(1, len(lines)) + 1))[:n]
+    return [f"{_SAMPLE[i % len(_SAMPLE)].format(i=i)} ({i})" for i in range(n)]
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--corpus", default="")
+    ap.add_argument("--n", type=int, default=50000)
+    ap.add_argument("--batch", type=int, nargs="+", default=[RAGConfig.LOCAL_EMBEDDING_BATCH_SIZE])
+    ap.add_argument("--threads", type=int, default=RAGConfig.TORCH_THREADS)
+    args = ap.parse_args()
+
+    RAGConfig.TORCH_THREADS = args.threads
+    sentences = load_sentences(args.corpus, args.n)
+    t0 = time.perf_counter()
+    _load_sentence_transformer(RAGConfig.LOCAL_EMBEDDING_MODEL)
+    print(f"모델 로드 {RAGConfig.LOCAL_EMBEDDING_MODEL}: {time.perf_counter() - t0:.2f}s (threads={args.threads})")
+
+    vectors = None
+    for batch in args.batch:
+        emb = LocalEmbeddings(batch_size=batch)
+        t0 = time.perf_counter()
+        vectors = emb.embed_documents(sentences)
+        dt = time.perf_counter() - t0
+        print(f"batch {batch:4d}: {len(sentences)}문장 {dt:.1f}s → {len(sentences) / dt:,.0f} 문장/s")
+
+    ref = np.asarray(vectors, dtype=np.float32)
+    for dtype in ("float32", "float16", "int8"):
+        blobs = [_pack(v, dtype) for v in vectors]
+        restored = np.asarray([_unpack(b, dtype) for b in blobs], dtype=np.float32)
+        print(f"{dtype:8s}: {sum(map(len, blobs)) / 1e6:8.1f} MB, 최대 오차 {np.abs(restored - ref).max():.4f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+# benchmarks/bench_html_extract.py — HTML→본문 추출 처리량/품질 비교
+#   python benchmarks/bench_html_extract.py --corpus data/naver_html [--repeat 3]
+#   python benchmarks/bench_html_extract.py --corpus data/naver_html --save-from urls.txt   (코퍼스 저장)
+# - 코퍼스: <이름>.html (원본 바이트), 정답 본문이 있으면 같은 이름의 <이름>.txt
+# - old: BeautifulSoup(html.parser) + 태그 제거 + get_text (기존 text_scraper 방식, apparent_encoding 디코딩)
+# - new: html_extract.decode_html + extract_main_text (lxml, 텍스트 밀도 점수)
+# - 품질: 정답 파일이 있으면 토큰 F1, 없으면 추출 길이만 표시
+import os
+import sys
+import time
+import glob
+import argparse
+from collections import Counter
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from html_extract import decode_html, extract_main_text
+
+
+def old_extract(body: bytes) -> str:
+    from bs4 import BeautifulSoup
+    from charset_normalizer import from_bytes  # requests.apparent_encoding과 같은 추정기
+    best = from_bytes(body).best()
+    html = str(best) if best is not None else body.decode("utf-8", errors="replace")
+    soup = BeautifulSoup(html, "html.parser")
+    for tag in soup(["script", "style", "footer", "nav", "form", "header", "aside", "iframe"]):
+        tag.decompose()
+    return soup.get_text(separator=" ", strip=True)
+
+
+def new_extract(body: bytes) -> str:
+    return extract_main_text(decode_html(body), separator=" ")
+
+
+def token_f1(pred: str, gold: str) -> float:
+    p, g = Counter(pred.split()), Counter(gold.split())
+    common = sum((p & g).values())
+    if not common:
+        return 0.0
+    precision = common / max(sum(p.values()), 1)
+    recall = common / max(sum(g.values()), 1)
+    return 2 * precision * recall / (precision + recall)
+
+
+def save_corpus(url_file: str, out_dir: str):
+    import requests
+    os.makedirs(out_dir, exist_ok=True)
+    headers = {'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'}
+    with open(url_file, encoding="utf-8") as f:
+        urls = [u.strip() for u in f if u.strip()]
+    for i, url in enumerate(urls):
+        try:
+            r = requests.get(url, headers=headers, timeout=15)
+            with open(os.path.join(out_dir, f"page_{i:03d}.html"), "wb") as out:
+                out.write(r.content)
+            print(f"저장: {url}")
+        except Exception as e:
+            print(f"실패: {url} - {e}")
+
+
+def run(name: str, fn, pages, repeat: int):
+    outputs = []
+    t0 = time.perf_counter()
+    for _ in range(repeat):
+        outputs = [fn(body) for _, body, _ in pages]
+    elapsed = max(time.perf_counter() - t0, 1e-9)
+    pps = len(pages) * repeat / elapsed
+
+    f1s = [token_f1(out, gold) for out, (_, _, gold) in zip(outputs, pages) if gold is not None]
+    avg_len = sum(len(o) for o in outputs) / max(len(outputs), 1)
+    quality = f"F1 {sum(f1s) / len(f1s):.3f} ({len(f1s)}개 정답)" if f1s else "정답 없음"
+    print(f"{name:4s}: {pps:8.1f} pages/s | 평균 길이 {avg_len:8.0f}자 | {quality}")
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--corpus", required=True, help="*.html (+ 선택 *.txt 정답) 폴더")
+    ap.add_argument("--repeat", type=int, default=3)
+    ap.add_argument("--save-from", help="URL 목록 파일 → corpus 폴더에 HTML 저장 후 종료")
+    args = ap.parse_args()
+
+    if args.save_from:
+        save_corpus(args.save_from, args.corpus)
+        return
+
+    pages = []
+    for path in sorted(glob.glob(os.path.join(args.corpus, "*.html"))):
+        with open(path, "rb") as f:
+            body = f.read()
+        gold_path = os.path.splitext(path)[0] + ".txt"
+        gold = None
+        if os.path.exists(gold_path):
+            with open(gold_path, encoding="utf-8") as f:
+                gold = f.read()
+        pages.append((path, body, gold))
+    if not pages:
+        print(f"HTML 파일 없음: {args.corpus}")
+        return
+
+    print(f"코퍼스 {len(pages)}페이지, 반복 {args.repeat}회")
+    run("old", old_extract, pages, args.repeat)
+    run("new", new_extract, pages, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
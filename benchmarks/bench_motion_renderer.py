@@ -0,0 +1,69 @@
+# benchmarks/bench_motion_renderer.py — 모션 프레임 생성 처리량(fps) 비교
+#   python benchmarks/bench_motion_renderer.py [이미지경로] [--frames 300]
+# - new: MotionRenderer.frame (정수 크롭 + 1회 리사이즈, 버퍼 재사용)
+# - old: ImageClip.resized(시간함수) + with_position (기존 zoom_in_out 방식, moviepy 필요)
+import os
+import sys
+import time
+import argparse
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+from PIL import Image
+
+from motion_renderer import MotionRenderer, MOTIONS, ZOOM_END
+
+W, H, FPS = 720, 1080, 30
+
+
+def _sample_image() -> str:
+    path = os.path.join(tempfile.gettempdir(), "bench_motion_src.jpg")
+    if not os.path.exists(path):
+        rng = np.random.default_rng(0)
+        arr = rng.integers(0, 255, size=(2000, 3000, 3), dtype=np.uint8)
+        Image.fromarray(arr).save(path, quality=90)
+    return path
+
+
+def bench_new(img: str, motion: str, frames: int, drift_px: int = 0) -> float:
+    r = MotionRenderer(img, W, H, frames / FPS, motion=motion, drift_px=drift_px)
+    t0 = time.perf_counter()
+    for i in range(frames):
+        r.frame(i / FPS)
+    return frames / (time.perf_counter() - t0)
+
+
+def bench_old_zoom(img: str, frames: int) -> float:
+    from moviepy import ImageClip, CompositeVideoClip
+    duration = frames / FPS
+    base = ImageClip(img)
+    base = base.resized(max(W / base.w, H / base.h)).with_duration(duration)
+    zf = lambda t: 1.0 + (ZOOM_END - 1.0) * (t / duration)
+    clip = CompositeVideoClip([base.resized(zf).with_position(("center", 0))], size=(W, H)).with_duration(duration)
+    t0 = time.perf_counter()
+    for i in range(frames):
+        clip.get_frame(i / FPS)
+    return frames / (time.perf_counter() - t0)
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("image", nargs="?", default=None)
+    ap.add_argument("--frames", type=int, default=300)
+    args = ap.parse_args()
+    img = args.image or _sample_image()
+
+    print(f"image={img} frames={args.frames} out={W}x{H}")
+    for m in MOTIONS:
+        print(f"new  {m:<14} {bench_new(img, m, args.frames):8.1f} fps")
+    print(f"new  {'drift(12px)':<14} {bench_new(img, 'static', args.frames, drift_px=12):8.1f} fps")
+    try:
+        print(f"old  {'zoom_in_out':<14} {bench_old_zoom(img, min(args.frames, 60)):8.1f} fps")
+    except Exception as e:
+        print(f"old  zoom_in_out    (건너뜀: {e})")
+
+
+if __name__ == "__main__":
+    main()
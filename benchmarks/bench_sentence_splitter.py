@@ -0,0 +1,84 @@
+# benchmarks/bench_sentence_splitter.py — 문장 분할 처리량(MB/s) 비교
+#   python benchmarks/bench_sentence_splitter.py [--corpus 파일/폴더] [--mb 10] [--doc-kb 50]
+# - old: 전체 파이프라인(ko_core_news_sm, 필요 시 en 재시도) 문서별 1회씩 호출 (기존 retriever_builder 방식)
+# - new: RAG.sentence_splitter.split_documents (불필요 컴포넌트 제외 + nlp.pipe 배치/멀티프로세스)
+# - 코퍼스가 없으면 한국어/영어 샘플 문단을 반복해 --mb 크기로 합성
+import os
+import sys
+import glob
+import time
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from langchain_core.documents import Document as LangChainDocument
+
+from RAG.sentence_splitter import split_documents
+
+_SAMPLE_KO = ("오늘 정부는 새로운 경제 정책을 발표했다. 전문가들은 이번 조치가 물가 안정에 기여할 것으로 내다봤다. "
+              "하지만 일부에서는 효과가 제한적일 것이라는 우려도 나온다! 시장 반응은 엇갈렸다. ")
+_SAMPLE_EN = ("The government announced a new economic policy today. Experts expect it to help stabilize prices. "
+              "Some critics, however, doubt its effectiveness! Market reactions were mixed. ")
+
+
+def load_corpus(path: str, mb: float, doc_kb: int):
+    texts = []
+    if path:
+        files = [path] if os.path.isfile(path) else sorted(glob.glob(os.path.join(path, "**", "*.txt"), recursive=True))
+        for fp in files:
+            with open(fp, encoding="utf-8", errors="ignore") as f:
+                texts.append(f.read())
+    else:
+        target = int(mb * 1024 * 1024)
+        size, i = 0, 0
+        while size < target:
+            sample = _SAMPLE_EN if i % 5 == 4 else _SAMPLE_KO
+            text = sample * max(1, doc_kb * 1024 // len(sample.encode("utf-8")))
+            texts.append(text)
+            size += len(text.encode("utf-8"))
+            i += 1
+    return [LangChainDocument(page_content=t, metadata={"source": f"doc{i}"}) for i, t in enumerate(texts)]
+
+
+def old_split(documents):
+    import spacy
+    nlp_korean = spacy.load("ko_core_news_sm")
+    nlp_english = spacy.load("en_core_web_sm")
+    nlp_korean.max_length = nlp_english.max_length = 10**8
+    out = []
+    for doc in documents:
+        nlp_doc = nlp_korean(doc.page_content)
+        sents = list(nlp_doc.sents)
+        text = doc.page_content
+        if len(sents) <= 1 and sum(c.isalpha() and 'a' <= c.lower() <= 'z' for c in text) / len(text) > 0.5:
+            nlp_doc = nlp_english(text)
+        out.extend(s.text for s in nlp_doc.sents if s.text.strip())
+    return out
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--corpus", default="", help=".txt 파일 또는 폴더 (없으면 합성)")
+    ap.add_argument("--mb", type=float, default=10.0)
+    ap.add_argument("--doc-kb", type=int, default=50)
+    ap.add_argument("--skip-old", action="store_true", help="기존 방식 생략 (오래 걸림)")
+    args = ap.parse_args()
+
+    docs = load_corpus(args.corpus, args.mb, args.doc_kb)
+    total_mb = sum(len(d.page_content.encode("utf-8")) for d in docs) / (1024 * 1024)
+    print(f"코퍼스: 문서 {len(docs)}개, {total_mb:.1f}MB")
+
+    t0 = time.perf_counter()
+    new = split_documents(docs)
+    dt = time.perf_counter() - t0
+    print(f"new: {dt:7.1f}초 | {total_mb / dt:6.2f} MB/s | 문장 {len(new)}개 (모델 로드 포함)")
+
+    if not args.skip_old:
+        t0 = time.perf_counter()
+        old = old_split(docs)
+        dt = time.perf_counter() - t0
+        print(f"old: {dt:7.1f}초 | {total_mb / dt:6.2f} MB/s | 문장 {len(old)}개 (모델 로드 포함)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+# benchmarks/bench_startup.py — 모듈 import(콜드 스타트) 시간 리포트
+#   python benchmarks/bench_startup.py [모듈 ...] [--top 15] [--resources]
+# - 모듈마다 새 인터프리터에서 `python -X importtime -c "import 모듈"` 실행
+#   → 전체 wall time + 누적 import 시간이 큰 하위 모듈 상위 N개
+# - --resources: 지연 로딩된 무거운 자원(spaCy/Whisper/LlamaParse/Polly/Redis)의 첫 사용 비용도 측정
+import os
+import sys
+import time
+import argparse
+import subprocess
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_MODULES = ["runner", "RAG.retriever_builder", "best_subtitle_extractor", "file_handler",
+                   "elevenlabs_tts", "RAG.redis_cache"]
+
+# (이름, 새 인터프리터에서 실행할 코드)
+RESOURCES = [
+    ("spaCy ko (문장 분할용)", "from RAG.sentence_splitter import _load_spacy; _load_spacy('ko')"),
+    ("Whisper base", "from best_subtitle_extractor import get_whisper_model; get_whisper_model()"),
+    ("LlamaParse", "from file_handler import get_parser; get_parser()"),
+    ("Polly client", "from elevenlabs_tts import get_polly_client; get_polly_client()"),
+    ("Redis 연결", "from RAG.redis_cache import get_redis_client; get_redis_client()"),
+]
+
+
+def _run(code: str, importtime: bool = False):
+    cmd = [sys.executable] + (["-X", "importtime"] if importtime else []) + ["-c", code]
+    t0 = time.perf_counter()
+    proc = subprocess.run(cmd, cwd=ROOT, capture_output=True, text=True)
+    return time.perf_counter() - t0, proc
+
+
+def _parse_importtime(stderr: str):
+    """'import time: self [us] | cumulative | imported package' 줄 → (누적 us, 모듈명)."""
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        try:
+            _self_us, cum_us, name = line[len("import time:"):].split("|", 2)
+            rows.append((int(cum_us), name[1:].rstrip()))  # 이름 앞 들여쓰기 = import 깊이
+        except ValueError:
+            continue
+    return rows
+
+
+def report_module(module: str, top: int):
+    wall, proc = _run(f"import {module}", importtime=True)
+    if proc.returncode != 0:
+        err = (proc.stderr.strip().splitlines() or ["?"])[-1]
+        print(f"\n■ {module}: import 실패 ({wall:.2f}s) — {err}")
+        return
+    rows = _parse_importtime(proc.stderr)
+    total = sum(us for us, name in rows if not name.startswith(" "))
+    # 대상 모듈이 직접 import한 패키지(깊이 1)별 누적 시간 → 어떤 의존성이 느린지
+    direct = sorted(((us, name.strip()) for us, name in rows
+                     if name.startswith("  ") and not name.startswith("    ")), reverse=True)[:top]
+    print(f"\n■ {module}: wall {wall:.2f}s (import 누적 {total / 1e6:.2f}s)")
+    for us, name in direct:
+        print(f"   {us / 1e6:7.3f}s  {name}")
+
+
+def report_resources():
+    print("\n■ 지연 로딩 자원 첫 사용 비용 (새 인터프리터, import 포함)")
+    for label, code in RESOURCES:
+        wall, proc = _run(code)
+        status = "ok" if proc.returncode == 0 else "실패: " + ((proc.stderr.strip().splitlines() or ["?"])[-1])
+        print(f"   {wall:7.2f}s  {label} ({status})")
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("modules", nargs="*", default=DEFAULT_MODULES)
+    ap.add_argument("--top", type=int, default=15)
+    ap.add_argument("--resources", action="store_true")
+    args = ap.parse_args()
+
+    base, _ = _run("pass")
+    print(f"인터프리터 기동: {base:.2f}s")
+    for m in args.modules:
+        report_module(m, args.top)
+    if args.resources:
+        report_resources()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,7 @@
 import os
 import re
-import whisper
 import subprocess   
+import threading
 import unicodedata
 from concurrent.futures import ThreadPoolExecutor, as_completed
 import streamlit as st
@@ -20,7 +20,19 @@ MAX_WORKERS = 4  # 병렬 처리할 스레드 수
 os.makedirs(AUDIO_DIR, exist_ok=True)   
 os.makedirs(TXT_DIR, exist_ok=True)
 
-model = whisper.load_model("base")
+# Whisper 모델은 실제로 음성 인식이 필요할 때 한 번만 로드 (import 시점에 torch/모델을 올리지 않음)
+_whisper_model = None
+_whisper_lock = threading.Lock()
+
+
+def get_whisper_model():
+    global _whisper_model
+    if _whisper_model is None:
+        with _whisper_lock:
+            if _whisper_model is None:
+                import whisper
+                _whisper_model = whisper.load_model("base")
+    return _whisper_model
 
 # 안전한 영어 파일명 생성
 def safe_filename(title):
@@ -118,7 +130,7 @@ def download_audio(link, title):
 
 # Whisper로 자막 추출 후 print 출력
 def transcribe_to_txt(audio_path, filename_base):
-    result = model.transcribe(audio_path, task="transcribe", verbose=False)
+    result = get_whisper_model().transcribe(audio_path, task="transcribe", verbose=False)
     segments = result.get("segments", [])
     
     # 텍스트를 리스트로 수집
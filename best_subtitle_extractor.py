@@ -1,16 +1,16 @@
 import os
 import re
-import whisper
 import subprocess
+import threading
 import unicodedata
 import streamlit as st
 from deep_translator import GoogleTranslator
 from googleapiclient.discovery import build
 from yt_dlp import YoutubeDL
 from langchain_core.documents import Document as LangChainDocument
-from langchain_openai import OpenAIEmbeddings
 from langchain_experimental.text_splitter import SemanticChunker
 from langchain_community.vectorstores import FAISS
+from RAG.embeddings import get_embeddings
 
 # ===============================
 # 🔑 [API KEY 설정 구역]
@@ -30,7 +30,20 @@ TXT_DIR = os.path.join("output", "youtube_subtitle", "texts")
 
 os.makedirs(AUDIO_DIR, exist_ok=True)
 os.makedirs(TXT_DIR, exist_ok=True)
-model = whisper.load_model("base")
+
+# Whisper 모델은 실제로 음성 인식이 필요할 때 한 번만 로드 (import 시점에 torch/모델을 올리지 않음)
+_whisper_model = None
+_whisper_lock = threading.Lock()
+
+
+def get_whisper_model():
+    global _whisper_model
+    if _whisper_model is None:
+        with _whisper_lock:
+            if _whisper_model is None:
+                import whisper
+                _whisper_model = whisper.load_model("base")
+    return _whisper_model
 
 # ===============================
 # 📺 [유튜브 채널 ID 해석]
@@ -150,7 +163,7 @@ def download_audio(link, title):
     return final_path, safe_title
 
 def transcribe_to_txt(audio_path, filename_base):
-    result = model.transcribe(audio_path, task="transcribe", verbose=True)
+    result = get_whisper_model().transcribe(audio_path, task="transcribe", verbose=True)
     segments = result.get("segments", [])
     texts = [seg["text"].strip() for seg in segments if seg["text"].strip()]
     return texts
@@ -162,7 +175,8 @@ def vectorize_txt(txt_path):
     with open(txt_path, encoding='utf-8') as f:
         lines = [line.strip() for line in f if line.strip()]
     docs = [LangChainDocument(page_content=line) for line in lines]
-    embeddings = OpenAIEmbeddings(openai_api_key=OPENAI_API_KEY)
+    # 제공자(OpenAI/로컬)는 RAGConfig.EMBEDDING_PROVIDER, 같은 문장은 캐시에서 재사용
+    embeddings = get_embeddings(api_key=OPENAI_API_KEY)
     splitter = SemanticChunker(embeddings, breakpoint_threshold_type="percentile")
     splits = splitter.split_documents(docs)
     vectorstore = FAISS.from_documents(splits, embeddings)
@@ -0,0 +1,233 @@
+# cache_store.py — 프로세스 간 공유되는 2단 캐시 (메모리 LRU + SQLite/Redis)
+import os
+import json
+import time
+import sqlite3
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+CACHE_DIR = os.getenv("PERFECTO_CACHE_DIR", os.path.join("assets", "cache_store"))
+
+
+def make_key(*parts: Any) -> str:
+    """여러 조각(프롬프트, 모델명 등)을 합쳐 고정 길이 키 생성."""
+    h = hashlib.sha256()
+    for p in parts:
+        h.update(str(p).encode("utf-8"))
+        h.update(b"\x1f")
+    return h.hexdigest()
+
+
+class TwoTierCache:
+    """
+    1단: 프로세스 내 LRU (max_items, TTL)
+    2단: 디스크 SQLite 또는 Redis (TTL, 최대 항목 수)
+    - 값은 JSON 직렬화 가능한 객체만 저장
+    - stats()로 단계별 hit/miss 확인
+    """
+
+    def __init__(
+        self,
+        namespace: str,
+        *,
+        ttl_sec: Optional[float] = 30 * 86400,
+        mem_max_items: int = 2048,
+        disk_max_items: int = 200_000,
+        backend: Optional[str] = None,       # "sqlite" | "redis" | "memory"
+        path: Optional[str] = None,
+    ):
+        self.namespace = namespace
+        self.ttl_sec = ttl_sec
+        self.mem_max_items = max(1, int(mem_max_items))
+        self.disk_max_items = max(1, int(disk_max_items))
+        self.backend = (backend or os.getenv("PERFECTO_CACHE_BACKEND", "sqlite")).lower()
+        self.path = path or os.path.join(CACHE_DIR, f"{namespace}.sqlite")
+
+        # 잠금은 1단(LRU)·통계·초기화에만 사용. 2단 I/O(SQLite/Redis 왕복, commit)는 잠금 밖에서 →
+        # 여러 스레드(예: SSML 배치 워커)가 한 캐시를 써도 직렬화되지 않음
+        self._lock = threading.RLock()
+        self._mem: "OrderedDict[str, tuple[float, Any]]" = OrderedDict()
+        self._local = threading.local()     # 스레드별 SQLite 연결 (WAL이라 동시 읽기 가능)
+        self._sqlite_ok = False
+        self._redis = None
+        self._tier2_ready = False
+        self._writes_since_prune = 0
+        self._stats = {"mem_hits": 0, "disk_hits": 0, "misses": 0, "sets": 0, "evictions": 0, "errors": 0}
+
+    def _count(self, name: str, n: int = 1):
+        with self._lock:
+            self._stats[name] += n
+
+    # ---------- 2단 초기화 ----------
+    def _tier2(self):
+        with self._lock:
+            if not self._tier2_ready:
+                self._init_tier2_locked()
+        if self._redis is not None:
+            return self._redis
+        return self._sqlite() if self._sqlite_ok else None
+
+    def _init_tier2_locked(self):
+        self._tier2_ready = True
+        if self.backend == "redis":
+            try:
+                from RAG.redis_cache import get_redis_client
+                self._redis = get_redis_client()
+            except Exception as e:
+                print(f"⚠️ [{self.namespace}] Redis 캐시 사용 불가 → SQLite 폴백: {e}")
+            if self._redis is not None:
+                return
+        if self.backend == "memory":
+            return
+        try:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            conn = self._sqlite()
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS kv ("
+                " k TEXT PRIMARY KEY, v TEXT NOT NULL,"
+                " expires REAL, accessed REAL NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS kv_accessed ON kv(accessed)")
+            conn.commit()
+            self._sqlite_ok = True
+        except Exception as e:
+            print(f"⚠️ [{self.namespace}] 디스크 캐시 열기 실패(메모리만 사용): {e}")
+
+    def _sqlite(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, check_same_thread=False, timeout=10)
+            self._local.conn = conn
+        return conn
+
+    # ---------- 1단 (self._lock 안에서 호출) ----------
+    def _mem_get(self, key: str):
+        item = self._mem.get(key)
+        if item is None:
+            return None
+        expires, value = item
+        if expires and expires < time.time():
+            self._mem.pop(key, None)
+            return None
+        self._mem.move_to_end(key)
+        return item
+
+    def _mem_put(self, key: str, value: Any, expires: Optional[float]):
+        self._mem[key] = (expires or 0.0, value)
+        self._mem.move_to_end(key)
+        while len(self._mem) > self.mem_max_items:
+            self._mem.popitem(last=False)
+            self._stats["evictions"] += 1
+
+    # ---------- 공개 API ----------
+    def get(self, key: str, default: Any = None) -> Any:
+        with self._lock:
+            item = self._mem_get(key)
+            if item is not None:
+                self._stats["mem_hits"] += 1
+                return item[1]
+
+        tier2 = self._tier2()
+        raw, expires, value = None, None, None
+        try:
+            if self._redis is not None:
+                raw = self._redis.get(f"{self.namespace}:{key}")
+            elif tier2 is not None:
+                row = tier2.execute("SELECT v, expires FROM kv WHERE k=?", (key,)).fetchone()
+                if row:
+                    raw, expires = row
+                    if expires and expires < time.time():
+                        tier2.execute("DELETE FROM kv WHERE k=?", (key,))
+                        tier2.commit()
+                        raw = None
+                    else:
+                        tier2.execute("UPDATE kv SET accessed=? WHERE k=?", (time.time(), key))
+                        tier2.commit()
+            if raw is not None:
+                value = json.loads(raw)   # 깨진 항목은 아래 except에서 미스로 처리
+        except Exception as e:
+            self._count("errors")
+            print(f"⚠️ [{self.namespace}] 캐시 조회 실패: {e}")
+            raw = None
+
+        with self._lock:
+            if raw is None:
+                self._stats["misses"] += 1
+                return default
+            self._stats["disk_hits"] += 1
+            self._mem_put(key, value, expires)
+        return value
+
+    def set(self, key: str, value: Any, ttl_sec: Optional[float] = None):
+        ttl = self.ttl_sec if ttl_sec is None else ttl_sec
+        expires = (time.time() + ttl) if ttl else None
+        raw = json.dumps(value, ensure_ascii=False)
+        with self._lock:
+            self._mem_put(key, value, expires)
+            self._stats["sets"] += 1
+        tier2 = self._tier2()
+        try:
+            if self._redis is not None:
+                if ttl:
+                    self._redis.setex(f"{self.namespace}:{key}", int(ttl), raw)
+                else:
+                    self._redis.set(f"{self.namespace}:{key}", raw)
+            elif tier2 is not None:
+                tier2.execute(
+                    "INSERT OR REPLACE INTO kv (k, v, expires, accessed) VALUES (?, ?, ?, ?)",
+                    (key, raw, expires, time.time()),
+                )
+                tier2.commit()
+                with self._lock:
+                    self._writes_since_prune += 1
+                    due = self._writes_since_prune >= 256
+                    if due:
+                        self._writes_since_prune = 0
+                if due:
+                    self._prune_disk(tier2)
+        except Exception as e:
+            self._count("errors")
+            print(f"⚠️ [{self.namespace}] 캐시 저장 실패: {e}")
+
+    def _prune_disk(self, conn: Optional[sqlite3.Connection]):
+        """만료 항목 삭제 + 최대 항목 수 초과분을 오래 안 쓴 순으로 삭제."""
+        if conn is None or self._redis is not None:
+            return
+        conn.execute("DELETE FROM kv WHERE expires IS NOT NULL AND expires < ?", (time.time(),))
+        (count,) = conn.execute("SELECT COUNT(*) FROM kv").fetchone()
+        over = count - self.disk_max_items
+        if over > 0:
+            conn.execute(
+                "DELETE FROM kv WHERE k IN (SELECT k FROM kv ORDER BY accessed ASC LIMIT ?)", (over,)
+            )
+            self._count("evictions", over)
+        conn.commit()
+
+    def prune(self):
+        tier2 = self._tier2()
+        with self._lock:
+            self._writes_since_prune = 0
+        try:
+            self._prune_disk(tier2)
+        except Exception as e:
+            self._count("errors")
+            print(f"⚠️ [{self.namespace}] 캐시 정리 실패: {e}")
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            s = dict(self._stats)
+        lookups = s["mem_hits"] + s["disk_hits"] + s["misses"]
+        s["hit_ratio"] = round((s["mem_hits"] + s["disk_hits"]) / lookups, 3) if lookups else 0.0
+        s["mem_items"] = len(self._mem)
+        return s
+
+    def log_stats(self, label: str = ""):
+        s = self.stats()
+        print(
+            f"[cache:{self.namespace}]{(' ' + label) if label else ''} "
+            f"mem_hit={s['mem_hits']} disk_hit={s['disk_hits']} miss={s['misses']} "
+            f"ratio={s['hit_ratio']:.1%} evict={s['evictions']}"
+        )
@@ -10,4 +10,8 @@ SHOW_DETAILED_PROGRESS = False
 SHOW_FAILURE_ANALYSIS = False
 MIN_TEXT_LENGTH = 200
 MAX_FAILURE_DISPLAY = 10
-SEARCH_DOMAINS = ['blog.naver.com', 'news.naver.com', 'youtube.com']
\ No newline at end of file
+SEARCH_DOMAINS = ['blog.naver.com', 'news.naver.com', 'youtube.com']
+# crawl_engine (asyncio) 설정
+CRAWL_MAX_CONCURRENCY = 16      # 전체 동시 요청 수
+CRAWL_PER_DOMAIN = 4            # 도메인별 동시 요청 수
+CRAWL_MAX_BYTES = 3 * 1024 * 1024  # 페이지 본문 최대 수신 바이트 (초과분은 잘라냄)
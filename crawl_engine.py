@@ -0,0 +1,122 @@
+# crawl_engine.py — asyncio 기반 웹 페이지 수집기 (text_scraper.clean_html_parallel 대체)
+import time
+import asyncio
+import concurrent.futures
+from urllib.parse import urlparse
+from typing import Dict, List
+
+from config import *
+from text_scraper import extract_text_from_html, clean_html_parallel
+from html_extract import decode_html
+
+try:
+    import aiohttp
+except Exception:
+    aiohttp = None
+
+_USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+_HTML_TYPES = ("text/html", "application/xhtml+xml", "text/plain")
+
+
+def _result(url, text, success, elapsed, error=None) -> Dict:
+    # text_scraper.clean_html_worker와 같은 결과 형태
+    return {'url': url, 'text': text, 'success': success, 'elapsed': elapsed, 'error': error}
+
+
+def _domain_key(url: str) -> str:
+    host = (urlparse(url).hostname or "").lower()
+    return host[4:] if host.startswith("www.") else host
+
+
+async def _fetch_one(session, url: str, idx: int, domain_sems: Dict[str, asyncio.Semaphore],
+                     loop_executor) -> Dict:
+    start_time = time.time()
+    sem = domain_sems.setdefault(_domain_key(url), asyncio.Semaphore(CRAWL_PER_DOMAIN))
+    try:
+        async with sem:
+            if SHOW_DETAILED_PROGRESS:
+                print(f"[{idx+1:2d}] 페이지 파싱 중: {url}")
+            async with session.get(url, allow_redirects=True) as resp:
+                if resp.status >= 400:
+                    return _result(url, "", False, time.time() - start_time, f"HTTP {resp.status}")
+                ctype = (resp.headers.get("Content-Type") or "").split(";")[0].strip().lower()
+                # 본문을 받기 전에 비HTML(PDF, 이미지, 동영상 등)은 바로 중단
+                if ctype and not ctype.startswith(_HTML_TYPES):
+                    return _result(url, "", False, time.time() - start_time, f"비HTML 콘텐츠 ({ctype})")
+
+                buf = bytearray()
+                truncated = False
+                async for chunk in resp.content.iter_chunked(64 * 1024):
+                    buf += chunk
+                    if len(buf) >= CRAWL_MAX_BYTES:
+                        truncated = True
+                        break
+                html = decode_html(bytes(buf[:CRAWL_MAX_BYTES]), resp.charset)
+
+        # 파싱은 CPU 작업 → 이벤트 루프를 막지 않도록 스레드에서
+        text = await asyncio.get_running_loop().run_in_executor(loop_executor, extract_text_from_html, html)
+        elapsed = time.time() - start_time
+        if SHOW_DETAILED_PROGRESS:
+            note = " (크기 제한으로 잘림)" if truncated else ""
+            print(f"[{idx+1:2d}] ✓ 성공: {url} (소요시간: {elapsed:.2f}초){note}")
+        return _result(url, text, True, elapsed)
+
+    except asyncio.TimeoutError:
+        elapsed = time.time() - start_time
+        if SHOW_DETAILED_PROGRESS:
+            print(f"[{idx+1:2d}] ✗ 타임아웃: {url} (소요시간: {elapsed:.2f}초)")
+        return _result(url, "", False, elapsed, '타임아웃')
+    except Exception as e:
+        elapsed = time.time() - start_time
+        if SHOW_DETAILED_PROGRESS:
+            print(f"[{idx+1:2d}] ✗ 실패: {url} - {e} (소요시간: {elapsed:.2f}초)")
+        return _result(url, "", False, elapsed, str(e) or type(e).__name__)
+
+
+async def crawl_urls_async(urls: List[str]) -> List[Dict]:
+    """
+    - 호스트별 커넥션 풀(keep-alive, DNS 캐시) 공유
+    - 전체 동시성 CRAWL_MAX_CONCURRENCY, 도메인별 CRAWL_PER_DOMAIN
+    - 본문 CRAWL_MAX_BYTES까지만 스트리밍 수신, 비HTML은 헤더만 보고 중단
+    - 입력 순서대로 결과 반환
+    """
+    timeout = aiohttp.ClientTimeout(total=TIMEOUT_SECONDS if ENABLE_TIMEOUT else None)
+    headers = {'User-Agent': _USER_AGENT} if ENABLE_USER_AGENT else None
+    connector = aiohttp.TCPConnector(
+        limit=CRAWL_MAX_CONCURRENCY,
+        limit_per_host=CRAWL_PER_DOMAIN,
+        ttl_dns_cache=300,
+    )
+    domain_sems: Dict[str, asyncio.Semaphore] = {}
+    with concurrent.futures.ThreadPoolExecutor(max_workers=MAX_WORKERS) as parse_pool:
+        async with aiohttp.ClientSession(connector=connector, timeout=timeout, headers=headers) as session:
+            tasks = [_fetch_one(session, u, i, domain_sems, parse_pool) for i, u in enumerate(urls)]
+            return list(await asyncio.gather(*tasks))
+
+
+def crawl_urls(urls: List[str]) -> List[Dict]:
+    """
+    동기 진입점 (clean_html_parallel과 같은 결과 형태).
+    - 이미 이벤트 루프가 도는 스레드(예: 노트북)에서는 별도 스레드에서 실행
+    - aiohttp가 없으면 기존 스레드 풀 방식으로 폴백
+    """
+    if aiohttp is None:
+        print("[!] aiohttp 미설치 → 기존 스레드 방식으로 크롤링")
+        return clean_html_parallel(urls)
+
+    start_time = time.time()
+    print(f"\n[+] 비동기 크롤링으로 {len(urls)}개 사이트 수집 시작...")
+    try:
+        asyncio.get_running_loop()
+        running = True
+    except RuntimeError:
+        running = False
+    if running:
+        with concurrent.futures.ThreadPoolExecutor(max_workers=1) as ex:
+            results = ex.submit(asyncio.run, crawl_urls_async(urls)).result()
+    else:
+        results = asyncio.run(crawl_urls_async(urls))
+
+    ok = sum(1 for r in results if r['success'])
+    print(f"[+] 크롤링 완료: 성공 {ok}/{len(results)} (총 소요시간: {time.time() - start_time:.2f}초)")
+    return results
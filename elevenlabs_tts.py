@@ -1,27 +1,37 @@
 import requests
 import os
 import streamlit as st
-import boto3, io # Import the boto3 library for AWS services
+import io
 import re
 from html import escape
-from botocore.exceptions import BotoCoreError, ClientError
 import logging
 import threading
 
 # Load API keys from Streamlit secrets
 ELEVEN_API_KEY = st.secrets["ELEVEN_API_KEY"]
-AWS_ACCESS_KEY_ID = st.secrets["AWS_ACCESS_KEY_ID"]
-AWS_SECRET_ACCESS_KEY = st.secrets["AWS_SECRET_ACCESS_KEY"]
-AWS_REGION = st.secrets.get("AWS_REGION", "ap-northeast-2") # Default to Seoul region
-
-# Initialize Amazon Polly client
-# This client will be reused for Polly TTS requests.
-polly_client = boto3.client(
-    'polly',
-    aws_access_key_id=AWS_ACCESS_KEY_ID,
-    aws_secret_access_key=AWS_SECRET_ACCESS_KEY,
-    region_name=AWS_REGION
-)
+
+# Amazon Polly 클라이언트: 처음 쓸 때 한 번만 생성해 재사용 (import 시점에 boto3/자격 증명을 읽지 않음)
+_polly_client = None
+_polly_lock = threading.Lock()
+
+
+def get_polly_client():
+    global _polly_client
+    if _polly_client is None:
+        with _polly_lock:
+            if _polly_client is None:
+                import boto3
+                try:
+                    creds = {k: st.secrets.get(k) for k in ("AWS_ACCESS_KEY_ID", "AWS_SECRET_ACCESS_KEY", "AWS_REGION")}
+                except Exception:
+                    creds = {}  # secrets 없으면 환경 변수/기본 자격 증명 체인 사용
+                _polly_client = boto3.client(
+                    'polly',
+                    aws_access_key_id=creds.get("AWS_ACCESS_KEY_ID"),
+                    aws_secret_access_key=creds.get("AWS_SECRET_ACCESS_KEY"),
+                    region_name=creds.get("AWS_REGION") or "ap-northeast-2",  # Default to Seoul region
+                )
+    return _polly_client
 
 # ElevenLabs TTS Templates (unchanged from your original code)
 TTS_ELEVENLABS_TEMPLATES = {
@@ -170,6 +180,9 @@ def generate_polly_tts(text, save_path, polly_voice_name_key, *, speed=1.0, volu
     실패 시 에러 대신 계속 재시도할 수 있으며,
     재시도할 때마다 로그를 찍습니다.
     """
+    # boto3와 마찬가지로 botocore도 Polly를 실제로 쓸 때만 로드
+    from botocore.exceptions import BotoCoreError, ClientError
+
     voice_id = TTS_POLLY_VOICES.get(
         polly_voice_name_key,
         TTS_POLLY_VOICES.get("korean_female", "Seoyeon")
@@ -200,8 +213,7 @@ def generate_polly_tts(text, save_path, polly_voice_name_key, *, speed=1.0, volu
             logging.info(f"[POLLY API CALL] Attempt: {attempt}, VoiceID: {voice_id}, Engine: {engine}, Chars: {len(payload)}")
             api_start_time = time.time()
             # --- [API 호출 로깅: 끝] --->>>
-            polly = boto3.client("polly", region_name="ap-northeast-2")
-            resp = polly.synthesize_speech(
+            resp = get_polly_client().synthesize_speech(
                 Text=payload, TextType="ssml", OutputFormat="mp3",
                 VoiceId=voice_id, Engine=engine
             )
@@ -1,9 +1,20 @@
 import os
 import tempfile
-from llama_parse import LlamaParse
+import threading
 
-# LlamaParse를 사용하기 위한 parser 객체 초기화
-parser = LlamaParse(result_type="markdown")
+# LlamaParse parser 객체는 파일 파싱이 처음 필요할 때 한 번만 생성
+_parser = None
+_parser_lock = threading.Lock()
+
+
+def get_parser():
+    global _parser
+    if _parser is None:
+        with _parser_lock:
+            if _parser is None:
+                from llama_parse import LlamaParse
+                _parser = LlamaParse(result_type="markdown")
+    return _parser
 
 def get_documents_from_files(uploaded_files):
     """
@@ -22,7 +33,7 @@ def get_documents_from_files(uploaded_files):
 
             # 동기 파싱 실행 (load_data는 document list를 반환)
             print(f"'{uploaded_file.name}' 파일 파싱 중...")
-            documents = parser.load_data(temp_file_path)
+            documents = get_parser().load_data(temp_file_path)
             all_documents.extend(documents)
             print(f"'{uploaded_file.name}' 파일 파싱 완료.")
 
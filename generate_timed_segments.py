@@ -1,5 +1,7 @@
 from deep_translator import GoogleTranslator
-from ssml_converter import convert_line_to_ssml, breath_linebreaks, koreanize_if_english
+from ssml_converter import (
+    breath_linebreaks, convert_lines_to_ssml_batch, koreanize_lines_if_english,
+)
 from html import escape as _xml_escape
 # generate_timed_segments.py
 import os
@@ -1151,17 +1153,21 @@ def generate_subtitle_from_script(
     tts_lines = []
     ssml_meta_lines = []          # ★ 모든 공급자 공통: 메타 파싱용 SSML
 
-    for ln in clean_lines:
-        ln_for_ssml = koreanize_if_english(ln)   # ★ 영문이면 의미 동일 한국어로
-        # 성능 최적화: 기본적으로 OpenAI/LLM 기반 SSML 변환을 비활성화합니다.
-        # 필요 시 환경변수 USE_SSML_LLM=1 으로 복원하세요.
-        import os
-        use_llm = os.getenv("USE_SSML_LLM", "0") == "1"
+    # ★ 영문 라인은 의미 동일 한국어로 (영어 라인만 모아 배치 LLM 1~N회)
+    lines_for_ssml = koreanize_lines_if_english(clean_lines)
+    # 성능 최적화: 기본적으로 OpenAI/LLM 기반 SSML 변환을 비활성화합니다.
+    # 필요 시 환경변수 USE_SSML_LLM=1 으로 복원하세요. (배치 변환 + 라인 해시 캐시 사용)
+    use_llm = os.getenv("USE_SSML_LLM", "0") == "1"
+    llm_frags = [""] * len(lines_for_ssml)
+    if use_llm:
+        try:
+            llm_frags = convert_lines_to_ssml_batch(lines_for_ssml)  # <prosody>...</prosody> (+ <break/>)
+        except Exception as e:
+            print(f"[warn] 배치 SSML 변환 실패 → 기본 래핑 사용: {e}")
+
+    for ln_for_ssml, llm_frag in zip(lines_for_ssml, llm_frags):
         if use_llm:
-            try:
-                frag = convert_line_to_ssml(ln_for_ssml)  # <prosody>...</prosody> (+ <break/>)
-            except Exception:
-                frag = f'<prosody rate="150%" volume="medium">{_xml_escape(ln_for_ssml)}</prosody>'
+            frag = llm_frag or f'<prosody rate="150%" volume="medium">{_xml_escape(ln_for_ssml)}</prosody>'
         else:
             # 결정적 폴백: 간단한 prosody 래핑만으로 Polly/ElevenLabs에 텍스트 전송
             frag = f'<prosody rate="155%" volume="medium">{_xml_escape(ln_for_ssml)}</prosody>'
@@ -0,0 +1,201 @@
+# html_extract.py — lxml 기반 본문 추출 (선언 인코딩 우선 + 블록별 텍스트 밀도 점수)
+import re
+from typing import Optional
+
+import lxml.html
+from lxml import etree
+
+# 본문과 무관한 태그/영역 (기존 BeautifulSoup 경로의 제거 목록 + Playwright 경로의 클래스 셀렉터)
+_DROP_TAGS = ("script", "style", "noscript", "template", "svg", "iframe", "form",
+              "nav", "footer", "header", "aside", "button", "select", "textarea")
+_DROP_CLASSES = ("ad", "advertisement", "banner", "menu", "header", "footer")
+_BLOCK_TAGS = {"p", "div", "section", "article", "main", "li", "ul", "ol", "table", "tr", "td", "th",
+               "h1", "h2", "h3", "h4", "h5", "h6", "blockquote", "pre", "br", "dd", "dt", "figcaption"}
+_PARAGRAPH_TAGS = ("p", "pre", "td", "blockquote", "div", "section")
+# 문단 점수를 위로 전달하는 조상 단계별 나눗수 (부모, 조부모, ...)
+_ANCESTOR_DIVIDERS = (1, 2, 6, 9, 12)
+
+# 본문 컨테이너로 자주 쓰이는 id/class (네이버 블로그 스마트에디터/뉴스 포함) → 가산점
+_POSITIVE_RE = re.compile(r"article|content|post|entry|body|main|story|text|se-main-container|"
+                          r"dic_area|newsct|news_end|view", re.I)
+_NEGATIVE_RE = re.compile(r"comment|reply|sidebar|side|footer|header|nav|menu|banner|ad-|ads|"
+                          r"advert|promo|related|share|sns|social|recommend|popular|rank|tag|widget|"
+                          r"copyright|login|gnb|lnb", re.I)
+
+_META_CHARSET_RE = re.compile(rb'<meta[^>]+charset=["\']?\s*([A-Za-z0-9_\-]+)', re.I)
+_XML_DECL_RE = re.compile(r"^\s*<\?xml[^>]*\?>", re.I)
+
+
+def header_charset(content_type: Optional[str]) -> Optional[str]:
+    """Content-Type 헤더에 명시된 charset만 반환 (requests의 ISO-8859-1 기본값 같은 추정은 무시)."""
+    m = re.search(r"charset=([\w\-]+)", content_type or "", re.I)
+    return m.group(1) if m else None
+
+
+def decode_html(body: bytes, declared: Optional[str] = None) -> str:
+    """
+    선언된 인코딩 우선: 헤더 charset → <meta charset> → utf-8 → cp949(국내 사이트).
+    전체 본문에 chardet을 돌리지 않음.
+    """
+    candidates = []
+    if declared:
+        candidates.append(declared)
+    m = _META_CHARSET_RE.search(body[:4096])
+    if m:
+        candidates.append(m.group(1).decode("ascii", "ignore"))
+    candidates += ["utf-8", "cp949"]
+    for enc in candidates:
+        try:
+            return body.decode(enc)
+        except (LookupError, UnicodeDecodeError):
+            continue
+    return body.decode("utf-8", errors="replace")
+
+
+def _parse(html) -> Optional[etree._Element]:
+    if isinstance(html, bytes):
+        html = decode_html(html)
+    html = _XML_DECL_RE.sub("", html or "", count=1)
+    if not html.strip():
+        return None
+    try:
+        return lxml.html.document_fromstring(html)
+    except (etree.ParserError, ValueError):
+        return None
+
+
+def _strip_boilerplate(root):
+    etree.strip_elements(root, etree.Comment, with_tail=False)
+    for el in list(root.iter(*_DROP_TAGS)):
+        if el.getparent() is not None:
+            el.drop_tree()
+    for cls in _DROP_CLASSES:
+        for el in root.xpath(f'//*[contains(concat(" ", normalize-space(@class), " "), " {cls} ")]'):
+            if el.getparent() is not None:
+                el.drop_tree()
+
+
+def _class_weight(el) -> float:
+    ident = f"{el.get('id', '')} {el.get('class', '')}"
+    if not ident.strip():
+        return 1.0
+    w = 1.0
+    if _POSITIVE_RE.search(ident):
+        w *= 1.5
+    if _NEGATIVE_RE.search(ident):
+        w *= 0.3
+    return w
+
+
+def _best_container(root):
+    """
+    Readability 방식 점수:
+    - 문단(p/pre/td/blockquote, 직접 텍스트가 있는 div/section)마다 (1 + 쉼표 수 + 길이/100(최대 3)) 점수를
+      조상 5단계까지 1, 1/2, 1/6, 1/9, 1/12로 나눠 전달 (네이버 스마트에디터처럼 깊게 중첩된 본문 대응)
+    - 후보 점수 × (1 - 링크 밀도) × id/class 가중치, main/article은 추가 가산
+    반환: (본문 블록 목록, 요소별 텍스트 길이)
+    """
+    total, links = {}, {}
+    for el in reversed(list(root.iter())):
+        if not isinstance(el.tag, str):
+            continue
+        own = len((el.text or "").strip()) + sum(len((c.tail or "").strip()) for c in el)
+        t = own + sum(total.get(c, 0) for c in el)
+        total[el] = t
+        links[el] = t if el.tag == "a" else sum(links.get(c, 0) for c in el)
+
+    scores = {}
+    for el in root.iter(*_PARAGRAPH_TAGS):
+        if el.tag in ("div", "section"):
+            n = len((el.text or "").strip()) + sum(len((c.tail or "").strip()) for c in el)
+            text = el.text or ""
+        else:
+            n = total.get(el, 0)
+            text = el.text_content() if n >= 25 else ""
+        if n < 25:
+            continue
+        s = 1.0 + text.count(",") + text.count("，") + min(n / 100.0, 3.0)
+        anc = el.getparent()
+        for div in _ANCESTOR_DIVIDERS:
+            if anc is None or not isinstance(anc.tag, str):
+                break
+            scores[anc] = scores.get(anc, 0.0) + s / div
+            anc = anc.getparent()
+
+    adjusted = {}
+    for el, s in scores.items():
+        t = total.get(el, 0)
+        if not t or el.tag in ("html", "body"):
+            continue
+        link_density = links.get(el, 0) / t
+        s *= (1.0 - link_density) * _class_weight(el)
+        if el.tag in ("main", "article"):
+            s *= 1.5
+        adjusted[el] = s
+    if not adjusted:
+        return [], total
+    best = max(adjusted, key=adjusted.get)
+    return _with_siblings(best, adjusted, total, links), total
+
+
+def _with_siblings(best, adjusted, total, links) -> list:
+    """
+    본문이 형제 블록 여러 개로 쪼개진 경우(스마트에디터 모듈 등) 점수가 비슷한 형제도 함께 포함.
+    - 형제 점수 ≥ 최고 점수의 20% 이거나, 링크가 적은 80자 이상 블록
+    """
+    parent = best.getparent()
+    if parent is None:
+        return [best]
+    threshold = max(adjusted[best] * 0.2, 1.0)
+    picked = []
+    for sib in parent:
+        if not isinstance(sib.tag, str):
+            continue
+        if sib is best or adjusted.get(sib, 0.0) >= threshold:
+            picked.append(sib)
+            continue
+        t = total.get(sib, 0)
+        if t >= 80 and links.get(sib, 0) / t < 0.25 and _class_weight(sib) >= 1.0:
+            picked.append(sib)
+    return picked
+
+
+def _text_of(els, separator: str) -> str:
+    if separator == "\n":
+        parts = []
+        for el in els:
+            for node in el.iter():
+                if isinstance(node.tag, str) and node.tag in _BLOCK_TAGS and node is not el:
+                    node.tail = "\n" + (node.tail or "")
+            parts.append(el.text_content())
+        lines = (ln.strip() for ln in "\n".join(parts).split("\n"))
+        return "\n".join(ln for ln in lines if ln)
+    return " ".join(" ".join(el.text_content() for el in els).split())
+
+
+def extract_main_text(html, separator: str = " ", min_chars: int = 200) -> str:
+    """
+    HTML(str/bytes) → 본문 텍스트.
+    1) 스크립트/스타일/내비/광고 영역 제거
+    2) 텍스트 밀도 점수로 본문 컨테이너 선택 (main/article/div.content 등 의미 태그 가산)
+    3) 선택 결과가 너무 짧으면 main → article → div.content → body 순 폴백 (Playwright 경로와 같은 휴리스틱)
+    separator=" "이면 한 줄로, "\\n"이면 블록 단위 줄바꿈 유지
+    """
+    root = _parse(html)
+    if root is None:
+        return ""
+    _strip_boilerplate(root)
+    picked, total = _best_container(root)
+    body = root.find("body")
+    body_len = total.get(body, 0) if body is not None else 0
+
+    if not picked or sum(total.get(el, 0) for el in picked) < min(min_chars, body_len * 0.25):
+        picked = []
+        for xp in ("//main", "//article", '//div[contains(concat(" ", normalize-space(@class), " "), " content ")]'):
+            found = root.xpath(xp)
+            if found:
+                picked = [found[0]]
+                break
+        if not picked:
+            picked = [body if body is not None else root]
+    return _text_of(picked, separator)
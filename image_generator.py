@@ -1,10 +1,13 @@
 # image_generator.py — Pexels API rate-limit safe version
 import logging # <-- 추가
-import os, time, random, subprocess, shlex, requests
+import os, json, time, random, subprocess, threading, requests
+from concurrent.futures import ThreadPoolExecutor, as_completed, CancelledError
 from dotenv import load_dotenv
 from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
 from typing import Iterable, List, Tuple, Optional, Set, Dict, Any
+from pexels_library import get_library, PhashGuard
+from cache_store import TwoTierCache, make_key
 
 load_dotenv()
 PEXELS_API_KEY = os.getenv("PEXELS_API_KEY")
@@ -34,30 +37,198 @@ def _ensure_english(text: str) -> str:
     return t  # 실패 시 원문 유지
 
 # ===== Global throttle & cache =====
-# 연속 호출 사이 최소 간격(초). 300~500ms 권장.
+# 연속 API 호출 사이 최소 간격(초). 300~500ms 권장. (CDN 파일 다운로드에는 적용하지 않음)
 _MIN_INTERVAL_SEC = float(os.getenv("PEXELS_MIN_INTERVAL_SEC", "0.35"))
+# 순간적으로 허용할 연속 API 호출 수(버킷 크기)
+_API_BURST = int(os.getenv("PEXELS_API_BURST", "3"))
 # 헤더의 reset/Retry-After가 너무 길 때 대기 상한(초)
 _MAX_WAIT_ON_429 = int(os.getenv("PEXELS_MAX_WAIT_SEC", "60"))
-# 간단 메모리 캐시 (프로세스 생존 동안)
-_CACHE: Dict[Tuple[str, Tuple[Tuple[str, Any], ...]], Any] = {}
-_last_call_ts = 0.0
-
-def _sleep_for_throttle():
-    global _last_call_ts
-    now = time.time()
-    elapsed = now - _last_call_ts
-    gap = _MIN_INTERVAL_SEC - elapsed
-    if gap > 0:
-        # 지터를 약간 주어 동시 다발 호출 완화
-        time.sleep(gap + random.uniform(0, 0.05))
-
-def _mark_called():
-    global _last_call_ts
-    _last_call_ts = time.time()
+# 남은 쿼터가 X-Ratelimit-Limit의 이 비율 아래로 떨어질 때만 속도를 낮춤 (그 전에는 기본 속도)
+_QUOTA_LOW_WATER = float(os.getenv("PEXELS_QUOTA_LOW_WATER", "0.05"))
+# 저수위 아래에서는 남은 쿼터를 최대 이 시간(초)에 나눠 씀 (Reset은 월간 쿼터 리셋 시각이라 그대로 나누면 너무 느림)
+_QUOTA_PACE_WINDOW_SEC = float(os.getenv("PEXELS_QUOTA_PACE_WINDOW_SEC", "3600"))
+# CDN 이미지/영상 동시 다운로드 수
+_DOWNLOAD_WORKERS = int(os.getenv("PEXELS_DOWNLOAD_WORKERS", "6"))
+# 검색 응답 캐시: 메모리 LRU + 디스크(SQLite). fresh 기간 안에는 그대로 사용,
+# 지나면 ETag/Last-Modified로 조건부 재검증(304면 쿼터만 살짝 쓰고 본문 재사용)
+_SEARCH_FRESH_SEC = float(os.getenv("PEXELS_SEARCH_FRESH_SEC", str(24 * 3600)))
+_CACHE = TwoTierCache(
+    "pexels_search",
+    ttl_sec=float(os.getenv("PEXELS_SEARCH_CACHE_TTL_SEC", str(14 * 86400))),
+    mem_max_items=int(os.getenv("PEXELS_SEARCH_CACHE_MEM_ITEMS", "512")),
+    disk_max_items=int(os.getenv("PEXELS_SEARCH_CACHE_DISK_ITEMS", "20000")),
+    backend=os.getenv("PEXELS_SEARCH_CACHE_BACKEND") or None,
+)
+
+
+class DownloadCancelled(Exception):
+    """cancel_event가 세팅되어 검색/다운로드를 중단함."""
+
+
+class _ApiRateLimiter:
+    """
+    Pexels 검색 API 전용 토큰 버킷 (스레드 안전).
+    - 기본 속도: 1 / _MIN_INTERVAL_SEC, 버킷 크기 _API_BURST
+    - 남은 쿼터(X-Ratelimit-Remaining)가 충분하면 기본 속도 유지, Limit의 _QUOTA_LOW_WATER 아래로 떨어지면
+      남은 양을 min(reset까지, _QUOTA_PACE_WINDOW_SEC)에 나눠 쓰도록 감속
+    - 429/쿼터 소진 시 reset 시각까지 모든 스레드가 함께 대기
+    """
+
+    def __init__(self, interval_sec: float, burst: int):
+        self._base_rate = 1.0 / max(interval_sec, 1e-3)
+        self._rate = self._base_rate
+        self._capacity = max(1, burst)
+        self._tokens = float(self._capacity)
+        self._updated = time.monotonic()
+        self._blocked_until = 0.0
+        self._cond = threading.Condition()
+
+    def _refill(self, now: float):
+        self._tokens = min(self._capacity, self._tokens + (now - self._updated) * self._rate)
+        self._updated = now
+
+    def acquire(self, cancel_event: Optional[threading.Event] = None):
+        with self._cond:
+            while True:
+                if cancel_event is not None and cancel_event.is_set():
+                    raise DownloadCancelled()
+                now = time.monotonic()
+                self._refill(now)
+                wait = self._blocked_until - now
+                if wait <= 0 and self._tokens >= 1.0:
+                    self._tokens -= 1.0
+                    return
+                if wait <= 0:
+                    wait = (1.0 - self._tokens) / self._rate
+                # 지터를 약간 주어 동시 다발 호출 완화 + 취소 확인 주기 확보
+                self._cond.wait(min(wait + random.uniform(0, 0.05), 1.0))
+
+    def block_for(self, seconds: float):
+        with self._cond:
+            self._blocked_until = max(self._blocked_until, time.monotonic() + seconds)
+            self._tokens = 0.0
+
+    def observe(self, h: requests.structures.CaseInsensitiveDict):
+        """응답 헤더로 남은 쿼터에 맞춰 속도 조정."""
+        try:
+            remaining = int(h.get("X-Ratelimit-Remaining"))
+            reset_in = float(h.get("X-Ratelimit-Reset")) - time.time()  # Reset은 UNIX epoch
+        except (TypeError, ValueError):
+            return
+        try:
+            limit = int(h.get("X-Ratelimit-Limit"))
+        except (TypeError, ValueError):
+            limit = 0
+        low_water = max(1, int(limit * _QUOTA_LOW_WATER)) if limit > 0 else 1
+        with self._cond:
+            if remaining <= 0 and reset_in > 0:
+                self._blocked_until = time.monotonic() + min(reset_in, _MAX_WAIT_ON_429)
+                self._tokens = 0.0
+            elif remaining < low_water and reset_in > 0:
+                window = min(reset_in, _QUOTA_PACE_WINDOW_SEC)
+                self._rate = min(self._base_rate, max(remaining / window, 1e-3))
+            else:
+                self._rate = self._base_rate
+            self._cond.notify_all()
+
+
+_API_LIMITER = _ApiRateLimiter(_MIN_INTERVAL_SEC, _API_BURST)
+
+_cdn_session_obj: Optional[requests.Session] = None
+_cdn_session_lock = threading.Lock()
+
+def _cdn_session() -> requests.Session:
+    """
+    CDN(images.pexels.com / videos.pexels.com) 파일 다운로드용 공유 세션.
+    - API 키를 보내지 않음, 쿼터/스로틀과 무관
+    - 동시 다운로드 수만큼 커넥션풀 확보 (requests.Session은 스레드 간 GET 공유 가능)
+    """
+    global _cdn_session_obj
+    if _cdn_session_obj is None:
+        with _cdn_session_lock:
+            if _cdn_session_obj is None:
+                s = requests.Session()
+                s.headers.update({"User-Agent": "PerfectoAI/1.0"})
+                retry = Retry(total=3, backoff_factor=0.5, status_forcelist=(429, 500, 502, 503, 504),
+                              allowed_methods={"GET", "HEAD"}, raise_on_status=False)
+                pool = max(4, _DOWNLOAD_WORKERS * 2)
+                adapter = HTTPAdapter(max_retries=retry, pool_connections=pool, pool_maxsize=pool)
+                s.mount("http://", adapter)
+                s.mount("https://", adapter)
+                _cdn_session_obj = s
+    return _cdn_session_obj
+
+def _download_bytes(url: str, cancel_event: Optional[threading.Event] = None) -> bytes:
+    if cancel_event is not None and cancel_event.is_set():
+        raise DownloadCancelled()
+    buf = bytearray()
+    with _cdn_session().get(url, stream=True, timeout=(5, 30)) as r:
+        r.raise_for_status()
+        for chunk in r.iter_content(1024 * 64):
+            if cancel_event is not None and cancel_event.is_set():
+                raise DownloadCancelled()
+            buf += chunk
+    return bytes(buf)
+
+def _download_to_file(url: str, path: str, cancel_event: Optional[threading.Event] = None):
+    if cancel_event is not None and cancel_event.is_set():
+        raise DownloadCancelled()
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    try:
+        with _cdn_session().get(url, stream=True, timeout=(5, 30)) as r:
+            r.raise_for_status()
+            with open(path, "wb") as f:
+                for chunk in r.iter_content(1024 * 64):
+                    if cancel_event is not None and cancel_event.is_set():
+                        raise DownloadCancelled()
+                    if chunk:
+                        f.write(chunk)
+    except BaseException:
+        try:
+            if os.path.exists(path):
+                os.remove(path)
+        except Exception:
+            pass
+        raise
+
+def _run_concurrently(fn, items: List[Any], cancel_event: Optional[threading.Event] = None,
+                      max_workers: Optional[int] = None) -> List[Any]:
+    """
+    items 각각에 fn을 동시에 실행하고 입력 순서대로 (결과 또는 예외)를 반환.
+    cancel_event가 세팅되면 아직 시작 안 한 작업은 취소.
+    """
+    if not items:
+        return []
+    if len(items) == 1:
+        try:
+            return [fn(items[0])]
+        except Exception as e:
+            return [e]
+    out: List[Any] = [None] * len(items)
+    with ThreadPoolExecutor(max_workers=min(max_workers or _DOWNLOAD_WORKERS, len(items))) as ex:
+        futs = {ex.submit(fn, it): i for i, it in enumerate(items)}
+        for fut in as_completed(futs):
+            i = futs[fut]
+            try:
+                out[i] = fut.result()
+            except CancelledError:
+                out[i] = DownloadCancelled()
+            except Exception as e:
+                out[i] = e
+            if cancel_event is not None and cancel_event.is_set():
+                for f in futs:
+                    f.cancel()
+    for i, v in enumerate(out):
+        if v is None:
+            out[i] = DownloadCancelled()
+    return out
+
+_api_sessions: Dict[Tuple[int, float], requests.Session] = {}
+_api_sessions_lock = threading.Lock()
 
 def _pexels_session(total=3, backoff=0.5) -> requests.Session:
     """
-    Pexels 전용 requests 세션:
+    Pexels 전용 requests 세션 (모듈 단위로 재사용 → keep-alive 커넥션 유지):
     - 429는 status_forcelist에서 제외 (우리가 직접 처리)
     - 5xx/네트워크 오류만 지수백오프로 재시도
     - 커넥션풀 설정
@@ -65,6 +236,14 @@ def _pexels_session(total=3, backoff=0.5) -> requests.Session:
     if not PEXELS_API_KEY:
         raise RuntimeError("PEXELS_API_KEY가 설정되지 않았습니다(.env).")
 
+    key = (int(total), float(backoff))
+    with _api_sessions_lock:
+        s = _api_sessions.get(key)
+        if s is None:
+            s = _api_sessions[key] = _new_pexels_session(total, backoff)
+    return s
+
+def _new_pexels_session(total: int, backoff: float) -> requests.Session:
     s = requests.Session()
     s.headers.update({
         "User-Agent": "PerfectoAI/1.0 (+rate-limit-aware)",
@@ -127,27 +306,50 @@ def _log_quota(h: requests.structures.CaseInsensitiveDict):
             else:
                 print("ℹ️", msg)
 
-def _cache_key(url: str, params: Dict[str, Any]) -> Tuple[str, Tuple[Tuple[str, Any], ...]]:
+def _cache_key(url: str, params: Dict[str, Any]) -> str:
     # 파라미터 정렬하여 키 생성
-    return (url, tuple(sorted(params.items())))
+    return make_key(url, *(f"{k}={v}" for k, v in sorted(params.items())))
+
+def search_cache_stats() -> Dict[str, Any]:
+    """검색 응답 캐시 hit/miss + 조건부 재검증 결과."""
+    s = _CACHE.stats()
+    with _REVALIDATE_STATS_LOCK:
+        s.update(_REVALIDATE_STATS)
+    return s
+
+_REVALIDATE_STATS = {"revalidated_304": 0, "refetched_200": 0}
+_REVALIDATE_STATS_LOCK = threading.Lock()  # 검색은 여러 작업 스레드에서 동시에 호출됨
+
+def _count_revalidate(name: str):
+    with _REVALIDATE_STATS_LOCK:
+        _REVALIDATE_STATS[name] += 1
 
-def _pexels_get_json(sess: requests.Session, url: str, params: Dict[str, Any]) -> Any:
+def _pexels_get_json(sess: requests.Session, url: str, params: Dict[str, Any],
+                     cancel_event: Optional[threading.Event] = None) -> Any:
     """
-    - 전역 슬로틀링 적용
-    - 429면 헤더 기반으로 대기 후 재시도
-    - 간단 캐시 사용(동일 url+params)
+    - 전역 토큰 버킷(_API_LIMITER) 적용, X-Ratelimit-* 헤더로 속도 자동 조정
+    - 429면 헤더 기반으로 모든 스레드가 대기 후 재시도
+    - 응답 캐시(동일 url+params): fresh면 API 호출 없음, stale이면 If-None-Match/If-Modified-Since로 재검증
     """
     key = _cache_key(url, params)
-    if key in _CACHE:
-        return _CACHE[key]
+    cached = _CACHE.get(key)
+    if cached and time.time() - cached.get("fetched", 0) < _SEARCH_FRESH_SEC:
+        return cached["data"]
+
+    cond_headers = {}
+    if cached:
+        if cached.get("etag"):
+            cond_headers["If-None-Match"] = cached["etag"]
+        if cached.get("last_modified"):
+            cond_headers["If-Modified-Since"] = cached["last_modified"]
 
     while True:
-        _sleep_for_throttle()
+        _API_LIMITER.acquire(cancel_event)
         # <<<--- [API 호출 로깅: 시작] ---
         logging.info(f"[PEXELS API CALL] URL: {url}, Query: {params.get('query')}, Page: {params.get('page')}")
         api_start_time = time.time()
         # --- [API 호출 로깅: 끝] --->>>
-        r = sess.get(url, params=params, timeout=(5, 20))
+        r = sess.get(url, params=params, headers=cond_headers or None, timeout=(5, 20))
         # <<<--- [API 응답 로깅: 시작] ---
         api_end_time = time.time()
         logging.info(f"[PEXELS API RESP] Status: {r.status_code}, Elapsed: {api_end_time - api_start_time:.2f}s")
@@ -156,8 +358,14 @@ def _pexels_get_json(sess: requests.Session, url: str, params: Dict[str, Any]) -
         if r.status_code == 429:
             wait_s = _headers_wait_seconds(r.headers)
             print(f"⏳ 429 Too Many Requests. {wait_s}s 대기 후 재시도.")
-            time.sleep(wait_s)
+            _API_LIMITER.block_for(wait_s)
             continue
+        if r.status_code == 304 and cached:
+            _API_LIMITER.observe(r.headers)
+            cached["fetched"] = time.time()
+            _CACHE.set(key, cached)
+            _count_revalidate("revalidated_304")
+            return cached["data"]
         # 5xx 등은 세션의 Retry가 알아서 처리, 여기서는 상태 확인만
         try:
             r.raise_for_status()
@@ -166,24 +374,259 @@ def _pexels_get_json(sess: requests.Session, url: str, params: Dict[str, Any]) -
             print(f"❌ HTTP {r.status_code} on {url} params={params}")
             raise e
 
-        _mark_called()
+        _API_LIMITER.observe(r.headers)
         _log_quota(r.headers)
         data = r.json()
-        _CACHE[key] = data
+        _CACHE.set(key, {
+            "data": data,
+            "fetched": time.time(),
+            "etag": r.headers.get("ETag"),
+            "last_modified": r.headers.get("Last-Modified"),
+        })
+        if cached:
+            _count_revalidate("refetched_200")
         return data
 
-# ===== 영상 리사이즈 유틸 =====
-def _shrink_to_720_inplace(path: str):
+# ===== 영상 정규화(720x1080, 무음) 유틸 =====
+# 동시에 돌릴 ffmpeg 인코딩 수 (CPU 코어 기반). 인코더 스레드는 코어를 나눠 씀
+_FFMPEG_WORKERS = int(os.getenv("PEXELS_FFMPEG_WORKERS", str(max(1, (os.cpu_count() or 2) // 2))))
+_FFMPEG_THREADS = max(1, (os.cpu_count() or 2) // _FFMPEG_WORKERS)
+_FFMPEG_SLOTS = threading.BoundedSemaphore(_FFMPEG_WORKERS)
+# moov 위치 판단을 위해 스트림 앞부분을 최대 이만큼까지 훑어봄
+_MOOV_PEEK_BYTES = 4 * 1024 * 1024
+_NORMALIZE_VF = "scale=720:1080:force_original_aspect_ratio=increase,crop=720:1080,format=yuv420p"
+
+def _normalize_cmd(src: str, dst: str, max_sec: Optional[float] = None) -> List[str]:
+    """9:16 캔버스 720x1080, 30fps, 오디오 제거(-an), CRF 30 ultrafast → 합성 단계에서 그대로 사용."""
+    limit = ["-t", f"{max_sec:.3f}"] if max_sec else []
+    return [
+        "ffmpeg", "-y", "-loglevel", "error", "-i", src, *limit,
+        "-vf", _NORMALIZE_VF, "-r", "30", "-an",
+        "-c:v", "libx264", "-preset", "ultrafast", "-crf", "30",
+        "-threads", str(_FFMPEG_THREADS), "-movflags", "+faststart", dst,
+    ]
+
+def _mp4_moov_first(head: bytes) -> Optional[bool]:
+    """
+    MP4 최상위 박스를 앞에서부터 훑어 moov가 mdat보다 먼저 오는지 판단.
+    - True: faststart(파이프 입력 가능) / False: moov가 뒤에 있음 / None: 아직 판단 불가(더 읽어야 함)
+    """
+    off = 0
+    while off + 8 <= len(head):
+        size = int.from_bytes(head[off:off + 4], "big")
+        box = head[off + 4:off + 8]
+        if box == b"moov":
+            return True
+        if box == b"mdat":
+            return False
+        if size == 1:
+            if off + 16 > len(head):
+                return None
+            size = int.from_bytes(head[off + 8:off + 16], "big")
+        if size < 8:
+            return False
+        off += size
+    return None
+
+def _mp4_mdat_span(head: bytes) -> Optional[Tuple[int, int]]:
+    """앞부분 바이트에서 최상위 mdat 박스의 (시작 오프셋, 크기)를 찾음. 못 찾으면 None."""
+    off = 0
+    while off + 8 <= len(head):
+        size = int.from_bytes(head[off:off + 4], "big")
+        box = head[off + 4:off + 8]
+        if size == 1:
+            if off + 16 > len(head):
+                return None
+            size = int.from_bytes(head[off + 8:off + 16], "big")
+        if box == b"mdat":
+            return (off, size) if size >= 8 else None
+        if size < 8:
+            return None
+        off += size
+    return None
+
+def _probe_duration(path: str) -> float:
+    """ffprobe로 결과물 검증: 비디오 스트림 720x1080이면 길이(초), 아니면 0."""
+    try:
+        out = subprocess.run(
+            ["ffprobe", "-v", "error", "-select_streams", "v:0",
+             "-show_entries", "stream=width,height:format=duration", "-of", "json", path],
+            check=True, capture_output=True, text=True, timeout=30,
+        ).stdout
+        info = json.loads(out or "{}")
+        st = (info.get("streams") or [{}])[0]
+        dur = float((info.get("format") or {}).get("duration") or 0)
+        return dur if (st.get("width") == 720 and st.get("height") == 1080) else 0.0
+    except Exception:
+        return 0.0
+
+# 작업 단위 다운로드 바이트 집계 (부분 다운로드 절감량 보고용)
+_VIDEO_BYTES = {"clips": 0, "partial": 0, "downloaded": 0, "full": 0}
+_VIDEO_BYTES_LOCK = threading.Lock()
+
+def _count_video_bytes(downloaded: int, full: int, partial: bool):
+    with _VIDEO_BYTES_LOCK:
+        _VIDEO_BYTES["clips"] += 1
+        _VIDEO_BYTES["partial"] += int(partial)
+        _VIDEO_BYTES["downloaded"] += downloaded
+        _VIDEO_BYTES["full"] += max(full, downloaded)
+
+def pop_video_bytes_stats() -> Dict[str, int]:
+    """지금까지의 영상 다운로드 바이트 통계를 반환하고 0으로 초기화 (작업 1건 단위 보고)."""
+    with _VIDEO_BYTES_LOCK:
+        out = dict(_VIDEO_BYTES)
+        for k in _VIDEO_BYTES:
+            _VIDEO_BYTES[k] = 0
+    out["saved"] = out["full"] - out["downloaded"]
+    return out
+
+def _is_head_clip(dur: float, max_sec: Optional[float], clip_sec: float) -> bool:
+    """-t max_sec로 인코딩한 결과가 원본 전체보다 짧으면 앞부분 클립 (원본 길이를 모르면 잘렸다고 간주)."""
+    if not max_sec:
+        return False
+    if clip_sec > 0:
+        return dur + 0.5 < clip_sec
+    return dur >= max_sec - 0.5
+
+def _range_get(url: str, start: int, end: int, cancel_event: Optional[threading.Event] = None) -> bytes:
+    """HTTP Range로 [start, end] 구간만 받기. 서버가 206을 주지 않으면 예외."""
+    buf = bytearray()
+    with _cdn_session().get(url, headers={"Range": f"bytes={start}-{end}"}, stream=True, timeout=(5, 30)) as r:
+        if r.status_code != 206:
+            raise IOError(f"Range 미지원(status={r.status_code})")
+        for chunk in r.iter_content(256 * 1024):
+            if cancel_event is not None and cancel_event.is_set():
+                raise DownloadCancelled()
+            buf += chunk
+    return bytes(buf)
+
+def _stream_normalize(url: str, dst: str, cancel_event: Optional[threading.Event] = None,
+                      max_sec: Optional[float] = None, clip_sec: float = 0.0) -> Tuple[str, bool]:
     """
-    원본을 720p 세로 기준으로 즉시 재인코딩하여 덮어쓴다.
-    - 9:16 캔버스 기준으로 scale+crop
-    - CRF 30, ultrafast → 클라우드에서도 가볍게
+    CDN 스트림을 ffmpeg stdin으로 바로 흘려 720x1080 무음 MP4로 정규화 (다운로드 후 재인코딩 X).
+    - max_sec가 있으면 앞부분 max_sec초만 인코딩하고 남은 스트림은 받지 않음
+    - moov가 파일 뒤쪽이면(파이프로 디먹싱 불가):
+      · max_sec + Range 지원 시: 필요한 앞부분 mdat + 끝의 moov만 Range로 받아 sparse 파일로 인코딩
+      · 그 외(또는 부분 인코딩 실패): 전체를 임시 파일로 받은 뒤 인코딩
+    - ffmpeg 동시 실행 수는 _FFMPEG_SLOTS로 제한, 결과는 ffprobe로 검증
+    반환: (dst, 앞부분 클립 여부) — 일부만 받았거나 -t max_sec로 원본보다 짧게 잘렸으면 True
     """
-    tmp = path + ".shrink.mp4"
-    vf = 'scale=720:-2:force_original_aspect_ratio=increase,crop=720:1080,format=yuv420p'
-    cmd = f'ffmpeg -y -i {shlex.quote(path)} -vf {shlex.quote(vf)} -r 30 -c:v libx264 -preset ultrafast -crf 30 -c:a aac -b:a 96k {shlex.quote(tmp)}'
-    subprocess.run(cmd, shell=True, check=True, stdout=subprocess.DEVNULL, stderr=subprocess.STDOUT)
-    os.replace(tmp, path)
+    os.makedirs(os.path.dirname(dst) or ".", exist_ok=True)
+    tmp_out = dst + ".enc.mp4"
+    tmp_in = dst + ".src.part"
+    proc = None
+    read = 0
+    total = 0
+    partial = False
+
+    def _encode_file(limit: Optional[float]) -> float:
+        subprocess.run(_normalize_cmd(tmp_in, tmp_out, limit),
+                       stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        return _probe_duration(tmp_out)
+
+    with _FFMPEG_SLOTS:
+        try:
+            with _cdn_session().get(url, stream=True, timeout=(5, 30)) as r:
+                r.raise_for_status()
+                total = int(r.headers.get("Content-Length") or 0)
+                ranges_ok = r.headers.get("Accept-Ranges", "").lower() == "bytes" and total > 0
+                chunks = r.iter_content(256 * 1024)
+                head = b""
+                moov_first = None
+                for chunk in chunks:
+                    head += chunk
+                    moov_first = _mp4_moov_first(head)
+                    if moov_first is not None or len(head) >= _MOOV_PEEK_BYTES:
+                        break
+                read = len(head)
+
+                # (a) faststart: 파이프로 바로 인코딩, -t에 도달하면 ffmpeg이 먼저 끝나므로 스트림 중단
+                if moov_first:
+                    proc = subprocess.Popen(_normalize_cmd("pipe:0", tmp_out, max_sec), stdin=subprocess.PIPE,
+                                            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+                    try:
+                        proc.stdin.write(head)
+                        for chunk in chunks:
+                            if cancel_event is not None and cancel_event.is_set():
+                                raise DownloadCancelled()
+                            if chunk:
+                                proc.stdin.write(chunk)
+                                read += len(chunk)
+                    except BrokenPipeError:
+                        pass  # -t 도달로 ffmpeg 정상 종료
+                    finally:
+                        try:
+                            proc.stdin.close()
+                        except Exception:
+                            pass
+                    partial = bool(total) and read < total
+                    rc = proc.wait()
+                    dur = _probe_duration(tmp_out) if rc == 0 else 0.0
+                    if dur <= 0:
+                        raise IOError(f"ffmpeg 정규화 실패(rc={rc}, pipe=True)")
+                    os.replace(tmp_out, dst)
+                    # 본문을 다 받았어도(또는 Content-Length가 없어도) -t에서 잘렸으면 앞부분 클립
+                    return dst, partial or _is_head_clip(dur, max_sec, clip_sec)
+
+                # (b) moov가 뒤쪽: 필요한 앞부분만 받고 moov는 Range로
+                span = _mp4_mdat_span(head)
+                if max_sec and clip_sec > max_sec and ranges_ok and span:
+                    mdat_off, mdat_size = span
+                    moov_off = mdat_off + mdat_size
+                    # 시간 비례 추정 + 25% 여유 + 512KB (키프레임/인터리브 오차)
+                    lead = min(moov_off, mdat_off + int(mdat_size * (max_sec / clip_sec) * 1.25) + 512 * 1024)
+                    buf = bytearray(head)
+                    if len(buf) < lead:
+                        for chunk in chunks:
+                            if cancel_event is not None and cancel_event.is_set():
+                                raise DownloadCancelled()
+                            buf += chunk
+                            if len(buf) >= lead:
+                                break
+                    r.close()
+                    tail = _range_get(url, moov_off, total - 1, cancel_event) if moov_off < total else b""
+                    read = len(buf) + len(tail)
+                    with open(tmp_in, "wb") as f:
+                        f.truncate(total)          # 받지 않은 구간은 sparse(디스크 미사용)
+                        f.write(buf[:moov_off])
+                        f.seek(moov_off)
+                        f.write(tail)
+                    if _encode_file(max_sec) >= max_sec * 0.9:
+                        os.replace(tmp_out, dst)
+                        partial = True
+                        return dst, True
+                    print(f"↩️ 부분 다운로드 인코딩 불완전 → 전체 다운로드로 재시도 | {url}")
+                    _download_to_file(url, tmp_in, cancel_event)
+                    read += total
+                else:
+                    with open(tmp_in, "wb") as f:
+                        f.write(head)
+                        for chunk in chunks:
+                            if cancel_event is not None and cancel_event.is_set():
+                                raise DownloadCancelled()
+                            if chunk:
+                                f.write(chunk)
+                                read += len(chunk)
+
+            # (c) 전체 파일 기반 인코딩 (-t max_sec로 잘렸으면 앞부분 클립으로 보고)
+            dur = _encode_file(max_sec)
+            if dur <= 0:
+                raise IOError("ffmpeg 정규화 실패(pipe=False)")
+            os.replace(tmp_out, dst)
+            return dst, _is_head_clip(dur, max_sec, clip_sec)
+        except BaseException:
+            if proc is not None and proc.poll() is None:
+                proc.kill()
+                proc.wait()
+            raise
+        finally:
+            _count_video_bytes(read, total, partial)
+            for p in (tmp_in, tmp_out):
+                try:
+                    if os.path.exists(p):
+                        os.remove(p)
+                except Exception:
+                    pass
 
 # ===== 이미지 단건 =====
 def generate_image_pexels(query: str, save_path: str, per_page: int = 1) -> str:
@@ -199,72 +642,157 @@ def generate_image_pexels(query: str, save_path: str, per_page: int = 1) -> str:
     image_url = photos[0]["src"].get("large2x") or photos[0]["src"].get("large") or photos[0]["src"].get("original")
     if not image_url:
         raise RuntimeError("다운로드 가능한 이미지 URL을 찾지 못했습니다.")
-    _sleep_for_throttle()
-    r2 = sess.get(image_url, timeout=(5, 30))
-    r2.raise_for_status()
-
-    os.makedirs(os.path.dirname(save_path), exist_ok=True)
-    with open(save_path, "wb") as f:
-        f.write(r2.content)
+    _download_to_file(image_url, save_path)
     print(f"✅ 이미지 저장 완료: {save_path}")
-    _mark_called()
     return save_path
 
 # ===== 이미지 배치 =====
+def _library_query(q_en: str, per_page: int) -> str:
+    # per_page가 다르면 같은 page라도 결과가 다르므로 키에 포함
+    return f"{q_en}#pp{per_page}"
+
 def generate_images_for_topic(
     query: str,
     num_images: int,
-    start_index: int = 0,
+    start_index: int = 0,                        # (호환용) 라이브러리 경로를 반환하므로 파일명에 쓰지 않음
     page: int = 1,                               # 시작 페이지
     exclude_ids: Optional[Iterable[int]] = None, # 이미 사용한 사진 ID 집합
-    return_ids: bool = False                     # 사진 ID 반환 여부
+    return_ids: bool = False,                    # 사진 ID 반환 여부
+    phash_guard: Optional[PhashGuard] = None,    # 작업 단위 근접중복(지각 해시) 필터
+    cancel_event: Optional[threading.Event] = None,  # 세팅되면 남은 검색/다운로드 중단
 ):
-    sess = _pexels_session()
+    """
+    Pexels 사진을 로컬 라이브러리(assets/pexels_library)에 받아 그 경로를 반환.
+    - 같은 (쿼리, page, per_page)를 예전에 검색했고 파일이 모두 남아 있으면 API 호출 없이 디스크에서 제공
+    - 이미 받은 사진 id는 다시 다운로드하지 않음
+    - 새로 받을 사진은 CDN에서 동시에 다운로드 (API 쿼터/스로틀과 무관)
+    - phash_guard가 있으면 앞 문장에서 쓴 이미지와 거의 같은 사진은 건너뜀
+    """
+    lib = get_library()
     per_page = min(max(num_images, 1), 80)
     image_paths: List[str] = []
     kept_ids: List[int] = []
     exclude: Set[int] = set(int(x) for x in (exclude_ids or []))
     current_page = max(1, page)
+    sess = None
+
+    def _accept(rec: Dict[str, Any]) -> bool:
+        pid = rec["pexels_id"]
+        if pid in exclude:
+            return False
+        if phash_guard is not None and not phash_guard.admit(rec.get("phash")):
+            print(f"↩️ 근접중복 이미지 건너뜀: id={pid}")
+            exclude.add(pid)
+            return False
+        exclude.add(pid)
+        image_paths.append(rec["path"])
+        kept_ids.append(pid)
+        return True
+
+    def _fetch(photo: Dict[str, Any]) -> Dict[str, Any]:
+        pid = int(photo["id"])
+        rec = lib.get("image", pid)
+        if rec is not None:
+            return rec
+        src = photo["src"].get("large2x") or photo["src"].get("large") or photo["src"].get("original")
+        if not src:
+            raise ValueError("다운로드 가능한 이미지 URL 없음")
+        try:
+            data = _download_bytes(src, cancel_event)
+        except DownloadCancelled:
+            raise
+        except Exception as e:
+            raise IOError(f"{e} ({src})")
+        return lib.add_bytes("image", pid, data, query=q_en)
 
     while len(image_paths) < num_images:
+        if cancel_event is not None and cancel_event.is_set():
+            break
         q_en = _ensure_english(query)
+        lib_query = _library_query(q_en, per_page)
+
+        # 1) 디스크 인덱스로 먼저 해결 시도
+        known_ids = lib.query_ids("image", lib_query, current_page)
+        if known_ids:
+            recs = [lib.get("image", pid) for pid in known_ids]
+            if all(recs):
+                for rec in recs:
+                    if len(image_paths) >= num_images:
+                        break
+                    _accept(rec)
+                current_page += 1
+                continue
+
+        # 2) API 검색
+        if sess is None:
+            sess = _pexels_session()
         params = {"query": q_en, "per_page": per_page, "page": current_page}
-        data = _pexels_get_json(sess, "https://api.pexels.com/v1/search", params)
+        try:
+            data = _pexels_get_json(sess, "https://api.pexels.com/v1/search", params, cancel_event)
+        except DownloadCancelled:
+            break
         photos = data.get("photos", [])
         if not photos:
             break
-
-        for photo in photos:
-            if len(image_paths) >= num_images:
+        lib.remember_query("image", lib_query, current_page, [int(p.get("id") or 0) for p in photos])
+
+        # 3) 필요한 만큼씩 묶어서 동시 다운로드 → 검색 순서대로 채택
+        pending = [p for p in photos if int(p.get("id") or 0) and int(p["id"]) not in exclude]
+        while pending and len(image_paths) < num_images:
+            need = num_images - len(image_paths)
+            batch, pending = pending[:need], pending[need:]
+            for photo, res in zip(batch, _run_concurrently(_fetch, batch, cancel_event)):
+                if isinstance(res, DownloadCancelled):
+                    continue
+                if isinstance(res, Exception):
+                    print(f"⚠️ 이미지 다운로드 실패 (id={photo.get('id')}): {res}")
+                    continue
+                if len(image_paths) < num_images:
+                    _accept(res)
+            if cancel_event is not None and cancel_event.is_set():
                 break
-            pid = int(photo.get("id") or 0)
-            if pid and pid in exclude:
-                continue
-
-            src = photo["src"].get("large2x") or photo["src"].get("large") or photo["src"].get("original")
-            if not src:
-                continue
-
-            save_path = f"assets/image_{start_index + len(image_paths)}.jpg"
-            try:
-                _sleep_for_throttle()
-                rimg = sess.get(src, timeout=(5, 30))
-                rimg.raise_for_status()
-                os.makedirs(os.path.dirname(save_path), exist_ok=True)
-                with open(save_path, "wb") as f:
-                    f.write(rimg.content)
-                _mark_called()
-                image_paths.append(save_path)
-                if pid:
-                    kept_ids.append(pid)
-            except Exception as e:
-                print(f"⚠️ 이미지 다운로드 실패 ({src}): {e}")
 
         current_page += 1
 
     return (image_paths, kept_ids) if return_ids else image_paths
 
 # ===== 영상 배치 =====
+def _score_video_file(f: Dict[str, Any], need_sec: float) -> float:
+    """
+    렌디션 비용 점수(낮을수록 좋음) ≈ 예상 다운로드 바이트.
+    - 해상도: 720x1080 cover에 필요한 만큼만. 업스케일이 필요하면(작은 파일) 화질 손실 페널티
+    - fps: 출력은 30fps → 60fps 렌디션은 바이트만 두 배
+    - 길이: 실제로 받을 구간(need_sec)에 비례
+    """
+    w, h = f.get("width") or 0, f.get("height") or 0
+    if not w or not h:
+        return float("inf")
+    fps = float(f.get("fps") or 30) or 30.0
+    cover_scale = max(720 / w, 1080 / h)
+    upscale_penalty = 1.0 if cover_scale <= 1.0 else 1.0 + 4.0 * (cover_scale - 1.0)
+    return w * h * max(fps, 24.0) * max(need_sec, 1.0) * upscale_penalty
+
+def _pick_video_file(v: Dict[str, Any], need_sec: Optional[float] = None) -> Optional[Dict[str, Any]]:
+    candidates = [f for f in v.get("video_files", [])
+                  if f.get("link", "").endswith(".mp4")]
+    if not candidates:
+        return None
+    clip_sec = float(v.get("duration", 0) or 0)
+    span = min(need_sec, clip_sec) if (need_sec and clip_sec) else (clip_sec or need_sec or 1.0)
+    return min(candidates, key=lambda f: _score_video_file(f, span))
+
+def _library_video(lib, vid: int, need_sec: Optional[float]) -> Optional[Dict[str, Any]]:
+    """전체/앞부분 클립 중 필요한 길이 이상인 것을 재사용 (예전에 잘못 "video"로 저장된 짧은 클립도 길이 확인)."""
+    rec = lib.get("video", vid)
+    if rec is not None and (not need_sec or _probe_duration(rec["path"]) >= need_sec * 0.9):
+        return rec
+    if not need_sec:
+        return None
+    rec = lib.get("video_head", vid)
+    if rec is not None and _probe_duration(rec["path"]) >= need_sec * 0.9:
+        return rec
+    return None
+
 def generate_videos_for_topic(
     query: str,
     num_videos: int,
@@ -274,28 +802,49 @@ def generate_videos_for_topic(
     page: int = 1,                               # 시작 페이지
     exclude_ids: Optional[Iterable[int]] = None, # 제외할 Pexels video id
     return_ids: bool = False,                    # 선택된 id도 반환
+    cancel_event: Optional[threading.Event] = None,  # 세팅되면 남은 검색/다운로드 중단
+    need_sec: Optional[float] = None,            # 실제로 쓸 길이(초). 주면 앞부분만 받아 인코딩
 ) -> List[str] | Tuple[List[str], List[int]]:
     sess = _pexels_session()
+    lib = get_library()
     saved: List[str] = []
     chosen_ids: List[int] = []
     exclude: Set[int] = set(int(x) for x in (exclude_ids or []))
     per_page = min(max(num_videos, 1), 80)
     current_page = max(1, page)
 
+    def _fetch(item: Tuple[int, Dict[str, Any], str, float]) -> str:
+        vid, picked, q_en, clip_sec = item
+        url = picked["link"]
+        # 동시에 같은 id를 받는 스레드가 있어도 충돌하지 않도록 스레드별 임시 경로
+        save_path = f"assets/video_{vid}_{threading.get_ident()}.mp4"
+        try:
+            _, partial = _stream_normalize(url, save_path, cancel_event, max_sec=need_sec, clip_sec=clip_sec)
+        except DownloadCancelled:
+            raise
+        except Exception as e:
+            raise IOError(f"{e} | {url}")
+        # 앞부분만 받은 클립은 별도 kind로 저장 → 더 긴 구간이 필요할 때 잘못 재사용되지 않음
+        return lib.add_file("video_head" if partial else "video", vid, save_path, query=q_en)["path"]
+
     while len(saved) < num_videos:
+        if cancel_event is not None and cancel_event.is_set():
+            break
         q_en = _ensure_english(query)
         params = {"query": q_en, "per_page": per_page, "page": current_page}
-        data = _pexels_get_json(sess, "https://api.pexels.com/videos/search", params)
+        try:
+            data = _pexels_get_json(sess, "https://api.pexels.com/videos/search", params, cancel_event)
+        except DownloadCancelled:
+            break
         videos = data.get("videos", [])
         if not videos:
             break
 
+        # 조건에 맞는 후보만 추림 (라이브러리에 있으면 다운로드/재인코딩 생략)
+        pending: List[Tuple[int, Dict[str, Any], str, float]] = []
         for v in videos:
-            if len(saved) >= num_videos:
-                break
-
             vid = int(v.get("id") or 0)
-            if vid and vid in exclude:
+            if not vid or vid in exclude:
                 continue
 
             w, h = v.get("width"), v.get("height")
@@ -305,54 +854,35 @@ def generate_videos_for_topic(
             if dur < min_duration:
                 continue
 
-            candidates = [f for f in v.get("video_files", [])
-                          if f.get("link", "").endswith(".mp4")
-                          and 720 <= (f.get("width") or 0) <= 1080]
-            if not candidates:
-                candidates = [f for f in v.get("video_files", [])
-                              if f.get("link", "").endswith(".mp4")]
-            if not candidates:
+            picked = _pick_video_file(v, need_sec)
+            if not picked:
                 continue
-
-            picked = sorted(candidates, key=lambda f: f.get("width") or 10**9)[0]
-            url = picked["link"]
-            save_path = f"assets/video_{start_index + len(saved)}.mp4"
-            tmp_path = save_path + ".part"
-
-            os.makedirs(os.path.dirname(save_path), exist_ok=True)
-            try:
-                _sleep_for_throttle()
-                with sess.get(url, stream=True, timeout=(5, 30)) as r:
-                    r.raise_for_status()
-                    with open(tmp_path, "wb") as f:
-                        for chunk in r.iter_content(1024 * 64):
-                            if chunk:
-                                f.write(chunk)
-                _mark_called()
-
-                # sanity check: 너무 작은 파일 제거
-                if os.path.getsize(tmp_path) < 10 * 1024:  # 10KB 미만이면 실패로 간주
-                    raise IOError(f"Downloaded file too small: {tmp_path}")
-
-                os.replace(tmp_path, save_path)
-
-                # 9:16 캔버스 720x1080으로 가볍게 정리(선택)
-                try:
-                    _shrink_to_720_inplace(save_path)
-                except Exception:
-                    pass
-
-                saved.append(save_path)
-                if vid:
-                    chosen_ids.append(vid)
-
-            except Exception as e:
-                try:
-                    if os.path.exists(tmp_path):
-                        os.remove(tmp_path)
-                except:
-                    pass
-                print(f"⚠️ 영상 다운로드 실패: {e} | {url}")
+            pending.append((vid, picked, q_en, dur))
+
+        while pending and len(saved) < num_videos:
+            need = num_videos - len(saved)
+            batch, pending = pending[:need], pending[need:]
+            to_fetch = []
+            for item in batch:
+                rec = _library_video(lib, item[0], need_sec)
+                if rec is not None:
+                    saved.append(rec["path"])
+                    chosen_ids.append(item[0])
+                    exclude.add(item[0])
+                else:
+                    to_fetch.append(item)
+            for item, res in zip(to_fetch, _run_concurrently(_fetch, to_fetch, cancel_event, _FFMPEG_WORKERS)):
+                if isinstance(res, DownloadCancelled):
+                    continue
+                if isinstance(res, Exception):
+                    print(f"⚠️ 영상 다운로드 실패: {res}")
+                    continue
+                if len(saved) < num_videos:
+                    saved.append(res)
+                    chosen_ids.append(item[0])
+                    exclude.add(item[0])
+            if cancel_event is not None and cancel_event.is_set():
+                break
 
         current_page += 1
 
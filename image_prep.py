@@ -0,0 +1,116 @@
+# image_prep.py — 합성용 이미지 전처리 (콘텐츠 해시 캐시 + draft 디코딩 + cover 크롭 + 프로세스 풀)
+import os
+import hashlib
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterable, List, Optional, Tuple
+
+from PIL import Image
+
+IMG_CACHE_DIR = os.path.join("assets", "cache_img")
+# 동시에 전처리할 프로세스 수 (JPEG 디코딩/리사이즈는 CPU 바운드라 스레드보다 프로세스)
+PREP_WORKERS = int(os.getenv("IMAGE_PREP_WORKERS", str(max(1, min(4, os.cpu_count() or 1)))))
+PREP_VERSION = "v2"  # 전처리 방식이 바뀌면 올려서 캐시 무효화
+
+
+def _content_hash(path: str) -> str:
+    """파일 내용 해시. Pexels 라이브러리 파일이면 인덱스의 sha1을 그대로 사용."""
+    try:
+        from pexels_library import get_library
+        rec = get_library().lookup_path(path)
+        if rec:
+            return rec["sha1"]
+    except Exception:
+        pass
+    h = hashlib.sha1()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def _cache_path(digest: str, size: Tuple[int, int], quality: int) -> str:
+    w, h = size
+    return os.path.join(IMG_CACHE_DIR, f"{digest[:20]}_{w}x{h}_q{quality}_{PREP_VERSION}.jpg")
+
+
+def _prep_one(job: Tuple[str, str, int, int, int]) -> str:
+    """
+    한 장 처리 (프로세스 풀에서 실행되므로 모듈 최상위 함수).
+    - draft(): JPEG을 DCT 단계에서 1/2,1/4,1/8로 축소 디코딩 → 대형 원본도 빠름
+    - 정확한 cover 프레임으로 크롭+리사이즈를 한 번에(resize box) → 합성 단계에서 프레임별 리사이즈 불필요
+    - optimize/progressive 없이 저장 (인코딩 시간 절약, 어차피 임시 중간물)
+    """
+    src, dst, w, h, quality = job
+    with Image.open(src) as im:
+        im.draft("RGB", (w, h))
+        im = im.convert("RGB")
+        sw, sh = im.size
+        scale = max(w / sw, h / sh)
+        cw, ch = w / scale, h / scale
+        left, top = (sw - cw) / 2, (sh - ch) / 2
+        out = im.resize((w, h), Image.BICUBIC, box=(left, top, left + cw, top + ch), reducing_gap=2.0)
+    tmp = f"{dst}.{os.getpid()}.tmp"
+    out.save(tmp, "JPEG", quality=quality)
+    os.replace(tmp, dst)
+    return dst
+
+
+def prepare_images(
+    paths: Iterable[Optional[str]],
+    size: Tuple[int, int] = (720, 1080),
+    quality: int = 85,
+    workers: Optional[int] = None,
+) -> List[Optional[str]]:
+    """
+    작업 전체 이미지를 한 번에 전처리해 캐시 경로 리스트를 반환 (입력 순서 유지).
+    - 캐시 키: 콘텐츠 해시 + 출력 크기 + 품질 (같은 파일명 덮어쓰기/경로 변경에 안전)
+    - 같은 이미지는 한 번만 처리, 없는 경로는 None, 실패하면 원본 경로
+    """
+    os.makedirs(IMG_CACHE_DIR, exist_ok=True)
+    paths = list(paths)
+    w, h = int(size[0]), int(size[1])
+    out: List[Optional[str]] = [None] * len(paths)
+    todo = {}  # dst -> (job, [indices])
+
+    for i, p in enumerate(paths):
+        if not p or not os.path.exists(p):
+            continue
+        try:
+            dst = _cache_path(_content_hash(p), (w, h), quality)
+        except Exception:
+            out[i] = p
+            continue
+        if os.path.exists(dst):
+            out[i] = dst
+        elif dst in todo:
+            todo[dst][1].append(i)
+        else:
+            todo[dst] = ((p, dst, w, h, quality), [i])
+
+    if not todo:
+        return out
+
+    jobs = [job for job, _ in todo.values()]
+    n = min(workers or PREP_WORKERS, len(jobs))
+    results: List[Optional[str]] = []
+    if n > 1:
+        try:
+            with ProcessPoolExecutor(max_workers=n) as ex:
+                results = list(ex.map(_safe_prep_one, jobs))
+        except Exception as e:
+            print(f"⚠️ 이미지 전처리 프로세스 풀 실패 → 순차 처리: {e}")
+            results = []
+    if not results:
+        results = [_safe_prep_one(job) for job in jobs]
+
+    for (job, idxs), res in zip(todo.values(), results):
+        for i in idxs:
+            out[i] = res or job[0]
+    return out
+
+
+def _safe_prep_one(job: Tuple[str, str, int, int, int]) -> Optional[str]:
+    try:
+        return _prep_one(job)
+    except Exception:
+        return None
@@ -10,8 +10,10 @@ from dotenv import load_dotenv
 from langchain_core.messages import HumanMessage, AIMessage
 from RAG.rag_pipeline import get_retriever_from_source
 from RAG.chain_builder import get_conversational_rag_chain, get_default_chain
+from RAG.dedup import dedup_documents
 from persona import generate_response_from_persona
-from image_generator import generate_images_for_topic, generate_videos_for_topic
+from image_generator import generate_images_for_topic, generate_videos_for_topic, search_cache_stats, pop_video_bytes_stats
+from pexels_library import get_library, PhashGuard
 from elevenlabs_tts import TTS_ELEVENLABS_TEMPLATES, TTS_POLLY_VOICES
 from generate_timed_segments import (
     generate_subtitle_from_script,
@@ -27,12 +29,14 @@ from video_maker import (
     add_subtitles_to_video,
     create_dark_text_video
 )
-from ssml_converter import convert_line_to_ssml, breath_linebreaks, koreanize_if_english
+from ssml_converter import breath_linebreaks, koreanize_if_english
 from deep_translator import GoogleTranslator
 from file_handler import get_documents_from_files
 from upload import upload_to_youtube
 from best_subtitle_extractor import load_best_subtitles_documents
-from text_scraper import get_links, clean_html_parallel, filter_noise
+from text_scraper import get_links
+from noise_filter import filter_noise_batch
+from crawl_engine import crawl_urls
 from langchain_core.documents import Document
 import os
 import requests
@@ -121,25 +125,21 @@ def _log_ssml_preview(orig_lines, generated_ssml_lines=None, title="SSML 변환
     """
     원문 ↔ 변환된 SSML을 나란히 보여주는 디버그 로그.
     - Streamlit UI(Expander + code)와 콘솔(print) 모두 출력
-    - generated_ssml_lines가 없으면 convert_line_to_ssml()로 미리보기 생성
+    - 미리보기만을 위해 LLM 변환을 호출하지 않음: 변환 결과가 없는 줄은 '(SSML 없음)'으로 표시
     """
+    generated_ssml_lines = list(generated_ssml_lines or [])
+    generated_ssml_lines += ["(SSML 없음)"] * (len(orig_lines) - len(generated_ssml_lines))
     try:
         import streamlit as st
         with st.expander(f"🧪 {title}", expanded=False):
             for i, line in enumerate(orig_lines, 1):
                 st.markdown(f"**{i}. 원문**: {line}")
-                ssml = (generated_ssml_lines[i-1]
-                        if (generated_ssml_lines and i-1 < len(generated_ssml_lines))
-                        else convert_line_to_ssml(line))
-                st.code(ssml, language="xml")
+                st.code(generated_ssml_lines[i-1], language="xml")
     except Exception:
         print(f"[SSML] {title}")
         for i, line in enumerate(orig_lines, 1):
-            ssml = (generated_ssml_lines[i-1]
-                    if (generated_ssml_lines and i-1 < len(generated_ssml_lines))
-                    else convert_line_to_ssml(line))
             print(f"L{i:02d} ORIG: {line}")
-            print(f"L{i:02d} SSML: {ssml}")
+            print(f"L{i:02d} SSML: {generated_ssml_lines[i-1]}")
 
 FPS = 30
 
@@ -219,9 +219,16 @@ import hashlib, os
 def _fingerprint_video(path: str) -> str:
     """
     같은 영상이 파일명만 달라 들어와도 잡아내기 위한 가벼운 지문.
-    - 파일명(쿼리스트링 제외) + 앞부분 512KB MD5 해시
+    - Pexels 라이브러리 파일이면 인덱스의 콘텐츠 해시(sha1)를 그대로 사용 (파일 읽기 없음)
+    - 그 외: 파일명(쿼리스트링 제외) + 앞부분 512KB MD5 해시
     - 읽기 실패 시 파일명만 사용
     """
+    try:
+        rec = get_library().lookup_path(path)
+    except Exception:
+        rec = None
+    if rec:
+        return "sha1:" + rec["sha1"]
     base = os.path.basename(path).lower().split("?")[0]
     try:
         with open(path, "rb") as f:
@@ -424,6 +431,8 @@ def build_image_paths_for_dense_segments(segments_for_video, persona_text: str):
         st.session_state.seen_photo_ids = set()
     if "query_page_cursor_img" not in st.session_state:
         st.session_state.query_page_cursor_img = {}
+    # 이번 영상 안에서 거의 같은 이미지(지각 해시 근접)를 문장 간에 거르기
+    phash_guard = PhashGuard()
 
     sentence_units = [s.get('text', '') for s in segments_for_video]
     per_sentence_queries = get_scene_keywords_batch(sentence_units, persona_text)
@@ -437,7 +446,8 @@ def build_image_paths_for_dense_segments(segments_for_video, persona_text: str):
                 start_index=idx,
                 page=page,
                 exclude_ids=st.session_state.seen_photo_ids,
-                return_ids=True
+                return_ids=True,
+                phash_guard=phash_guard,
             )
         except TypeError:
             paths = generate_images_for_topic(q, 1, start_index=idx)
@@ -712,20 +722,25 @@ def coalesce_segments_for_videos(segments, clip_count: int):
         coalesced.append({'start': cur_start, 'end': segments[-1]['end'], 'text': ''})
     return coalesced
 
+MIN_WEB_DOC_CHARS = 100  # 인덱싱할 웹 문서 최소 길이 (노이즈 필터 후, dedup 후 모두 적용)
+
 def get_web_documents_from_query(query: str):
     try:
         urls = get_links(query, num=40)
-        crawl_results = clean_html_parallel(urls)
+        crawl_results = crawl_urls(urls)
         docs = []
-        for result in crawl_results:
-            if result['success']:
-                clean_text = filter_noise(result['text'])
-                if len(clean_text.strip()) >= 100:
-                    doc = Document(
-                        page_content=clean_text.strip(),
-                        metadata={"source": result['url']}
-                    )
-                    docs.append(doc)
+        # 문서 전체를 한 번에 필터링 (문서 간 중복 줄 제거 포함)
+        clean_texts = filter_noise_batch([r['text'] if r['success'] else "" for r in crawl_results])
+        for result, clean_text in zip(crawl_results, clean_texts):
+            if result['success'] and len(clean_text.strip()) >= MIN_WEB_DOC_CHARS:
+                doc = Document(
+                    page_content=clean_text.strip(),
+                    metadata={"source": result['url']}
+                )
+                docs.append(doc)
+        # 신디케이션/미러 사본 등 근사 중복 제거 후 인덱싱 (임베딩 토큰 절감)
+        # 문장 단위 제거로 최소 길이 아래로 줄어든 문서도 함께 제외
+        docs, _ = dedup_documents(docs, min_chars=MIN_WEB_DOC_CHARS)
         return docs, None
     except Exception as e:
         return [], str(e)
@@ -788,12 +803,19 @@ def _save_unique_image(src_path_or_url: str, idx: int) -> str:
     """
     이미지가 같은 파일명으로 덮어쓰기 되는 문제를 막기 위해
     문장 인덱스별로 고유 파일명으로 저장/복사합니다.
+    - Pexels 라이브러리 파일이면 이미 고유(id+해시) 경로이므로 복사 없이 그대로 반환
     - 로컬 경로면 copy
     - URL이면 다운로드
     """
     import os, shutil, mimetypes
     import requests
 
+    try:
+        if not src_path_or_url.startswith("http") and get_library().lookup_path(src_path_or_url):
+            return src_path_or_url
+    except Exception:
+        pass
+
     os.makedirs("assets/scene_images", exist_ok=True)
 
     def _guess_ext(p: str) -> str:
@@ -1446,6 +1468,16 @@ with st.sidebar:
                             # Lock to protect local structures across threads
                             search_lock = threading.Lock()
 
+                            # 문장 구간 길이(+여유) → 클립 앞부분만 받아 인코딩 (보강 검색 인덱스는 최장 구간 사용)
+                            seg_durs = [max(0.0, float(s.get("end", 0)) - float(s.get("start", 0))) for s in segments_for_video]
+                            max_seg_dur = max(seg_durs) if seg_durs else 4.0
+
+                            def _need_sec(clip_idx: int) -> float:
+                                d = seg_durs[clip_idx - 1] if 1 <= clip_idx <= len(seg_durs) else max_seg_dur
+                                return max(d, 0.55) + 1.0
+
+                            pop_video_bytes_stats()  # 이번 작업 기준으로 집계 초기화
+
                             def _try_search_once_local(q: str, clip_idx: int):
                                 # Use local cursor and seen ids to call the API
                                 pg = local_query_page_cursor.get(q, 1)
@@ -1457,7 +1489,8 @@ with st.sidebar:
                                         orientation="portrait",
                                         page=pg,
                                         exclude_ids=local_seen_video_ids,
-                                        return_ids=True
+                                        return_ids=True,
+                                        need_sec=_need_sec(clip_idx),
                                     )
                                 except Exception:
                                     # Fallback: try without return_ids
@@ -1589,6 +1622,12 @@ with st.sidebar:
                                     st.warning(f"보강 검색 후에도 {need - added}개 부족 → 마지막 클립으로 패딩")
                                     if video_paths:
                                         video_paths += [video_paths[-1]] * (need - added)
+
+                            _vb = pop_video_bytes_stats()
+                            if _vb["clips"]:
+                                st.write(f"📉 영상 다운로드 {_vb['downloaded'] / 1e6:.1f}MB "
+                                         f"(원본 전체 {_vb['full'] / 1e6:.1f}MB, 절약 {_vb['saved'] / 1e6:.1f}MB, "
+                                         f"부분 다운로드 {_vb['partial']}/{_vb['clips']}개)")
                         else:
                             # --- 이미지 수집(문장당 1장, 부족 시 추가 탐색) ---
                             st.write("🖼️ 문장별로 페르소나 기반 키워드를 만들어 이미지 1장씩 생성/검색합니다.") 
@@ -1605,6 +1644,9 @@ with st.sidebar:
 
                     media_end_time = time.time() # <-- 미디어 수집 종료
                     st.write(f"✅ (2/4) 미디어 수집 완료 ({media_end_time - media_start_time:.2f}초)")
+                    _sc = search_cache_stats()
+                    print(f"[PEXELS] 검색 캐시 hit={_sc['mem_hits'] + _sc['disk_hits']} miss={_sc['misses']} "
+                          f"304={_sc['revalidated_304']} ratio={_sc['hit_ratio']:.1%}")
 
                     # --- 합성 ---
                     st.write("🎬 (3/4) 비디오 합성 중 (MoviePy)...")
@@ -0,0 +1,125 @@
+# motion_renderer.py — 이미지 모션(줌/팬/드리프트)을 '정수 크롭 + 1회 리사이즈'로 렌더링
+import math
+import random
+from typing import Optional, Tuple
+
+import numpy as np
+from PIL import Image
+
+try:
+    import cv2  # 있으면 선형 보간 리사이즈를 미리 잡아둔 버퍼에 직접 씀
+except Exception:
+    cv2 = None
+
+MOTIONS = ("zoom_in_out", "left_to_right", "right_to_left", "static")
+ZOOM_END = 1.05       # zoom_in_out: 1.0 → 1.05
+PAN_START, PAN_END = 0.3, 0.6   # 팬 비율: left_to_right 크롭 x 0.3M → 0, right_to_left 0.6M → 0.9M (M = 여유 폭)
+PAN_MIN_MOVE = 30     # 여유 폭이 이보다 작으면 고정
+
+
+def _cover_array(img_path: str, w: int, h: int) -> np.ndarray:
+    """원본을 (w, h)를 꽉 채우는 크기로 한 번만 리사이즈해 uint8 배열로 반환 (크롭 없음)."""
+    with Image.open(img_path) as im:
+        im.draft("RGB", (w, h))
+        im = im.convert("RGB")
+        scale = max(w / im.width, h / im.height)
+        size = (max(w, math.ceil(im.width * scale)), max(h, math.ceil(im.height * scale)))
+        if size != im.size:
+            im = im.resize(size, Image.BICUBIC, reducing_gap=2.0)
+        return np.ascontiguousarray(np.asarray(im, dtype=np.uint8))
+
+
+def _ease(p: float) -> float:
+    return 3 * (p ** 2) - 2 * (p ** 3)
+
+
+class MotionRenderer:
+    """
+    모션 프레임 생성기.
+    - 생성 시 cover 이미지를 한 번만 만들어 두고(줌은 ZOOM_END 배 크게),
+      프레임마다 정수 크롭 창만 계산 → 팬/고정/드리프트는 순수 크롭, 줌은 크롭 + 1회 리사이즈
+    - 출력 버퍼를 미리 잡아 두고 매 프레임 재사용 (프레임당 새 배열 할당 없음)
+      → 반환 배열은 다음 frame() 호출 때 덮어써지므로, 보관하려면 호출 측에서 복사
+    """
+
+    def __init__(self, img_path: str, width: int, height: int, duration: float,
+                 motion: Optional[str] = None, drift_px: int = 0):
+        self.width, self.height = int(width), int(height)
+        self.duration = max(float(duration), 1e-6)
+        self.motion = motion or random.choice(MOTIONS)
+        self.drift_px = int(drift_px)
+
+        W, H = self.width, self.height
+        if self.motion == "zoom_in_out":
+            self._src = _cover_array(img_path, math.ceil(W * ZOOM_END), math.ceil(H * ZOOM_END))
+        else:
+            self._src = _cover_array(img_path, W + self.drift_px, H + self.drift_px)
+        sh, sw = self._src.shape[:2]
+        self._sw, self._sh = sw, sh
+        self._out = np.empty((H, W, 3), dtype=np.uint8)
+        self._rows = None
+        if self.motion == "zoom_in_out" and cv2 is None:
+            self._rows = np.empty((H, sw, 3), dtype=np.uint8)   # numpy 최근접 리사이즈용 중간 버퍼
+            self._ys = np.empty(H, dtype=np.intp)
+            self._xs = np.empty(W, dtype=np.intp)
+            self._grid_y = (np.arange(H, dtype=np.float64) + 0.5) / H
+            self._grid_x = (np.arange(W, dtype=np.float64) + 0.5) / W
+
+        # 팬 이동량(원래 create_motion_clip과 같은 비율/조건)
+        self._max_move = sw - W
+        self._cx = (sw - W) // 2
+        self._cy = (sh - H) // 2
+
+    @property
+    def size(self) -> Tuple[int, int]:
+        return self.width, self.height
+
+    def crop_window(self, t: float) -> Tuple[int, int, int, int]:
+        """t초의 크롭 창 (x, y, w, h) — 원본 cover 배열 좌표, 정수."""
+        W, H = self.width, self.height
+        p = min(max(t / self.duration, 0.0), 1.0)
+        if self.motion == "zoom_in_out":
+            # 배율 s에서 보이는 영역 = 출력 크기 * (ZOOM_END / s), 가로 중앙 / 세로 상단 기준(기존 동작과 동일)
+            s = 1.0 + (ZOOM_END - 1.0) * p
+            cw = min(self._sw, max(W, int(round(self._sw * (1.0 / s)))))
+            ch = min(self._sh, max(H, int(round(self._sh * (1.0 / s)))))
+            return (self._sw - cw) // 2, 0, cw, ch
+        if self.motion in ("left_to_right", "right_to_left") and self._max_move >= PAN_MIN_MOVE:
+            e = _ease(p)
+            # 기존 create_motion_clip 위치(-0.3M + 0.3M·e / -0.6M - 0.3M·e)를 크롭 창 좌표로 옮긴 것
+            if self.motion == "left_to_right":
+                x = self._max_move * PAN_START * (1 - e)
+            else:
+                x = self._max_move * (PAN_END + (PAN_END - PAN_START) * e)
+            return min(int(round(x)), self._max_move), self._cy, W, H
+        if self.drift_px:
+            d = int(round(self.drift_px * (1 - p)))
+            return d, d, W, H
+        return self._cx, self._cy, W, H
+
+    def frame(self, t: float) -> np.ndarray:
+        x, y, cw, ch = self.crop_window(t)
+        crop = self._src[y:y + ch, x:x + cw]
+        if cw == self.width and ch == self.height:
+            np.copyto(self._out, crop)
+        elif cv2 is not None:
+            cv2.resize(crop, (self.width, self.height), dst=self._out, interpolation=cv2.INTER_LINEAR)
+        else:
+            np.multiply(self._grid_y, ch, out=self._ys, casting="unsafe")
+            self._ys += y
+            np.multiply(self._grid_x, cw, out=self._xs, casting="unsafe")
+            self._xs += x
+            np.take(self._src, self._ys, axis=0, out=self._rows)
+            np.take(self._rows, self._xs, axis=1, out=self._out)
+        return self._out
+
+
+def make_motion_clip(img_path: str, duration: float, width: int, height: int,
+                     motion: Optional[str] = None, drift_px: int = 0):
+    """MotionRenderer를 감싼 MoviePy VideoClip (moviepy 2.x: frame_function / 1.x: make_frame)."""
+    from moviepy import VideoClip
+    r = MotionRenderer(img_path, width, height, duration, motion=motion, drift_px=drift_px)
+    try:
+        return VideoClip(frame_function=r.frame, duration=duration)
+    except TypeError:
+        return VideoClip(make_frame=r.frame, duration=duration)
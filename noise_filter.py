@@ -0,0 +1,147 @@
+# noise_filter.py — 크롤링 텍스트 노이즈 필터 (패턴 1회 컴파일 + 배치/프로세스 풀 + 문서 간 중복 줄 제거)
+import os
+import re
+import bisect
+import hashlib
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterable, List, Optional
+
+try:
+    import numpy as np
+except Exception:
+    np = None
+
+# 문서가 많고 길 때만 프로세스 풀 사용 (작은 배치는 풀 기동 비용이 더 큼)
+NOISE_FILTER_WORKERS = int(os.getenv("NOISE_FILTER_WORKERS", str(max(1, min(4, os.cpu_count() or 1)))))
+NOISE_POOL_MIN_CHARS = int(os.getenv("NOISE_POOL_MIN_CHARS", "500000"))
+MIN_LINE_CHARS = 30      # 이 길이 이하 줄은 제거
+MAX_ALNUM_RATIO = 0.8    # 알파벳/숫자 비율이 이보다 높으면 제거 (난수/해시/코드 등)
+
+_AD_PATTERNS = [
+    r"배너\s?(광고|클릭)", r"광고문의", r"마케팅\s?문의",
+    r"제휴\s?(문의|링크)", r"구매\s?링크", r"프로모션", r"스폰서", r"광고\s?수익",
+    r"후원\s?(계좌|링크|문의|해주시면|받습니다|바랍니다)", r"아래.*후원", r"후원해\s?주세요",
+    r"협찬\s?(문의|링크|해주시면)", r"쿠팡\s?파트너스", r"구매링크",
+    r"이 글은 .*? 광고를 포함하고 있습니다",
+    r"이 포스트는 .*? 후원을 받고 작성되었습니다",
+    r"광고성 문구", r"유료 광고", r"제휴 마케팅", r"체험단",
+    r"Sponsored by", r"이벤트 참여", r"이벤트 안내", r"채널 가입",
+]
+# 이메일, 오픈채팅, 연락처 등
+_CONTACT_PATTERNS = [
+    r"[a-zA-Z0-9_.+-]+@[a-zA-Z0-9-]+\.[a-zA-Z0-9-.]+", r"오픈채팅", r"카톡", r"연락처", r"문의:",
+]
+# 광고 + 연락처 패턴을 하나의 정규식으로 (한 번만 컴파일)
+_NOISE_RE = re.compile("|".join(f"(?:{p})" for p in _AD_PATTERNS + _CONTACT_PATTERNS), re.IGNORECASE)
+# 위 패턴마다 반드시 들어 있는 고정 문자열 → 문서 전체를 한 번 훑어 이 단어가 있는 줄만 전체 정규식 검사
+# (패턴을 추가하면 여기에도 그 패턴의 고정 문자열을 넣을 것)
+_ANCHORS = ["배너", "광고", "마케팅", "제휴", "구매", "프로모션", "스폰서", "후원", "협찬", "쿠팡",
+            "체험단", "sponsored", "이벤트", "채널", "@", "오픈채팅", "카톡", "연락처", "문의"]
+_ANCHOR_RE = re.compile("|".join(map(re.escape, _ANCHORS)), re.IGNORECASE)
+# 영숫자가 아닌 문자 (str.isalnum의 반대)
+_NON_ALNUM_RE = re.compile(r"[\W_]+")
+_WS_RE = re.compile(r"\s+")
+
+# 코드포인트 → isalnum 룩업 테이블 (한글/CJK 확장까지, 첫 사용 시 생성)
+_ALNUM_TABLE_SIZE = 0x30000
+_ALNUM_TABLE = None
+
+
+def _alnum_table():
+    global _ALNUM_TABLE
+    if _ALNUM_TABLE is None:
+        _ALNUM_TABLE = np.fromiter((chr(cp).isalnum() for cp in range(_ALNUM_TABLE_SIZE)),
+                                   dtype=bool, count=_ALNUM_TABLE_SIZE)
+    return _ALNUM_TABLE
+
+
+def _alnum_counts(text: str, n_lines: int):
+    """문서 전체를 한 번에 코드포인트 배열로 바꿔 줄별 영숫자 개수 계산 (numpy 없으면 None)."""
+    if np is None or not text:
+        return None
+    # surrogatepass: 깨진 디코딩으로 남은 외톨이 서로게이트도 그대로 (isalnum은 False)
+    cps = np.frombuffer(text.encode("utf-32-le", "surrogatepass"), dtype=np.uint32)
+    alnum = _alnum_table()[np.minimum(cps, _ALNUM_TABLE_SIZE - 1)]
+    high = cps >= _ALNUM_TABLE_SIZE
+    if high.any():  # 테이블 밖(CJK 확장 G 등)은 드물므로 직접 판정
+        alnum[high] = [chr(cp).isalnum() for cp in cps[high].tolist()]
+    newline = cps == 10
+    line_id = np.cumsum(newline) - newline
+    return np.bincount(line_id, weights=alnum, minlength=n_lines)
+
+
+def _anchored_lines(text: str, lines: List[str]) -> set:
+    """광고/연락처 고정 문자열이 하나라도 있는 줄 번호."""
+    starts = []
+    pos = 0
+    for line in lines:
+        starts.append(pos)
+        pos += len(line) + 1
+    return {bisect.bisect_right(starts, m.start()) - 1 for m in _ANCHOR_RE.finditer(text)}
+
+
+def filter_text(text: str) -> str:
+    """문서 1개 필터링 (기존 text_scraper.filter_noise와 같은 규칙)."""
+    text = text or ""
+    lines = text.split("\n")
+    anchored = _anchored_lines(text, lines)
+    counts = _alnum_counts(text, len(lines))
+    filtered = []
+    for i, raw in enumerate(lines):
+        line = raw.strip()
+        # 1. 너무 짧은 줄 제거
+        if len(line) <= MIN_LINE_CHARS:
+            continue
+        # 2~3. 광고/스팸 + 연락처 패턴 제거
+        if i in anchored and _NOISE_RE.search(line):
+            continue
+        # 4. 알파벳/숫자 비율이 너무 높으면 제거 (앞뒤 공백은 영숫자가 아니므로 줄 전체 개수 그대로 사용)
+        n_alnum = counts[i] if counts is not None else len(_NON_ALNUM_RE.sub("", line))
+        if n_alnum / len(line) > MAX_ALNUM_RATIO:
+            continue
+        filtered.append(line)
+    return "\n".join(filtered)
+
+
+def _line_key(line: str) -> bytes:
+    """공백/문장부호/대소문자 차이를 무시한 줄 해시 (거의 같은 줄을 같은 키로)."""
+    norm = _NON_ALNUM_RE.sub("", _WS_RE.sub(" ", line).lower())
+    return hashlib.blake2b(norm.encode("utf-8"), digest_size=8).digest()
+
+
+def dedup_lines(texts: List[str]) -> List[str]:
+    """문서 순서대로, 앞 문서(또는 같은 문서 앞쪽)에 이미 나온 줄은 제거."""
+    seen = set()
+    out = []
+    for text in texts:
+        kept = []
+        for line in text.split("\n") if text else []:
+            key = _line_key(line)
+            if key in seen:
+                continue
+            seen.add(key)
+            kept.append(line)
+        out.append("\n".join(kept))
+    return out
+
+
+def filter_noise_batch(texts: Iterable[Optional[str]], dedup: bool = True,
+                       workers: Optional[int] = None) -> List[str]:
+    """
+    여러 문서를 한 번에 필터링 (입력 순서 유지).
+    - 총 길이가 NOISE_POOL_MIN_CHARS 이상이면 프로세스 풀에서 병렬 처리
+    - dedup=True면 문서 간 중복 줄(사이트 공통 문구, 재게시 본문 등) 제거
+    """
+    texts = [t or "" for t in texts]
+    n = min(workers or NOISE_FILTER_WORKERS, len(texts))
+    results: List[str] = []
+    if n > 1 and sum(len(t) for t in texts) >= NOISE_POOL_MIN_CHARS:
+        try:
+            with ProcessPoolExecutor(max_workers=n) as ex:
+                results = list(ex.map(filter_text, texts, chunksize=max(1, len(texts) // (n * 4))))
+        except Exception as e:
+            print(f"⚠️ 노이즈 필터 프로세스 풀 실패 → 순차 처리: {e}")
+            results = []
+    if not results:
+        results = [filter_text(t) for t in texts]
+    return dedup_lines(results) if dedup else results
@@ -0,0 +1,261 @@
+# pexels_library.py — Pexels 이미지/영상 로컬 라이브러리 (영구 저장 + 인덱스 + 근접중복 판정)
+import os
+import time
+import shutil
+import sqlite3
+import hashlib
+import threading
+from io import BytesIO
+from typing import Dict, Iterable, List, Optional
+
+try:
+    from PIL import Image
+except Exception:
+    Image = None
+
+LIBRARY_DIR = os.getenv("PEXELS_LIBRARY_DIR", os.path.join("assets", "pexels_library"))
+# 디스크 상한(MB). 넘으면 가장 오래 안 쓴 파일부터 삭제(LRU)
+LIBRARY_MAX_MB = float(os.getenv("PEXELS_LIBRARY_MAX_MB", "2048"))
+# 이 시간(초) 안에 내준 파일은 LRU 정리 대상에서 제외 (진행 중인 작업이 라이브러리 경로를 그대로 쓰므로)
+LIBRARY_PIN_SEC = float(os.getenv("PEXELS_LIBRARY_PIN_SEC", str(6 * 3600)))
+# dHash 해밍거리 이하이면 '거의 같은 이미지'로 간주
+PHASH_MAX_DISTANCE = int(os.getenv("PEXELS_PHASH_MAX_DISTANCE", "6"))
+
+
+def image_phash(src) -> Optional[str]:
+    """
+    64bit dHash(차분 해시)를 16진 문자열로 반환. src는 경로 또는 bytes.
+    - JPEG은 draft()로 축소 디코딩 → 원본 해상도 전체 디코딩 없이 빠르게 계산
+    """
+    if Image is None:
+        return None
+    try:
+        im = Image.open(BytesIO(src) if isinstance(src, (bytes, bytearray)) else src)
+        im.draft("L", (64, 64))
+        im = im.convert("L").resize((9, 8), Image.BILINEAR)
+        px = list(im.getdata())
+        bits = 0
+        for row in range(8):
+            base = row * 9
+            for col in range(8):
+                bits = (bits << 1) | (1 if px[base + col] > px[base + col + 1] else 0)
+        return f"{bits:016x}"
+    except Exception:
+        return None
+
+
+def phash_distance(a: str, b: str) -> int:
+    return (int(a, 16) ^ int(b, 16)).bit_count()
+
+
+class PhashGuard:
+    """한 작업(영상 1개) 안에서 근접중복 이미지를 거르는 가드. 스레드 안전."""
+
+    def __init__(self, max_distance: int = PHASH_MAX_DISTANCE):
+        self.max_distance = max_distance
+        self._hashes: List[str] = []
+        self._lock = threading.Lock()
+
+    def admit(self, phash: Optional[str]) -> bool:
+        """처음 보는(또는 해시 불가) 이미지면 등록 후 True, 근접중복이면 False."""
+        if not phash:
+            return True
+        with self._lock:
+            for h in self._hashes:
+                if phash_distance(h, phash) <= self.max_distance:
+                    return False
+            self._hashes.append(phash)
+            return True
+
+
+class PexelsLibrary:
+    """
+    Pexels id + 콘텐츠 해시 기준 영구 라이브러리.
+    - assets/pexels_library/{kind}_{pexels_id}_{sha1[:12]}.{ext}
+    - index.sqlite: 메타데이터(쿼리, 크기, 해상도, phash, 마지막 사용 시각)
+    - queries 테이블: (kind, query, page) → 결과 id 순서 (반복 쿼리를 디스크에서 바로 제공)
+    - get()/add_*()는 복사본이 아니라 라이브러리 경로를 내주므로, 최근 pin_sec 안에 내준 파일은
+      용량을 넘어도 지우지 않음 (작업이 끝난 뒤 다음 정리 때 삭제)
+    """
+
+    def __init__(self, root: str = LIBRARY_DIR, max_mb: float = LIBRARY_MAX_MB, pin_sec: float = LIBRARY_PIN_SEC):
+        self.root = root
+        self.max_bytes = int(max_mb * 1024 * 1024)
+        self.pin_sec = pin_sec
+        self._lock = threading.RLock()
+        self._conn: Optional[sqlite3.Connection] = None
+
+    def _db(self) -> sqlite3.Connection:
+        if self._conn is None:
+            os.makedirs(self.root, exist_ok=True)
+            conn = sqlite3.connect(os.path.join(self.root, "index.sqlite"), check_same_thread=False, timeout=10)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS assets ("
+                " kind TEXT NOT NULL, pexels_id INTEGER NOT NULL, path TEXT NOT NULL,"
+                " sha1 TEXT NOT NULL, phash TEXT, width INTEGER, height INTEGER,"
+                " query TEXT, bytes INTEGER NOT NULL, created REAL NOT NULL, accessed REAL NOT NULL,"
+                " PRIMARY KEY (kind, pexels_id))"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS assets_sha1 ON assets(sha1)")
+            conn.execute("CREATE INDEX IF NOT EXISTS assets_accessed ON assets(accessed)")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS queries ("
+                " kind TEXT NOT NULL, query TEXT NOT NULL, page INTEGER NOT NULL, rank INTEGER NOT NULL,"
+                " pexels_id INTEGER NOT NULL, PRIMARY KEY (kind, query, page, rank))"
+            )
+            conn.commit()
+            self._conn = conn
+        return self._conn
+
+    @staticmethod
+    def _row_to_dict(row) -> Dict:
+        keys = ("kind", "pexels_id", "path", "sha1", "phash", "width", "height", "query", "bytes")
+        return dict(zip(keys, row))
+
+    # ---------- 조회 ----------
+    def get(self, kind: str, pexels_id: int) -> Optional[Dict]:
+        """id로 조회. 파일이 사라졌으면 인덱스에서 지우고 None."""
+        if not pexels_id:
+            return None
+        with self._lock:
+            db = self._db()
+            row = db.execute(
+                "SELECT kind, pexels_id, path, sha1, phash, width, height, query, bytes"
+                " FROM assets WHERE kind=? AND pexels_id=?", (kind, int(pexels_id))
+            ).fetchone()
+            if not row:
+                return None
+            rec = self._row_to_dict(row)
+            if not os.path.exists(rec["path"]):
+                db.execute("DELETE FROM assets WHERE kind=? AND pexels_id=?", (kind, int(pexels_id)))
+                db.commit()
+                return None
+            db.execute("UPDATE assets SET accessed=? WHERE kind=? AND pexels_id=?",
+                       (time.time(), kind, int(pexels_id)))
+            db.commit()
+            return rec
+
+    def lookup_path(self, path: str) -> Optional[Dict]:
+        """라이브러리 파일 경로로 메타데이터 조회 (지문/해시 재계산 회피용)."""
+        with self._lock:
+            row = self._db().execute(
+                "SELECT kind, pexels_id, path, sha1, phash, width, height, query, bytes"
+                " FROM assets WHERE path=?", (path,)
+            ).fetchone()
+        return self._row_to_dict(row) if row else None
+
+    def query_ids(self, kind: str, query: str, page: int) -> Optional[List[int]]:
+        """이전에 본 (kind, query, page) 검색 결과의 id 순서. 기록이 없으면 None."""
+        with self._lock:
+            rows = self._db().execute(
+                "SELECT pexels_id FROM queries WHERE kind=? AND query=? AND page=? ORDER BY rank",
+                (kind, query, int(page))
+            ).fetchall()
+        return [r[0] for r in rows] if rows else None
+
+    def remember_query(self, kind: str, query: str, page: int, ids: Iterable[int]):
+        with self._lock:
+            db = self._db()
+            db.execute("DELETE FROM queries WHERE kind=? AND query=? AND page=?", (kind, query, int(page)))
+            db.executemany(
+                "INSERT OR REPLACE INTO queries (kind, query, page, rank, pexels_id) VALUES (?, ?, ?, ?, ?)",
+                [(kind, query, int(page), i, int(pid)) for i, pid in enumerate(ids) if pid],
+            )
+            db.commit()
+
+    # ---------- 저장 ----------
+    def add_bytes(self, kind: str, pexels_id: int, data: bytes, *, query: str = "", ext: str = ".jpg") -> Dict:
+        sha1 = hashlib.sha1(data).hexdigest()
+        path = os.path.join(self.root, f"{kind}_{int(pexels_id)}_{sha1[:12]}{ext}")
+        os.makedirs(self.root, exist_ok=True)
+        tmp = path + ".part"
+        with open(tmp, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)
+        return self._index(kind, pexels_id, path, sha1, len(data), query, data if kind == "image" else None)
+
+    def add_file(self, kind: str, pexels_id: int, src_path: str, *, query: str = "") -> Dict:
+        """이미 받은 파일을 라이브러리로 이동(rename)하고 인덱싱."""
+        h = hashlib.sha1()
+        with open(src_path, "rb") as f:
+            for chunk in iter(lambda: f.read(1024 * 1024), b""):
+                h.update(chunk)
+        sha1 = h.hexdigest()
+        ext = os.path.splitext(src_path)[1] or ".bin"
+        path = os.path.join(self.root, f"{kind}_{int(pexels_id)}_{sha1[:12]}{ext}")
+        os.makedirs(self.root, exist_ok=True)
+        shutil.move(src_path, path)
+        return self._index(kind, pexels_id, path, sha1, os.path.getsize(path), query,
+                           path if kind == "image" else None)
+
+    def _index(self, kind, pexels_id, path, sha1, nbytes, query, image_src) -> Dict:
+        width = height = None
+        phash = None
+        if image_src is not None and Image is not None:
+            try:
+                with Image.open(BytesIO(image_src) if isinstance(image_src, (bytes, bytearray)) else image_src) as im:
+                    width, height = im.size
+            except Exception:
+                pass
+            phash = image_phash(image_src)
+        now = time.time()
+        with self._lock:
+            db = self._db()
+            # 같은 (kind, id)를 다른 내용으로 다시 받으면 경로(sha1 포함)가 바뀜 → 인덱스에서 빠지는 옛 파일은 여기서 삭제
+            # (남겨 두면 용량 합계와 LRU 정리 대상에서 모두 빠져 상한을 넘김)
+            old = db.execute("SELECT path FROM assets WHERE kind=? AND pexels_id=?", (kind, int(pexels_id))).fetchone()
+            if old and old[0] != path:
+                try:
+                    os.remove(old[0])
+                except FileNotFoundError:
+                    pass
+                except Exception as e:
+                    print(f"⚠️ 라이브러리 이전 파일 삭제 실패: {old[0]} ({e})")
+            db.execute(
+                "INSERT OR REPLACE INTO assets"
+                " (kind, pexels_id, path, sha1, phash, width, height, query, bytes, created, accessed)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (kind, int(pexels_id), path, sha1, phash, width, height, query, int(nbytes), now, now),
+            )
+            db.commit()
+            self._evict_locked(keep=path)
+        return {"kind": kind, "pexels_id": int(pexels_id), "path": path, "sha1": sha1, "phash": phash,
+                "width": width, "height": height, "query": query, "bytes": int(nbytes)}
+
+    def _evict_locked(self, keep: Optional[str] = None):
+        db = self._db()
+        (total,) = db.execute("SELECT COALESCE(SUM(bytes), 0) FROM assets").fetchone()
+        if total <= self.max_bytes:
+            return
+        # 최근에 내준(=작업에서 쓰는 중일 수 있는) 파일은 제외하고 오래 안 쓴 순으로
+        rows = db.execute(
+            "SELECT kind, pexels_id, path, bytes FROM assets WHERE accessed < ? ORDER BY accessed ASC",
+            (time.time() - self.pin_sec,)
+        ).fetchall()
+        for kind, pid, path, nbytes in rows:
+            if total <= self.max_bytes:
+                break
+            if path == keep:
+                continue
+            try:
+                if os.path.exists(path):
+                    os.remove(path)
+            except Exception:
+                continue
+            db.execute("DELETE FROM assets WHERE kind=? AND pexels_id=?", (kind, pid))
+            total -= nbytes
+        db.commit()
+
+
+_LIBRARY: Optional[PexelsLibrary] = None
+_LIBRARY_LOCK = threading.Lock()
+
+
+def get_library() -> PexelsLibrary:
+    global _LIBRARY
+    if _LIBRARY is None:
+        with _LIBRARY_LOCK:
+            if _LIBRARY is None:
+                _LIBRARY = PexelsLibrary()
+    return _LIBRARY
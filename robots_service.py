@@ -0,0 +1,152 @@
+# robots_service.py — 도메인별 robots.txt를 한 번만 받아(동시) 한 번만 파싱하고 디스크에 캐시
+import re
+import time
+import threading
+import concurrent.futures
+from typing import Dict, Iterable, List, Optional, Tuple
+from urllib.parse import urlparse
+
+import requests
+
+from cache_store import TwoTierCache
+
+ROBOTS_TIMEOUT = 10            # robots.txt 요청 타임아웃(초)
+ROBOTS_CACHE_TTL = 24 * 3600   # 디스크 캐시 유효기간(초)
+ROBOTS_FETCH_WORKERS = 16      # 도메인 동시 조회 수
+_USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+
+
+def _compile_pattern(path: str) -> "re.Pattern":
+    """robots 경로 패턴(* 와일드카드, $ 끝 고정)을 정규식으로."""
+    anchored = path.endswith("$")
+    if anchored:
+        path = path[:-1]
+    body = ".*".join(re.escape(part) for part in path.split("*"))
+    return re.compile(body + ("$" if anchored else ""))
+
+
+class RobotsRules:
+    """
+    User-agent: * 그룹의 Allow/Disallow 규칙을 미리 컴파일해 둔 규칙 집합.
+    - 판정: 가장 긴(구체적인) 규칙 우선, 길이가 같으면 Allow 우선 (RFC 9309)
+    """
+
+    def __init__(self, rules: List[Tuple[bool, str]], note: str = ""):
+        self.note = note
+        self._rules = [(allow, p, _compile_pattern(p)) for allow, p in rules if p]
+        # 긴 규칙부터 검사하면 첫 매치가 곧 결정
+        self._rules.sort(key=lambda r: (len(r[1]), r[0]), reverse=True)
+
+    @classmethod
+    def parse(cls, text: str, note: str = "") -> "RobotsRules":
+        rules: List[Tuple[bool, str]] = []
+        agents: List[str] = []
+        in_rules = False
+        for raw in (text or "").splitlines():
+            line = raw.split("#", 1)[0].strip()
+            if ":" not in line:
+                continue
+            key, value = line.split(":", 1)
+            key, value = key.strip().lower(), value.strip()
+            if key == "user-agent":
+                if in_rules:
+                    agents, in_rules = [], False
+                agents.append(value.lower())
+            elif key in ("allow", "disallow"):
+                in_rules = True
+                if "*" in agents or not agents:
+                    rules.append((key == "allow", value))
+        return cls(rules, note)
+
+    def decide(self, url: str) -> Tuple[bool, Optional[str]]:
+        """(허용 여부, 적용된 규칙 설명)"""
+        parsed = urlparse(url)
+        path = (parsed.path or "/") + (f"?{parsed.query}" if parsed.query else "")
+        for allow, pattern, rx in self._rules:
+            if rx.match(path):
+                return allow, f"{'Allow' if allow else 'Disallow'}: {pattern}"
+        return True, None
+
+
+class RobotsService:
+    """
+    - prefetch(urls): URL들의 도메인별 robots.txt를 동시에 한 번씩만 가져와 파싱
+      (디스크 캐시 TTL 안이면 네트워크 요청 없음)
+    - can_fetch(url): 메모리의 규칙 집합으로 즉시 판정
+    """
+
+    def __init__(self, ttl_sec: float = ROBOTS_CACHE_TTL):
+        self._disk = TwoTierCache("robots_txt", ttl_sec=ttl_sec, mem_max_items=512)
+        self._rules: Dict[str, RobotsRules] = {}
+        self._lock = threading.Lock()
+        self._session = requests.Session()
+        self._session.headers.update({'User-Agent': _USER_AGENT})
+        adapter = requests.adapters.HTTPAdapter(pool_connections=ROBOTS_FETCH_WORKERS,
+                                                pool_maxsize=ROBOTS_FETCH_WORKERS)
+        self._session.mount("http://", adapter)
+        self._session.mount("https://", adapter)
+
+    @staticmethod
+    def _origin(url: str) -> str:
+        p = urlparse(url)
+        return f"{p.scheme}://{p.netloc}".lower()
+
+    def _fetch(self, origin: str) -> Dict:
+        """robots.txt 한 번 요청 → 캐시에 넣을 요약 dict."""
+        try:
+            r = self._session.get(f"{origin}/robots.txt", timeout=ROBOTS_TIMEOUT)
+        except requests.exceptions.Timeout:
+            return {"text": "", "note": "robots.txt 타임아웃 (기본 허용)", "transient": True}
+        except Exception as e:
+            return {"text": "", "note": f"robots.txt 확인 실패: {e}", "transient": True}
+        if r.status_code == 404:
+            return {"text": "", "note": "robots.txt 없음 (기본 허용)"}
+        if r.status_code != 200:
+            return {"text": "", "note": f"robots.txt 접근 실패 ({r.status_code})",
+                    "transient": r.status_code >= 500}
+        return {"text": r.text, "note": ""}
+
+    def _load(self, origin: str) -> RobotsRules:
+        entry = self._disk.get(origin)
+        if entry is None:
+            entry = self._fetch(origin)
+            # 타임아웃/5xx 같은 일시 오류는 짧게만 캐시
+            self._disk.set(origin, entry, ttl_sec=600 if entry.get("transient") else None)
+        rules = RobotsRules.parse(entry.get("text", ""), entry.get("note", ""))
+        with self._lock:
+            self._rules[origin] = rules
+        return rules
+
+    def prefetch(self, urls: Iterable[str]):
+        origins = {self._origin(u) for u in urls}
+        with self._lock:
+            todo = [o for o in origins if o not in self._rules]
+        if not todo:
+            return
+        with concurrent.futures.ThreadPoolExecutor(max_workers=min(ROBOTS_FETCH_WORKERS, len(todo))) as ex:
+            list(ex.map(self._load, todo))
+
+    def can_fetch(self, url: str) -> Tuple[bool, str]:
+        origin = self._origin(url)
+        with self._lock:
+            rules = self._rules.get(origin)
+        if rules is None:
+            rules = self._load(origin)
+        if rules.note:
+            return True, rules.note
+        allowed, rule = rules.decide(url)
+        head = "robots.txt 허용" if allowed else "robots.txt 금지"
+        return allowed, f"{head} ({rule})" if rule else head
+
+
+_SERVICE: Optional[RobotsService] = None
+_SERVICE_LOCK = threading.Lock()
+
+
+def get_robots_service() -> RobotsService:
+    global _SERVICE
+    if _SERVICE is None:
+        with _SERVICE_LOCK:
+            if _SERVICE is None:
+                _SERVICE = RobotsService()
+    return _SERVICE
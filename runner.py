@@ -39,10 +39,11 @@ except Exception as e:
 # ===== 1) 프로젝트 모듈 import =====
 from langchain_core.documents import Document as LCDocument
 from persona import generate_response_from_persona
-from RAG.retriever_builder import build_retriever
 from RAG.chain_builder import get_conversational_rag_chain, get_default_chain
-from text_scraper import get_links, clean_html_parallel, filter_noise
-from best_subtitle_extractor import load_best_subtitles_documents
+from RAG.dedup import dedup_documents
+from text_scraper import get_links
+from noise_filter import filter_noise_batch
+from crawl_engine import crawl_urls
 from image_generator import generate_images_for_topic
 from generate_timed_segments import generate_subtitle_from_script, generate_ass_subtitle
 from video_maker import create_video_with_segments, add_subtitles_to_video, create_dark_text_video
@@ -51,15 +52,20 @@ from deep_translator import GoogleTranslator
 # ===== 2) 유틸 =====
 NOW = lambda: time.strftime('%Y-%m-%d %H:%M:%S')
 
+MIN_DOC_CHARS = 200  # 인덱싱할 웹 문서 최소 길이 (노이즈 필터 후, dedup 후 모두 적용)
+
 def make_docs_from_web_query(query: str, n: int = 40) -> List[LCDocument]:
     urls = get_links(query, num=n)
-    results = clean_html_parallel(urls)
+    results = crawl_urls(urls)
     docs: List[LCDocument] = []
-    for r in results:
-        if r.get('success') and r.get('text'):
-            txt = filter_noise(r['text'])
-            if len(txt) >= 200:
-                docs.append(LCDocument(page_content=txt, metadata={"source": r['url']}))
+    # 문서 전체를 한 번에 필터링 (문서 간 중복 줄 제거 포함)
+    texts = filter_noise_batch([r.get('text') if r.get('success') else None for r in results])
+    for r, txt in zip(results, texts):
+        if r.get('success') and len(txt) >= MIN_DOC_CHARS:
+            docs.append(LCDocument(page_content=txt, metadata={"source": r['url']}))
+    # 신디케이션/미러 사본 등 근사 중복 제거 후 인덱싱 (임베딩 토큰 절감)
+    # 문장 단위 제거로 최소 길이 아래로 줄어든 문서도 함께 제외
+    docs, _ = dedup_documents(docs, min_chars=MIN_DOC_CHARS)
     return docs
 
 # ===== 3) 페르소나 로딩 =====
@@ -89,11 +95,15 @@ def run_persona_step(pcfg: Dict[str, Any], prev: List[str], system_prompt: str)
 
     retriever = None
     sources = []
+    # RAG/유튜브 모듈(FAISS, Cohere, yt-dlp, Whisper 등)은 해당 모드일 때만 import
     if rag_mode == 'web':
         docs = make_docs_from_web_query(text)
         if docs:
+            from RAG.retriever_builder import build_retriever
             retriever = build_retriever(docs)
     elif rag_mode == 'youtube' and yt_channel:
+        from RAG.retriever_builder import build_retriever
+        from best_subtitle_extractor import load_best_subtitles_documents
         subtitle_docs = load_best_subtitles_documents(yt_channel)
         if subtitle_docs:
             retriever = build_retriever(subtitle_docs)
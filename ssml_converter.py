@@ -1,5 +1,9 @@
-from RAG.chain_builder import get_default_chain
+from RAG.chain_builder import get_default_chain, DEFAULT_LLM_MODEL
+from cache_store import TwoTierCache, make_key
+import os
 import re
+from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor
 from html import escape as _xml_escape
 
 try:
@@ -18,6 +22,14 @@ def _looks_english(text: str) -> bool:
     ko = len(re.findall(r"[\uac00-\ud7a3]", text))
     return en >= 3 and en > ko * 1.2
 
+def _koreanize_prompt(t: str) -> str:
+    return (
+        "역할: 너는 한국어 문장 변환기다.\n"
+        "출력은 한국어 **한 문장**만. 마크다운/주석/설명 금지.\n"
+        "규칙: 의미를 100% 유지. 숫자/단위/고유명사는 보존. 문장 끝 어미는 평서체.\n\n"
+        "[입력]\n" + t + "\n\n[출력]\n"
+    )
+
 def koreanize_if_english(text: str) -> str:
     """문장이 사실상 영어면, 의미 동일 한국어 한 문장으로 변환."""
     t = (text or "").strip()
@@ -25,17 +37,16 @@ def koreanize_if_english(text: str) -> str:
         return t
 
     # 1) LLM 시도 (의미 동일 한국어 한 문장)
-    prompt = (
-        "역할: 너는 한국어 문장 변환기다.\n"
-        "출력은 한국어 **한 문장**만. 마크다운/주석/설명 금지.\n"
-        "규칙: 의미를 100% 유지. 숫자/단위/고유명사는 보존. 문장 끝 어미는 평서체.\n\n"
-        "[입력]\n" + t + "\n\n[출력]\n"
-    )
+    prompt = _koreanize_prompt(t)
+    cached = _llm_cache_get(prompt)
+    if cached is not None:
+        return cached
     try:
         out = _complete_with_any_llm(prompt)
         if out and out.strip():
             # 안전 정리
             s = re.sub(r"\s+", " ", out).strip()
+            _llm_cache_put(prompt, s)
             return s
     except Exception:
         pass
@@ -60,8 +71,28 @@ def _heuristic_breath_lines(text: str, strict: bool = True) -> list[str]:
 
 import streamlit as st
 
-# 전역 캐시
-_BREATH_CACHE: dict[str, list[str]] = {}
+# LLM 결과 2단 캐시 (메모리 LRU + 디스크/Redis) — 프롬프트 해시 + 모델명 키
+# breath_linebreaks / convert_line_to_ssml / koreanize_if_english (및 배치판) 공용
+_LLM_CACHE = TwoTierCache(
+    "llm_text",
+    ttl_sec=float(os.getenv("LLM_CACHE_TTL_SEC", str(30 * 86400))),
+    mem_max_items=int(os.getenv("LLM_CACHE_MEM_ITEMS", "2048")),
+    disk_max_items=int(os.getenv("LLM_CACHE_DISK_ITEMS", "200000")),
+    backend=os.getenv("LLM_CACHE_BACKEND"),
+)
+
+def _llm_cache_key(prompt: str) -> str:
+    return make_key(DEFAULT_LLM_MODEL, prompt)
+
+def _llm_cache_get(prompt: str):
+    return _LLM_CACHE.get(_llm_cache_key(prompt))
+
+def _llm_cache_put(prompt: str, value):
+    _LLM_CACHE.set(_llm_cache_key(prompt), value)
+
+def llm_cache_stats() -> dict:
+    """LLM 결과 캐시 hit/miss 지표."""
+    return _LLM_CACHE.stats()
 
 def breath_linebreaks(text: str, honor_newlines: bool = True, *, log: bool=False) -> list[str]:
     t = (text or "").strip()
@@ -72,11 +103,12 @@ def breath_linebreaks(text: str, honor_newlines: bool = True, *, log: bool=False
         return [ln.strip() for ln in t.splitlines() if ln.strip()]
 
     # 캐시 확인
-    if t in _BREATH_CACHE:
-        return _BREATH_CACHE[t]
+    prompt = BREATH_PROMPT.replace("{{TEXT}}", t)
+    cached = _llm_cache_get(prompt)
+    if cached is not None:
+        return list(cached)
 
     # LLM 호출
-    prompt = BREATH_PROMPT.replace("{{TEXT}}", t)
     out = _complete_with_any_llm(prompt) or ""
     
     # 🔎 디버그 로그 추가
@@ -94,11 +126,10 @@ def breath_linebreaks(text: str, honor_newlines: bool = True, *, log: bool=False
     if out:
 
         lines = [ln for ln in out.splitlines() if ln.strip()]
-        _BREATH_CACHE[t] = lines
+        _llm_cache_put(prompt, lines)
         return lines
 
-    # 폴백: 빈 응답이면 원문 그대로 1줄
-    _BREATH_CACHE[t] = [t]
+    # 폴백: 빈 응답이면 원문 그대로 1줄 (실패 결과는 디스크에 남기지 않음)
     return [t]
 
 BREATH_PROMPT = """역할: 너는 한국어 대본의 호흡(브레스) 라인브레이크 편집기다.
@@ -189,7 +220,14 @@ SSML_PROMPT = """역할: 너는 한국어 대본을 숏폼용 Amazon Polly SSML
 (SSML만 출력)
 """
 
-def _complete_with_any_llm(prompt: str) -> str | None:
+_DEFAULT_SYSTEM_PROMPT = "너는 한국어 대본의 호흡(브레스) 라인브레이크 편집기다."
+
+@lru_cache(maxsize=8)
+def _get_llm_chain(system_prompt: str = _DEFAULT_SYSTEM_PROMPT):
+    """system_prompt별 체인을 한 번만 만들어 재사용 (호출마다 ChatOpenAI 생성 방지)."""
+    return get_default_chain(system_prompt)
+
+def _complete_with_any_llm(prompt: str, system_prompt: str = _DEFAULT_SYSTEM_PROMPT) -> str | None:
     if complete_text is not None:
         try:
             return complete_text(prompt)
@@ -197,7 +235,7 @@ def _complete_with_any_llm(prompt: str) -> str | None:
             pass
     try:
         # system_prompt를 명시적으로 줌
-        chain = get_default_chain("너는 한국어 대본의 호흡(브레스) 라인브레이크 편집기다.")
+        chain = _get_llm_chain(system_prompt)
         out = chain.invoke({"question": prompt})
         if isinstance(out, str):
             return out
@@ -212,21 +250,8 @@ def _unwrap_speak(ssml: str) -> str:
     m = re.search(r"<speak[^>]*>(.*)</speak>", ssml or "", flags=re.S|re.I)
     return (m.group(1) if m else (ssml or "")).strip()
 
-def convert_line_to_ssml(user_line: str) -> str:
-    """
-    한 줄 대본을 Amazon Polly 친화 SSML로 분할(구/절 단위 prosody + 짧은 break).
-    - 태그: <prosody>, <break>만 사용 (여기서는 <speak>는 붙이지 않음)
-    - 마침표/느낌표는 폴백에서만 정리(Polly 안정성), 물음표/쉼표는 유지
-    - 원문 어휘/어순 보존, '분할'만 수행
-    """
-    try:
-        from xml.sax.saxutils import escape as _xml_escape
-    except Exception:
-        def _xml_escape(s: str) -> str:
-            return (s or "") \
-                .replace("&", "&amp;").replace("<", "&lt;") \
-                .replace(">", "&gt;").replace('"', "&quot;").replace("'", "&apos;")
-
+def _preprocess_ssml_line(user_line: str) -> str:
+    """SSML 변환 전 의미 보존/발음 안정화 전처리 (LLM/폴백 공통)."""
     t = (user_line or "").strip()
     if not t:
         return ""
@@ -247,25 +272,58 @@ def convert_line_to_ssml(user_line: str) -> str:
     # ③ 비율/속도: "1 / 3" → "1/3" , "30 km/h" → "30 km/h" (가독만 정리)
     t = re.sub(r'(\d)\s*/\s*(\d)', r'\1/\2', t)        # 분수/비율
     t = re.sub(r'(\d)\s+(km/h|m/s)', r'\1 \2', t)      # 속도 단위 앞은 한 칸 유지
+    return t
+
+def _clean_llm_ssml(out: str) -> str:
+    """LLM이 낸 SSML을 <prosody>/<break> 조각으로 정리. 비어 있으면 ""."""
+    out = (out or "").strip()
+    if not out:
+        return ""
+    frag = _unwrap_speak(out)
+    frag = re.sub(r"</?(?!prosody\b|break\b)[a-zA-Z0-9:_-]+\b[^>]*>", "", frag)
+    # 연속 break 축약
+    frag = re.sub(r'(?:<break\b[^>]*/>\s*){2,}', '<break time="30ms"/>', frag)
+    # ✅ ellipsis 제거 (… , ... , . . . 등 숫자 아닌 점열 모두)
+    frag = frag.replace("…", "")
+    frag = re.sub(r'(?<!\d)(?:\s*\.\s*){2,}(?!\d)', '', frag)
+    return frag if frag.strip() else ""
+
+def convert_line_to_ssml(user_line: str) -> str:
+    """
+    한 줄 대본을 Amazon Polly 친화 SSML로 분할(구/절 단위 prosody + 짧은 break).
+    - 태그: <prosody>, <break>만 사용 (여기서는 <speak>는 붙이지 않음)
+    - 마침표/느낌표는 폴백에서만 정리(Polly 안정성), 물음표/쉼표는 유지
+    - 원문 어휘/어순 보존, '분할'만 수행
+    """
+    t = _preprocess_ssml_line(user_line)
+    if not t:
+        return ""
 
     # ── [LLM 경로: 있으면 그대로 사용] ────────────────────────────────────
+    prompt = SSML_PROMPT.replace("{{USER_SCRIPT}}", t)
+    cached = _llm_cache_get(prompt)
+    if cached is not None:
+        return cached
     try:
-        prompt = SSML_PROMPT.replace("{{USER_SCRIPT}}", t)
-        out = _complete_with_any_llm(prompt) or ""
-        out = out.strip()
-        if out:
-            frag = _unwrap_speak(out)
-            frag = re.sub(r"</?(?!prosody\b|break\b)[a-zA-Z0-9:_-]+\b[^>]*>", "", frag)
-            # 연속 break 축약
-            frag = re.sub(r'(?:<break\b[^>]*/>\s*){2,}', '<break time="30ms"/>', frag)
-            # ✅ ellipsis 제거 (… , ... , . . . 등 숫자 아닌 점열 모두)
-            frag = frag.replace("…", "")
-            frag = re.sub(r'(?<!\d)(?:\s*\.\s*){2,}(?!\d)', '', frag)
-            if frag.strip():
-                return frag
+        frag = _clean_llm_ssml(_complete_with_any_llm(prompt) or "")
+        if frag:
+            _llm_cache_put(prompt, frag)
+            return frag
     except Exception:
         pass
 
+    return _fallback_line_to_ssml(t)
+
+def _fallback_line_to_ssml(t: str) -> str:
+    """LLM 없이 규칙 기반으로 SSML 조각 생성 (전처리된 라인 입력)."""
+    try:
+        from xml.sax.saxutils import escape as _xml_escape
+    except Exception:
+        def _xml_escape(s: str) -> str:
+            return (s or "") \
+                .replace("&", "&amp;").replace("<", "&lt;") \
+                .replace(">", "&gt;").replace('"', "&quot;").replace("'", "&apos;")
+
     # ── [폴백 경로: 소수점 보호 후 문장부호 정리] ──────────────────────────
     tt = t
     # 소수점 보호 후, '띄어쓴 점열'과 '연속점' 모두 제거
@@ -331,3 +389,150 @@ def convert_line_to_ssml(user_line: str) -> str:
 
     # 연속 break 1회로 축약 후 리턴
     return re.sub(r'(?:<break\b[^>]*/>\s*){2,}', '<break time="30ms"/>', "".join(ssml)).strip()
+
+# ===== 배치 SSML 변환 =====
+# 라인 여러 개를 한 번의 LLM 요청으로 보내고(번호 매김 출력), 배치들은 병렬로 처리한다.
+# 결과는 '단건 프롬프트' 기준 키로 _LLM_CACHE에 라인별 저장 → 단건/배치 경로가 캐시를 공유한다.
+SSML_BATCH_SIZE = int(os.getenv("SSML_BATCH_SIZE", "12"))
+SSML_BATCH_WORKERS = int(os.getenv("SSML_BATCH_WORKERS", "4"))
+
+SSML_BATCH_PROMPT = """아래 [변환 규칙]을 번호 매긴 각 라인에 '라인별로 독립적으로' 적용한다.
+
+[변환 규칙]
+{{RULES}}
+
+[배치 출력 형식 — 반드시 지켜]
+- i번째 입력 라인의 결과는 'i. <speak>…</speak>' 한 줄로만 출력한다.
+- 결과 SSML 안에 줄바꿈을 넣지 않는다. 입력 라인 수와 출력 줄 수가 같아야 한다.
+- 번호 외의 라벨/설명/마크다운 금지.
+
+[입력 라인들]
+{{NUMBERED}}
+
+[출력]
+"""
+
+KOREANIZE_BATCH_PROMPT = """역할: 너는 한국어 문장 변환기다.
+번호 매긴 각 라인을 의미 동일 한국어 **한 문장**으로 바꾼다. 마크다운/주석/설명 금지.
+규칙: 의미를 100% 유지. 숫자/단위/고유명사는 보존. 문장 끝 어미는 평서체.
+출력 형식: i번째 라인의 결과는 'i. 한국어 문장' 한 줄. 입력 라인 수와 출력 줄 수가 같아야 한다.
+
+[입력 라인들]
+{{NUMBERED}}
+
+[출력]
+"""
+
+def _parse_numbered_lines(raw: str, n: int) -> list[str]:
+    """'i. 내용' 형식 응답을 길이 n 리스트로 파싱 (없는 번호는 "")."""
+    out = [""] * n
+    for ln in (raw or "").splitlines():
+        m = re.match(r"^\s*(\d+)[.)]\s*(.+)$", ln)
+        if not m:
+            continue
+        idx = int(m.group(1)) - 1
+        if 0 <= idx < n and not out[idx]:
+            out[idx] = m.group(2).strip()
+    return out
+
+def _chunks(items: list, size: int) -> list[list]:
+    size = max(1, int(size))
+    return [items[i:i + size] for i in range(0, len(items), size)]
+
+def _run_batches(batches: list[list[str]], fn, max_workers: int) -> list[list[str]]:
+    """배치들을 스레드풀로 병렬 실행하고 입력 순서대로 결과를 돌려준다."""
+    if not batches:
+        return []
+    workers = max(1, min(int(max_workers), len(batches)))
+    if workers == 1:
+        return [fn(b) for b in batches]
+    with ThreadPoolExecutor(max_workers=workers) as ex:
+        return list(ex.map(fn, batches))
+
+def _ssml_batch_call(batch: list[str]) -> list[str]:
+    numbered = "\n".join(f"{i+1}. {t}" for i, t in enumerate(batch))
+    rules = SSML_PROMPT.split("[입력 대본]")[0].strip()
+    prompt = SSML_BATCH_PROMPT.replace("{{RULES}}", rules).replace("{{NUMBERED}}", numbered)
+    try:
+        raw = _complete_with_any_llm(prompt) or ""
+    except Exception:
+        raw = ""
+    return [_clean_llm_ssml(x) for x in _parse_numbered_lines(raw, len(batch))]
+
+def convert_lines_to_ssml_batch(
+    lines: list[str],
+    batch_size: int = SSML_BATCH_SIZE,
+    max_workers: int = SSML_BATCH_WORKERS,
+) -> list[str]:
+    """
+    여러 라인을 배치 LLM 요청으로 SSML 변환 (convert_line_to_ssml의 배치판).
+    - 캐시 히트 라인은 LLM을 부르지 않음
+    - 중복 라인은 한 번만 변환
+    - 배치 응답에서 빠진 라인은 규칙 기반 폴백으로 채움(캐시하지 않음)
+    반환: 입력과 같은 길이의 SSML 조각 리스트
+    """
+    prepped = [_preprocess_ssml_line(ln) for ln in (lines or [])]
+    results: dict[str, str] = {}
+    misses: list[str] = []
+    for t in prepped:
+        if not t or t in results or t in misses:
+            continue
+        cached = _llm_cache_get(SSML_PROMPT.replace("{{USER_SCRIPT}}", t))
+        if cached is not None:
+            results[t] = cached
+        else:
+            misses.append(t)
+
+    if misses:
+        batches = _chunks(misses, batch_size)
+        print(f"[ssml] 캐시 히트 {len(results)}개, LLM 변환 {len(misses)}개 ({len(batches)}배치)")
+        _LLM_CACHE.log_stats("ssml")
+        for batch, frags in zip(batches, _run_batches(batches, _ssml_batch_call, max_workers)):
+            for t, frag in zip(batch, frags):
+                if frag:
+                    _llm_cache_put(SSML_PROMPT.replace("{{USER_SCRIPT}}", t), frag)
+                    results[t] = frag
+                else:
+                    results[t] = _fallback_line_to_ssml(t)
+
+    return [results.get(t, "") if t else "" for t in prepped]
+
+def _koreanize_batch_call(batch: list[str]) -> list[str]:
+    numbered = "\n".join(f"{i+1}. {t}" for i, t in enumerate(batch))
+    prompt = KOREANIZE_BATCH_PROMPT.replace("{{NUMBERED}}", numbered)
+    try:
+        raw = _complete_with_any_llm(prompt) or ""
+    except Exception:
+        raw = ""
+    return [re.sub(r"\s+", " ", x).strip() for x in _parse_numbered_lines(raw, len(batch))]
+
+def koreanize_lines_if_english(
+    lines: list[str],
+    batch_size: int = SSML_BATCH_SIZE,
+    max_workers: int = SSML_BATCH_WORKERS,
+) -> list[str]:
+    """koreanize_if_english의 배치판: 영어로 보이는 라인만 모아 번호 매김 배치로 변환."""
+    stripped = [(ln or "").strip() for ln in (lines or [])]
+    results: dict[str, str] = {}
+    misses: list[str] = []
+    for t in stripped:
+        if not t or t in results or t in misses or not _looks_english(t):
+            continue
+        cached = _llm_cache_get(_koreanize_prompt(t))
+        if cached is not None:
+            results[t] = cached
+        else:
+            misses.append(t)
+
+    if misses:
+        batches = _chunks(misses, batch_size)
+        for batch, outs in zip(batches, _run_batches(batches, _koreanize_batch_call, max_workers)):
+            for t, ko in zip(batch, outs):
+                if ko:
+                    _llm_cache_put(_koreanize_prompt(t), ko)
+                    results[t] = ko
+                else:
+                    # 배치에서 빠진 라인만 단건 경로(LLM → Google 번역)로 보충
+                    results[t] = koreanize_if_english(t)
+
+    return [results.get(t, t) for t in stripped]
@@ -0,0 +1,5 @@
+# tests/conftest.py — 저장소 루트 모듈(motion_renderer 등)과 RAG 패키지를 import할 수 있도록 경로 추가
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,59 @@
+import numpy as np
+import pytest
+
+from RAG.bm25_index import SparseBM25, top_k_indices
+
+
+def _naive_scores(corpus, query, k1=1.2, b=0.75):
+    n = len(corpus)
+    avgdl = (sum(map(len, corpus)) / n) or 1.0
+    out = []
+    for doc in corpus:
+        score = 0.0
+        for t in query:
+            df = sum(t in d for d in corpus)
+            if not df:
+                continue
+            idf = np.log1p((n - df + 0.5) / (df + 0.5))
+            tf = doc.count(t)
+            score += idf * tf * (k1 + 1) / (tf + k1 * (1 - b + b * len(doc) / avgdl))
+        out.append(score)
+    return np.array(out)
+
+
+@pytest.mark.parametrize("corpus", [
+    [["부산", "바다"], ["서울"], ["부산", "부산", "여행"]],
+    [["부산", "바다"], []],                     # 마지막 문장이 비어 있음
+    [[], ["부산"], [], ["바다", "부산"], []],   # 앞/중간/끝 빈 문장
+    [[], [], []],                               # 전부 비어 있음
+    [],                                         # 문장 없음
+])
+def test_scores_match_reference_and_handle_empty_rows(corpus):
+    bm25 = SparseBM25.from_tokens(corpus, k1=1.2, b=0.75)
+    assert len(bm25) == len(corpus)
+    query = ["부산", "바다", "없는단어"]
+    scores = bm25.get_scores(query)
+    assert scores.shape == (len(corpus),)
+    if corpus:
+        np.testing.assert_allclose(scores, _naive_scores(corpus, query), rtol=1e-5, atol=1e-6)
+
+
+def test_search_returns_positive_hits_in_order():
+    bm25 = SparseBM25.from_tokens([["부산", "바다"], ["서울"], ["부산"], []])
+    assert list(bm25.search(["부산"], 10)) == [2, 0]
+    assert len(bm25.search(["없는단어"], 10)) == 0
+
+
+def test_save_load_roundtrip_mmap(tmp_path):
+    bm25 = SparseBM25.from_tokens([["부산", "바다"], [], ["바다"]])
+    bm25.save(str(tmp_path))
+    loaded = SparseBM25.load(str(tmp_path))
+    np.testing.assert_allclose(loaded.get_scores(["바다"]), bm25.get_scores(["바다"]))
+    assert loaded.vocab == bm25.vocab
+
+
+def test_top_k_indices():
+    scores = np.array([0.1, 0.9, 0.5, 0.9])
+    assert list(top_k_indices(scores, 3)) == [1, 3, 2]
+    assert len(top_k_indices(scores, 0)) == 0
+    assert len(top_k_indices(np.zeros(0), 5)) == 0
@@ -0,0 +1,124 @@
+import threading
+
+import pytest
+
+import cache_store
+from cache_store import TwoTierCache
+
+
+class _Clock:
+    def __init__(self, t=1_000_000.0):
+        self.t = t
+
+    def __call__(self):
+        return self.t
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    c = _Clock()
+    monkeypatch.setattr(cache_store.time, "time", c)
+    return c
+
+
+def _cache(tmp_path, **kw):
+    kw.setdefault("backend", "sqlite")
+    return TwoTierCache("t", path=str(tmp_path / "t.sqlite"), **kw)
+
+
+def test_ttl_expiry_in_memory_and_on_disk(tmp_path, clock):
+    c = _cache(tmp_path, ttl_sec=10)
+    c.set("k", {"v": 1})
+    clock.t += 5
+    assert c.get("k") == {"v": 1}
+    clock.t += 10
+    assert c.get("k") is None
+    # 새 인스턴스(빈 LRU)에서도 디스크 항목이 만료로 처리되고 삭제됨
+    assert _cache(tmp_path, ttl_sec=10).get("k", "miss") == "miss"
+    row = c._tier2().execute("SELECT COUNT(*) FROM kv").fetchone()
+    assert row == (0,)
+
+
+def test_per_call_ttl_overrides_default(tmp_path, clock):
+    c = _cache(tmp_path, ttl_sec=10)
+    c.set("long", 1, ttl_sec=100)
+    clock.t += 50
+    assert c.get("long") == 1
+
+
+def test_prune_trims_least_recently_used(tmp_path, clock):
+    c = _cache(tmp_path, disk_max_items=3)
+    for i in range(5):
+        clock.t += 1
+        c.set(f"k{i}", i)
+    clock.t += 1
+    fresh = _cache(tmp_path, disk_max_items=3)
+    assert fresh.get("k0") == 0          # 디스크 조회로 accessed 갱신 → 가장 최근
+    c.prune()
+    assert c.stats()["evictions"] == 2
+    keys = {k for (k,) in c._tier2().execute("SELECT k FROM kv")}
+    assert keys == {"k0", "k3", "k4"}
+
+
+def test_prune_drops_expired_rows(tmp_path, clock):
+    c = _cache(tmp_path, ttl_sec=10)
+    c.set("old", 1)
+    c.set("keep", 2, ttl_sec=0)           # 0 → 만료 없음
+    clock.t += 20
+    c.prune()
+    keys = {k for (k,) in c._tier2().execute("SELECT k FROM kv")}
+    assert keys == {"keep"}
+
+
+def test_memory_lru_eviction(tmp_path):
+    c = _cache(tmp_path, mem_max_items=2)
+    for k in ("a", "b", "c"):
+        c.set(k, k)
+    assert list(c._mem) == ["b", "c"]
+    assert c.stats()["evictions"] == 1
+
+
+def test_hit_stats(tmp_path):
+    c = _cache(tmp_path)
+    c.set("k", "v")
+    assert c.get("k") == "v"                     # mem hit
+    other = _cache(tmp_path)
+    assert other.get("k") == "v"                 # disk hit
+    assert other.get("k") == "v"                 # 이후 mem hit
+    assert other.get("missing") is None          # miss
+    s = other.stats()
+    assert (s["mem_hits"], s["disk_hits"], s["misses"]) == (1, 1, 1)
+    assert s["hit_ratio"] == pytest.approx(0.667, abs=1e-3)
+    assert c.stats()["sets"] == 1
+
+
+def test_corrupt_row_is_a_miss(tmp_path):
+    c = _cache(tmp_path)
+    conn = c._tier2()
+    conn.execute("INSERT INTO kv (k, v, expires, accessed) VALUES ('bad', '{not json', NULL, 0)")
+    conn.commit()
+    assert c.get("bad", "default") == "default"
+    s = c.stats()
+    assert (s["errors"], s["misses"], s["disk_hits"]) == (1, 1, 0)
+
+
+def test_concurrent_threads_share_disk_tier(tmp_path):
+    c = _cache(tmp_path)
+    errors = []
+
+    def worker(n):
+        try:
+            for i in range(50):
+                c.set(f"{n}:{i}", i)
+                assert c.get(f"{n}:{i}") == i
+        except Exception as e:  # pragma: no cover - 실패 시 원인 표시
+            errors.append(e)
+
+    threads = [threading.Thread(target=worker, args=(n,)) for n in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert not errors
+    assert _cache(tmp_path).get("7:49") == 49
+    assert c.stats()["errors"] == 0
@@ -0,0 +1,81 @@
+from langchain_core.documents import Document as LangChainDocument
+
+from RAG.dedup import MinHasher, MinHashLSH, dedup_documents
+
+_ARTICLE = (
+    "부산시는 올여름 해운대해수욕장 개장 기간을 예년보다 열흘 늘린다고 밝혔다. "
+    "시는 안전요원 120명을 추가로 배치하고 야간 조명을 확충할 계획이다. "
+    "상인회는 관광객 증가로 주변 상권 매출이 회복될 것으로 기대하고 있다. "
+    "다만 교통 혼잡과 쓰레기 문제에 대한 대책도 함께 마련해야 한다는 지적이 나온다. "
+    "시 관계자는 셔틀버스 노선을 늘리고 분리수거함을 두 배로 설치하겠다고 말했다."
+)
+_OTHER = (
+    "한국은행은 기준금리를 동결하고 하반기 물가 흐름을 지켜보겠다고 발표했다. "
+    "금융통화위원회는 가계부채 증가세가 여전히 높다는 점을 동결 배경으로 꼽았다. "
+    "시장에서는 연내 한 차례 인하 가능성을 점치는 전망이 우세하다."
+)
+
+
+def _doc(text, source):
+    return LangChainDocument(page_content=text, metadata={"source": source})
+
+
+def test_minhash_similarity_tracks_overlap():
+    h = MinHasher()
+    a, b, c = h.signature(_ARTICLE), h.signature(_ARTICLE.replace("열흘", "일주일")), h.signature(_OTHER)
+    assert (a == b).mean() > 0.8
+    assert (a == c).mean() < 0.2
+    assert (h.signature(_ARTICLE) == a).all()        # 결정적
+
+
+def test_lsh_returns_registered_near_duplicate():
+    h = MinHasher()
+    lsh = MinHashLSH(num_perm=h.num_perm)
+    first = lsh.insert(h.signature(_ARTICLE))
+    lsh.insert(h.signature(_OTHER))
+    assert lsh.query(h.signature(_ARTICLE.replace("120명", "100명"))) == first
+    assert lsh.query(h.signature("전혀 관련 없는 짧지 않은 문장으로 이루어진 다른 글입니다.")) is None
+
+
+def test_near_duplicate_keeps_first_copy_and_records_source():
+    docs = [_doc(_ARTICLE, "https://a.example/1"),
+            _doc(_OTHER, "https://b.example/2"),
+            _doc(_ARTICLE.replace("열흘", "일주일"), "https://mirror.example/1")]
+    out, stats = dedup_documents(docs, sentences=False)
+    assert [d.metadata["source"] for d in out] == ["https://a.example/1", "https://b.example/2"]
+    assert out[0].page_content == _ARTICLE
+    assert out[0].metadata["duplicates"] == ["https://mirror.example/1"]
+    assert stats["dropped_docs"] == 1
+    assert "duplicates" not in docs[0].metadata      # 입력 문서는 건드리지 않음
+
+
+def test_repeated_sentences_removed_from_later_documents():
+    shared = "시 관계자는 셔틀버스 노선을 늘리고 분리수거함을 두 배로 설치하겠다고 말했다."
+    docs = [_doc(_ARTICLE, "a"), _doc(_OTHER + " " + shared.upper() + "\n짧은 줄.", "b")]
+    out, stats = dedup_documents(docs)
+    assert out[0].page_content == _ARTICLE
+    assert shared not in out[1].page_content
+    assert out[1].page_content.endswith("짧은 줄.")    # DEDUP_MIN_SENTENCE_CHARS 미만은 유지
+    assert stats["dropped_sentences"] == 1
+
+
+def test_documents_shortened_below_min_chars_are_dropped():
+    tail = "추가로 덧붙인 한 문장입니다만 아주 짧지는 않습니다."
+    docs = [_doc(_ARTICLE, "a"),
+            _doc(_ARTICLE.split(". ")[0] + ". " + _ARTICLE.split(". ")[1] + ". " + tail, "b"),
+            _doc(_OTHER, "c")]
+    out, stats = dedup_documents(docs, min_chars=100)
+    assert [d.metadata["source"] for d in out] == ["a", "c"]
+    assert stats["dropped_short"] == 1
+    # 기준이 없으면 남은 문장만으로 유지
+    out, _ = dedup_documents(docs)
+    assert [d.metadata["source"] for d in out] == ["a", "b", "c"]
+    assert out[1].page_content == tail
+
+
+def test_fully_duplicated_and_empty_documents_vanish():
+    docs = [_doc(_ARTICLE, "a"), _doc("", "empty"), _doc(_ARTICLE.replace(". ", ".\n"), "b")]
+    out, stats = dedup_documents(docs)
+    assert [d.metadata["source"] for d in out] == ["a"]
+    assert stats["docs_in"] == 3 and stats["docs_out"] == 1
+    assert stats["tokens_saved"] >= 0
@@ -0,0 +1,93 @@
+import json
+import zlib
+
+import pytest
+from langchain_core.documents import Document as LangChainDocument
+
+from RAG import doc_codec
+from RAG.doc_codec import MAGIC, VERSION, decode_documents, encode_documents, is_encoded
+
+
+
+def _docs(n=6):
+    docs = []
+    for i in range(n):
+        meta = {"source": f"https://example.com/{i % 2}", "title": f"제목 {i % 2}", "page": i % 2,
+                "relevance_score": 0.9 - i * 0.05}
+        if i == 3:
+            del meta["title"]               # 기준에서 빠진 키
+        if i == 4:
+            meta["extra"] = [1, "둘"]        # 기준에 없는 키
+        docs.append(LangChainDocument(page_content=f"{i}번째 문장입니다. " * (1 + i), metadata=meta))
+    docs.append(LangChainDocument(page_content="출처 없음", metadata={}))
+    return docs
+
+
+def _as_tuples(docs):
+    return [(d.page_content, d.metadata) for d in docs]
+
+
+_SERIALIZERS = [("json", None, doc_codec._SER_JSON),
+                ("msgpack", "msgpack", doc_codec._SER_MSGPACK)]
+_COMPRESSORS = [("zlib", None, doc_codec._CMP_ZLIB),
+                ("zstd", "zstandard", doc_codec._CMP_ZSTD)]
+
+
+@pytest.mark.parametrize("ser_name,ser_mod,ser_id", _SERIALIZERS)
+@pytest.mark.parametrize("cmp_name,cmp_mod,cmp_id", _COMPRESSORS)
+def test_roundtrip_each_serializer_and_compressor(monkeypatch, ser_name, ser_mod, ser_id,
+                                                  cmp_name, cmp_mod, cmp_id):
+    monkeypatch.setattr(doc_codec, "msgpack", pytest.importorskip(ser_mod) if ser_mod else None)
+    monkeypatch.setattr(doc_codec, "zstandard", pytest.importorskip(cmp_mod) if cmp_mod else None)
+    docs = _docs()
+    blob = encode_documents(docs)
+    assert blob[:2] == MAGIC and blob[2] == VERSION
+    assert blob[3] == (ser_id << 4) | cmp_id
+    assert _as_tuples(decode_documents(blob)) == _as_tuples(docs)
+
+
+@pytest.mark.parametrize("ser_mod", [None, "msgpack"])
+def test_small_payload_is_stored_uncompressed(monkeypatch, ser_mod):
+    monkeypatch.setattr(doc_codec, "msgpack", pytest.importorskip(ser_mod) if ser_mod else None)
+    docs = [LangChainDocument(page_content="짧은 문장", metadata={"source": "s"})]
+    blob = encode_documents(docs)
+    assert blob[3] & 0x0F == doc_codec._CMP_NONE
+    assert _as_tuples(decode_documents(blob)) == _as_tuples(docs)
+
+
+def test_empty_list_roundtrip():
+    assert decode_documents(encode_documents([])) == []
+
+
+def test_shared_metadata_is_stored_once(monkeypatch):
+    monkeypatch.setattr(doc_codec, "msgpack", None)
+    monkeypatch.setattr(doc_codec, "zstandard", None)
+    blob = encode_documents(_docs())
+    payload = json.loads(zlib.decompress(blob[4:]))
+    assert len(payload["s"]) == 3                     # 출처 2개 + 빈 출처
+    assert payload["s"][0]["title"] == "제목 0"
+    assert all(len(row) <= 4 for row in payload["d"])
+
+
+def test_legacy_json_string_is_still_readable():
+    legacy = json.dumps([{"page_content": "예전 형식", "metadata": {"source": "s"}}])
+    assert not is_encoded(legacy)
+    assert _as_tuples(decode_documents(legacy)) == [("예전 형식", {"source": "s"})]
+    assert _as_tuples(decode_documents(legacy.encode("utf-8"))) == [("예전 형식", {"source": "s"})]
+
+
+def test_bad_magic_is_not_treated_as_codec_payload():
+    blob = encode_documents(_docs())
+    corrupted = b"XX" + blob[2:]
+    assert not is_encoded(corrupted)
+    with pytest.raises(ValueError):           # JSON으로도 읽을 수 없음 (UnicodeDecodeError/JSONDecodeError)
+        decode_documents(corrupted)
+    assert not is_encoded("RD 로 시작하는 문자열")
+    assert not is_encoded(b"R")
+
+
+def test_unknown_version_is_rejected():
+    blob = bytearray(encode_documents(_docs()))
+    blob[2] = VERSION + 1
+    with pytest.raises(ValueError, match="버전"):
+        decode_documents(bytes(blob))
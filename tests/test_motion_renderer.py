@@ -0,0 +1,64 @@
+import pytest
+from PIL import Image
+
+from motion_renderer import MotionRenderer, PAN_START, PAN_END, ZOOM_END
+
+W, H = 90, 160
+
+
+@pytest.fixture
+def wide_image(tmp_path):
+    # 세로 캔버스보다 훨씬 넓은 이미지 → 팬 여유 폭 M이 PAN_MIN_MOVE보다 큼
+    path = tmp_path / "wide.png"
+    Image.new("RGB", (640, 320), (120, 80, 40)).save(path)
+    return str(path)
+
+
+def _renderer(path, motion):
+    return MotionRenderer(path, W, H, duration=2.0, motion=motion)
+
+
+def test_left_to_right_moves_window_from_start_ratio_to_zero(wide_image):
+    r = _renderer(wide_image, "left_to_right")
+    m = r._max_move
+    assert r.crop_window(0.0) == (round(m * PAN_START), r._cy, W, H)
+    assert r.crop_window(2.0) == (0, r._cy, W, H)
+
+
+def test_right_to_left_moves_window_from_end_ratio_further_right(wide_image):
+    r = _renderer(wide_image, "right_to_left")
+    m = r._max_move
+    assert r.crop_window(0.0) == (round(m * PAN_END), r._cy, W, H)
+    assert r.crop_window(2.0) == (min(round(m * (2 * PAN_END - PAN_START)), m), r._cy, W, H)
+
+
+def test_pans_go_opposite_ways(wide_image):
+    ltr = _renderer(wide_image, "left_to_right")
+    rtl = _renderer(wide_image, "right_to_left")
+    assert ltr.crop_window(2.0)[0] < ltr.crop_window(0.0)[0]
+    assert rtl.crop_window(2.0)[0] > rtl.crop_window(0.0)[0]
+
+
+def test_static_is_centered(wide_image):
+    r = _renderer(wide_image, "static")
+    assert r.crop_window(0.0) == r.crop_window(2.0) == (r._cx, r._cy, W, H)
+
+
+def test_zoom_shrinks_window_to_output_size(wide_image):
+    r = _renderer(wide_image, "zoom_in_out")
+    x0, y0, w0, h0 = r.crop_window(0.0)
+    x1, y1, w1, h1 = r.crop_window(2.0)
+    assert (w0, h0) == (r._sw, r._sh)
+    assert w1 == pytest.approx(r._sw / ZOOM_END, abs=1) and h1 == pytest.approx(r._sh / ZOOM_END, abs=1)
+    assert y0 == y1 == 0 and x1 == (r._sw - w1) // 2
+
+
+def test_drift_ends_at_origin(wide_image):
+    r = MotionRenderer(wide_image, W, H, duration=2.0, motion="static", drift_px=8)
+    assert r.crop_window(0.0) == (8, 8, W, H)
+    assert r.crop_window(2.0) == (0, 0, W, H)
+
+
+@pytest.mark.parametrize("motion", ["zoom_in_out", "left_to_right", "right_to_left", "static"])
+def test_frame_has_output_shape(wide_image, motion):
+    assert _renderer(wide_image, motion).frame(1.0).shape == (H, W, 3)
@@ -0,0 +1,108 @@
+import random
+import re
+
+import pytest
+
+import noise_filter
+from noise_filter import filter_noise_batch, filter_text
+from text_scraper import filter_noise
+
+
+def _legacy_filter_noise(text):
+    """noise_filter 도입 전 text_scraper.filter_noise 원본 (동작 비교 기준)."""
+    ad_patterns = [
+        r"배너\s?(광고|클릭)", r"광고문의", r"마케팅\s?문의",
+        r"제휴\s?(문의|링크)", r"구매\s?링크", r"프로모션", r"스폰서", r"광고\s?수익",
+        r"후원\s?(계좌|링크|문의|해주시면|받습니다|바랍니다)", r"아래.*후원", r"후원해\s?주세요",
+        r"협찬\s?(문의|링크|해주시면)", r"쿠팡\s?파트너스", r"구매링크",
+        r"이 글은 .*? 광고를 포함하고 있습니다",
+        r"이 포스트는 .*? 후원을 받고 작성되었습니다",
+        r"광고성 문구", r"유료 광고", r"제휴 마케팅", r"체험단",
+        r"Sponsored by", r"이벤트 참여", r"이벤트 안내", r"채널 가입"
+    ]
+    ad_regex = re.compile("|".join(ad_patterns), re.IGNORECASE)
+    lines = text.split('\n')
+    filtered = []
+    for line in lines:
+        line_stripped = line.strip()
+        if len(line_stripped) <= 30:
+            continue
+        if ad_regex.search(line_stripped):
+            continue
+        if re.search(r'([a-zA-Z0-9_.+-]+@[a-zA-Z0-9-]+\.[a-zA-Z0-9-.]+)|(오픈채팅)|(카톡)|(연락처)|(문의:)', line_stripped):
+            continue
+        if len(line_stripped) > 10:
+            ratio = sum(c.isalnum() for c in line_stripped) / len(line_stripped)
+            if ratio > 0.8:
+                continue
+        filtered.append(line_stripped)
+    return "\n".join(filtered)
+
+
+_BODY = "정부는 오늘 새로운 경제 정책을 발표했으며, 전문가들은 물가 안정에 도움이 될 것이라고 분석했다."
+_LINES = [
+    _BODY,
+    "   " + _BODY + "\t\r",                                       # 앞뒤 공백/CR
+    "짧은 줄",
+    "가" * 30, "가 " * 16,                                        # 길이 경계 (30자 제거, 31자 이상 유지)
+    "배너 광고를 클릭하시면 다양한 혜택을 받아보실 수 있습니다 지금 바로",
+    "이 글은 업체로부터 제공받은 제품을 사용한 후기이며 광고를 포함하고 있습니다",
+    "아래 링크를 통해 구매하시면 저에게 작은 후원이 됩니다 감사합니다 여러분",
+    "구매 후기가 많아서 직접 매장에 가서 확인해 보았는데 생각보다 괜찮았습니다",  # 앵커만 있고 패턴 불일치
+    "이벤트 기간 동안에는 매장 방문객이 평소보다 훨씬 많았다고 관계자가 전했다",   # 앵커만
+    "SPONSORED BY ACME — this article was produced in partnership with the brand",
+    "문의는 홈페이지로 부탁드리며 답변은 영업일 기준 사흘 정도 걸릴 수 있습니다",   # '문의'만, '문의:' 아님
+    "자세한 내용은 문의: 02-123-4567 또는 담당자에게 직접 연락 주시기 바랍니다",
+    "기사 제보 및 보도자료는 press.team@example.co.kr 로 보내 주시기 바랍니다",
+    "카톡 채널을 추가하시면 매주 새로운 소식을 받아보실 수 있습니다 많관부",
+    "a3f9c2e1b7d04e8f9a6c5b3d2e1f0a9b8c7d6e5f4a3b2c1d0e9f8a7b6c5d4e3f",        # 해시
+    "The quick brown fox jumps over the lazy dog near the riverbank today",
+    "가나다라마바사아자차카타파하 가나다라마바사아자차카타파하 가나다라마",          # 한글만 (영숫자 비율 높음)
+    "𰀀𰀁𰀂𰀃𰀄𰀅𰀆𰀇𰀈𰀉 — 확장 G 한자가 포함된 줄입니다, 비율 계산 확인용 문장",   # U+30000 이상
+    "ｆｕｌｌｗｉｄｔｈ　ＡＢＣ　１２３　전각 문자와 공백이 섞인 줄입니다 확인",
+    "깨진 디코딩으로 남은 서로게이트 \udc80\udcff 가 있어도 처리되어야 하는 줄입니다",
+    "",
+    "—— ★★★ ——— ※※※ ——— ●●● ——— ■■■ ——— ▲▲▲ ———",                      # 기호만
+]
+
+
+def _documents():
+    rng = random.Random(1234)
+    docs = ["\n".join(_LINES), "", "\n\n\n", _BODY, "\n".join(reversed(_LINES))]
+    for _ in range(200):
+        docs.append("\n".join(rng.choice(_LINES) for _ in range(rng.randint(1, 12))))
+    return docs
+
+
+@pytest.mark.parametrize("use_numpy", [True, False])
+def test_filter_text_matches_legacy(monkeypatch, use_numpy):
+    if not use_numpy:
+        monkeypatch.setattr(noise_filter, "np", None)
+    for doc in _documents():
+        assert filter_text(doc) == _legacy_filter_noise(doc), repr(doc[:80])
+        assert filter_noise(doc) == _legacy_filter_noise(doc)
+
+
+def test_anchor_prefilter_covers_every_pattern():
+    # 전체 정규식에 걸리는 줄이라면 반드시 앵커도 들어 있어야 함 (앵커 누락 = 필터 누락)
+    for line in _LINES:
+        if noise_filter._NOISE_RE.search(line.strip()):
+            assert noise_filter._ANCHOR_RE.search(line), line
+
+
+def test_alnum_counts_match_str_isalnum():
+    text = "\n".join(_LINES)
+    lines = text.split("\n")
+    counts = noise_filter._alnum_counts(text, len(lines))
+    assert list(counts) == [sum(c.isalnum() for c in ln) for ln in lines]
+
+
+def test_batch_without_dedup_equals_per_document():
+    docs = _documents()[:20]
+    assert filter_noise_batch(docs, dedup=False, workers=1) == [_legacy_filter_noise(d) for d in docs]
+
+
+def test_batch_dedup_drops_lines_seen_in_earlier_documents():
+    other = "구매 후기가 많아서 직접 매장에 가서 확인해 보았는데 생각보다 괜찮았습니다"
+    out = filter_noise_batch([_BODY, _BODY.replace(",", " ,") + "\n" + other], workers=1)
+    assert out == [_BODY, other]
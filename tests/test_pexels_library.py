@@ -0,0 +1,40 @@
+import os
+
+from pexels_library import PexelsLibrary
+
+
+def _disk_bytes(root):
+    return sum(os.path.getsize(os.path.join(root, n)) for n in os.listdir(root)
+               if not n.startswith("index.sqlite"))
+
+
+def test_readd_same_id_replaces_old_file(tmp_path):
+    lib = PexelsLibrary(root=str(tmp_path), max_mb=1, pin_sec=0)
+    first = lib.add_bytes("video_head", 42, b"a" * 1000, ext=".mp4")
+    second = lib.add_bytes("video_head", 42, b"b" * 2000, ext=".mp4")
+    assert first["path"] != second["path"]
+    assert not os.path.exists(first["path"])
+    assert os.path.exists(second["path"])
+    assert lib.get("video_head", 42)["path"] == second["path"]
+
+
+def test_readd_keeps_disk_usage_within_cap(tmp_path):
+    cap = 64 * 1024
+    lib = PexelsLibrary(root=str(tmp_path), max_mb=cap / (1024 * 1024), pin_sec=0)
+    for i in range(20):
+        # 같은 클립을 점점 긴 머리 구간으로 다시 받는 상황
+        lib.add_bytes("video_head", 7, bytes([i]) * (10 * 1024 + i), ext=".mp4")
+        lib.add_bytes("image", 100 + i, bytes([i]) * (8 * 1024), ext=".jpg")
+        assert _disk_bytes(str(tmp_path)) <= cap
+    heads = [n for n in os.listdir(tmp_path) if n.startswith("video_head_7_")]
+    assert len(heads) == 1
+
+
+def test_add_file_readd_removes_previous(tmp_path):
+    lib = PexelsLibrary(root=str(tmp_path / "lib"), max_mb=1, pin_sec=0)
+    paths = []
+    for i in range(3):
+        src = tmp_path / f"dl{i}.mp4"
+        src.write_bytes(bytes([i]) * 500)
+        paths.append(lib.add_file("video", 9, str(src))["path"])
+    assert [os.path.exists(p) for p in paths] == [False, False, True]
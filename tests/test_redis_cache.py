@@ -0,0 +1,23 @@
+import pytest
+
+from RAG.redis_cache import _split_connection_budget
+
+
+@pytest.mark.parametrize("total,binary,expected", [
+    (16, None, (8, 8)),
+    (3, None, (2, 1)),
+    (16, "12", (4, 12)),
+    (16, "0", (15, 1)),      # 각 풀 최소 1
+    (16, "99", (1, 15)),
+    (2, None, (1, 1)),
+])
+def test_split_respects_budget(total, binary, expected):
+    text, binary_pool = _split_connection_budget(total, binary)
+    assert (text, binary_pool) == expected
+    assert text + binary_pool == total
+
+
+@pytest.mark.parametrize("total", [1, 0, -3])
+def test_budget_floor_is_two(total):
+    # 풀 두 개에 1개씩이 최소 — 하한 2 (문서화된 동작)
+    assert _split_connection_budget(total) == (1, 1)
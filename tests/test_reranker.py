@@ -0,0 +1,68 @@
+import sys
+import types
+
+import numpy as np
+import pytest
+from langchain_core.documents import Document as LangChainDocument
+
+from RAG import embeddings, reranker
+from RAG.rag_config import RAGConfig
+
+# raw logit: 시그모이드 후 약 0.05 / 0.27 / 0.98
+_LOGITS = np.array([-3.0, -1.0, 4.0], dtype=np.float32)
+
+
+class _Sigmoid:
+    def __call__(self, x):
+        return 1.0 / (1.0 + np.exp(-np.asarray(x, dtype=np.float32)))
+
+
+class _NewCrossEncoder:
+    """sentence-transformers >= 4 형태: activation_fn, 없으면 raw logit 반환."""
+
+    def __init__(self, name, max_length=None, device=None, activation_fn=None):
+        self.activation = activation_fn
+
+    def predict(self, pairs, batch_size=32, show_progress_bar=False):
+        logits = _LOGITS[:len(pairs)]
+        return self.activation(logits) if self.activation is not None else logits
+
+
+class _OldCrossEncoder(_NewCrossEncoder):
+    """sentence-transformers < 4 형태: default_activation_function."""
+
+    def __init__(self, name, max_length=None, device=None, default_activation_function=None):
+        self.activation = default_activation_function
+
+
+@pytest.fixture(params=[_NewCrossEncoder, _OldCrossEncoder])
+def stub_model(request, monkeypatch):
+    fake_torch = types.ModuleType("torch")
+    fake_torch.nn = types.SimpleNamespace(Sigmoid=_Sigmoid)
+    fake_torch.set_num_threads = lambda n: None
+    fake_st = types.ModuleType("sentence_transformers")
+    fake_st.CrossEncoder = request.param
+    monkeypatch.setitem(sys.modules, "torch", fake_torch)
+    monkeypatch.setitem(sys.modules, "sentence_transformers", fake_st)
+    monkeypatch.setattr(reranker, "_cross_encoder", None)
+    monkeypatch.setattr(embeddings, "_torch_threads", None)
+    yield
+    reranker._cross_encoder = None
+    embeddings._torch_threads = None
+
+
+def _docs():
+    return [LangChainDocument(page_content=t, metadata={"source": "s"}) for t in ("가", "나", "다")]
+
+
+def test_cross_encoder_scores_are_probabilities(stub_model):
+    scores = reranker.CrossEncoderReranker().scores("질문", _docs())
+    assert np.all((scores >= 0) & (scores <= 1))
+    np.testing.assert_allclose(scores, _Sigmoid()(_LOGITS), rtol=1e-6)
+
+
+def test_threshold_filter_uses_sigmoid_scale(stub_model):
+    # build_retriever와 같은 절대 컷오프 (raw logit이면 "나"(-1.0)가 잘못 빠짐)
+    ranked = reranker.CrossEncoderReranker(top_n=10).rerank("질문", _docs())
+    kept = [d.page_content for d in ranked if d.metadata["relevance_score"] >= RAGConfig.RERANK_2_THRESHOLD]
+    assert kept == ["다", "나"]
@@ -0,0 +1,119 @@
+import pytest
+
+import robots_service
+from cache_store import TwoTierCache
+from robots_service import RobotsRules
+
+_ROBOTS = """
+# 특정 봇 전용 그룹 — 우리 요청에는 적용되지 않음
+User-agent: Googlebot
+Disallow: /
+
+User-agent: BadBot
+User-agent: *
+Disallow: /private
+Allow: /private/press
+DISALLOW: /*.pdf$          # 키 대소문자 무시, 주석 제거
+Disallow: /tmp/*/cache
+Disallow: /search?q=
+Allow: /same
+Disallow: /same
+
+User-agent: OtherBot
+Allow: /private
+"""
+
+
+@pytest.fixture(scope="module")
+def rules():
+    return RobotsRules.parse(_ROBOTS)
+
+
+def _allowed(rules, path):
+    return rules.decide("https://example.com" + path)[0]
+
+
+def test_only_star_group_applies(rules):
+    assert _allowed(rules, "/")                          # Googlebot 그룹의 Disallow: / 는 무시
+    assert not _allowed(rules, "/private/x")             # OtherBot 그룹의 Allow도 무시
+    patterns = {p for _, p, _ in rules._rules}
+    assert "/" not in patterns
+
+
+def test_star_shares_group_with_other_agents():
+    r = RobotsRules.parse("User-agent: a\nUser-agent: *\nUser-agent: b\nDisallow: /x\n")
+    assert not _allowed(r, "/x")
+
+
+def test_star_groups_are_merged():
+    r = RobotsRules.parse("User-agent: *\nDisallow: /a\n\nUser-agent: foo\nDisallow: /b\n\n"
+                          "User-agent: *\nDisallow: /c\n")
+    assert [_allowed(r, p) for p in ("/a", "/b", "/c")] == [False, True, False]
+
+
+def test_longest_match_wins(rules):
+    assert not _allowed(rules, "/private")
+    assert _allowed(rules, "/private/press/2024")
+    assert _allowed(rules, "/private/pressroom")          # 규칙은 접두사 일치
+    assert _allowed(rules, "/public")
+
+
+def test_equal_length_tie_prefers_allow(rules):
+    assert _allowed(rules, "/same")
+    assert _allowed(rules, "/same/deeper")
+    allowed, rule = rules.decide("https://example.com/same")
+    assert rule == "Allow: /same"
+    # 순서를 바꿔도 같음
+    r = RobotsRules.parse("User-agent: *\nDisallow: /page\nAllow: /page\n")
+    assert _allowed(r, "/page")
+
+
+def test_wildcard_and_end_anchor(rules):
+    assert not _allowed(rules, "/files/report.pdf")
+    assert _allowed(rules, "/files/report.pdf?download=1")   # $ → 끝 고정
+    assert _allowed(rules, "/files/report.pdfx")
+    assert not _allowed(rules, "/tmp/a/b/cache/item")        # * 는 / 포함 임의 문자열
+    assert _allowed(rules, "/tmp/cache")
+
+
+def test_query_string_is_part_of_path(rules):
+    assert not _allowed(rules, "/search?q=robots")
+    assert _allowed(rules, "/search")
+    assert _allowed(rules, "/search?page=2")
+
+
+def test_root_only_allow_with_dollar():
+    r = RobotsRules.parse("User-agent: *\nDisallow: /\nAllow: /$\n")
+    assert _allowed(r, "/") and _allowed(r, "")
+    assert not _allowed(r, "/anything")
+
+
+def test_regex_metacharacters_are_literal():
+    r = RobotsRules.parse("User-agent: *\nDisallow: /a+b(c)\n")
+    assert not _allowed(r, "/a+b(c)/d")
+    assert _allowed(r, "/aab(c)")
+
+
+def test_empty_disallow_and_empty_file_allow_everything():
+    assert _allowed(RobotsRules.parse("User-agent: *\nDisallow:\n"), "/x")
+    assert RobotsRules.parse("").decide("https://example.com/x") == (True, None)
+
+
+def test_service_reports_rule_and_fetch_notes(monkeypatch):
+    svc = robots_service.RobotsService()
+    svc._disk = TwoTierCache("robots_test", backend="memory")
+    bodies = {"https://a.example": {"text": "User-agent: *\nDisallow: /no\n", "note": ""},
+              "https://b.example": {"text": "", "note": "robots.txt 없음 (기본 허용)"}}
+    calls = []
+
+    def fake_fetch(origin):
+        calls.append(origin)
+        return bodies[origin]
+
+    monkeypatch.setattr(svc, "_fetch", fake_fetch)
+    svc.prefetch(["https://a.example/no", "https://A.example/yes", "https://b.example/no"])
+    assert sorted(calls) == ["https://a.example", "https://b.example"]   # 도메인당 한 번
+    assert svc.can_fetch("https://a.example/no/1") == (False, "robots.txt 금지 (Disallow: /no)")
+    assert svc.can_fetch("https://a.example/yes") == (True, "robots.txt 허용")
+    assert svc.can_fetch("https://b.example/no") == (True, "robots.txt 없음 (기본 허용)")
+    assert len(calls) == 2
@@ -0,0 +1,72 @@
+import pytest
+
+import ssml_converter as sc
+from cache_store import TwoTierCache
+
+
+@pytest.fixture
+def llm(monkeypatch):
+    """LLM 호출을 가로채는 스텁. responses에 응답을 넣고, calls로 프롬프트 확인."""
+    class _Stub:
+        def __init__(self):
+            self.calls = []
+            self.responses = []
+
+        def __call__(self, prompt, *a, **kw):
+            self.calls.append(prompt)
+            return self.responses.pop(0) if self.responses else None
+
+    stub = _Stub()
+    monkeypatch.setattr(sc, "_complete_with_any_llm", stub)
+    monkeypatch.setattr(sc, "_LLM_CACHE", TwoTierCache("test_llm", backend="memory"))
+    return stub
+
+
+def test_parse_numbered_lines():
+    raw = "1. 첫째\n3) 셋째\n잡음 줄\n  2.   둘째  \n"
+    assert sc._parse_numbered_lines(raw, 3) == ["첫째", "둘째", "셋째"]
+
+
+def test_parse_numbered_lines_missing_extra_and_duplicates():
+    raw = "2. 둘째\n2. 중복은 무시\n5. 범위 밖\n0. 범위 밖\n1.\n"
+    assert sc._parse_numbered_lines(raw, 3) == ["", "둘째", ""]
+    assert sc._parse_numbered_lines("", 2) == ["", ""]
+    assert sc._parse_numbered_lines(None, 1) == [""]
+
+
+def test_batch_fills_missing_lines_with_fallback(llm):
+    lines = ["첫 번째 문장입니다", "두 번째 문장입니다", "세 번째 문장입니다"]
+    # 3줄 요청에 2줄만 돌아옴 (2번 누락)
+    llm.responses.append('1. <prosody rate="100%">첫 번째 문장입니다</prosody>\n'
+                         '3. <prosody rate="100%">세 번째 문장입니다</prosody>')
+    out = sc.convert_lines_to_ssml_batch(lines, batch_size=10, max_workers=1)
+    assert len(llm.calls) == 1
+    assert out[0] == '<prosody rate="100%">첫 번째 문장입니다</prosody>'
+    assert out[1] == sc._fallback_line_to_ssml(sc._preprocess_ssml_line(lines[1]))
+    assert out[2] == '<prosody rate="100%">세 번째 문장입니다</prosody>'
+
+    # 응답에 있던 줄만 캐시됨 → 다시 부르면 누락 줄만 LLM으로
+    llm.responses.append('1. <prosody rate="100%">두 번째 문장입니다</prosody>')
+    again = sc.convert_lines_to_ssml_batch(lines, batch_size=10, max_workers=1)
+    assert len(llm.calls) == 2
+    assert "두 번째 문장입니다" in llm.calls[1] and "첫 번째 문장입니다" not in llm.calls[1]
+    assert again[1] == '<prosody rate="100%">두 번째 문장입니다</prosody>'
+
+
+def test_batch_ignores_extra_lines_and_keeps_order(llm):
+    llm.responses.append("1. <prosody>가</prosody>\n2. <prosody>나</prosody>\n3. <prosody>남는 줄</prosody>")
+    out = sc.convert_lines_to_ssml_batch(["가", "", "나", "가"], batch_size=10, max_workers=1)
+    assert out == ["<prosody>가</prosody>", "", "<prosody>나</prosody>", "<prosody>가</prosody>"]
+
+
+def test_batch_without_llm_uses_fallback_for_all(llm):
+    out = sc.convert_lines_to_ssml_batch(["하나", "둘"], batch_size=1, max_workers=2)
+    assert len(llm.calls) == 2
+    assert out == [sc._fallback_line_to_ssml("하나"), sc._fallback_line_to_ssml("둘")]
+
+
+def test_single_line_cached_empty_string_is_a_hit(llm):
+    prompt = sc.SSML_PROMPT.replace("{{USER_SCRIPT}}", "빈 결과 문장")
+    sc._llm_cache_put(prompt, "")
+    assert sc.convert_line_to_ssml("빈 결과 문장") == ""
+    assert llm.calls == []
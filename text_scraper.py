@@ -1,5 +1,4 @@
 import requests
-from bs4 import BeautifulSoup
 from googlesearch import search
 import os   
 import re
@@ -8,59 +7,24 @@ import concurrent.futures
 from collections import defaultdict
 from urllib.parse import urlparse, urljoin
 import threading
-from urllib.robotparser import RobotFileParser
 from config import *
+from robots_service import get_robots_service
+from html_extract import extract_main_text, decode_html, header_charset
+from noise_filter import filter_text, filter_noise_batch
 
 # robots.txt 확인 설정
 ROBOTS_CHECK_ENABLED = True  # robots.txt 확인 활성화
-ROBOTS_TIMEOUT = 10  # robots.txt 요청 타임아웃
 
 # 크롤링 제한 설정
 MAX_CRAWL_LIMIT = 70  # 최대 크롤링 개수 제한
 
 def check_robots_txt(url):
-    """robots.txt 확인하여 스크래핑 허용 여부 판단"""
+    """robots.txt 확인하여 스크래핑 허용 여부 판단 (도메인별 1회 조회·파싱, 디스크 캐시)"""
     if not ROBOTS_CHECK_ENABLED:
         return True, "robots.txt 확인 비활성화"
     
     try:
-        parsed_url = urlparse(url)
-        robots_url = f"{parsed_url.scheme}://{parsed_url.netloc}/robots.txt"
-        
-        # robots.txt 요청
-        response = requests.get(robots_url, timeout=ROBOTS_TIMEOUT)
-        
-        if response.status_code == 404:
-            return True, "robots.txt 없음 (기본 허용)"
-        
-        if response.status_code != 200:
-            return True, f"robots.txt 접근 실패 ({response.status_code})"
-        
-        # robots.txt 내용 파싱
-        robots_content = response.text
-        path_analysis = analyze_robots_paths(robots_content, parsed_url.path)
-        
-        # RobotFileParser로 파싱
-        rp = RobotFileParser()
-        rp.set_url(robots_url)
-        rp.read()
-        
-        # User-agent: * 에 대한 허용 여부 확인
-        can_fetch = rp.can_fetch("*", url)
-        
-        if can_fetch:
-            if path_analysis:
-                return True, f"robots.txt 허용 ({path_analysis})"
-            else:
-                return True, "robots.txt 허용"
-        else:
-            if path_analysis:
-                return False, f"robots.txt 금지 ({path_analysis})"
-            else:
-                return False, "robots.txt 금지"
-            
-    except requests.exceptions.Timeout:
-        return True, "robots.txt 타임아웃 (기본 허용)"
+        return get_robots_service().can_fetch(url)
     except Exception as e:
         return True, f"robots.txt 확인 실패: {str(e)}"
 
@@ -172,6 +136,13 @@ def get_links(query, num=30):
         print(f"[-] 링크 검색 실패: {e}")
         return []
 
+def extract_text_from_html(html):
+    """HTML → 본문 텍스트 (requests 경로와 crawl_engine 경로가 공유)"""
+    # lxml 파싱 + 텍스트 밀도 점수로 본문 블록만 추출 (내비/광고/댓글 영역 제외)
+    text = extract_main_text(html, separator=" ")
+    # 한글, 영문, 숫자, 공백, 일부 특수문자만 남기기
+    return re.sub(r'[^가-힣a-zA-Z0-9 .,!?\n\r\t]', '', text)
+
 def clean_html_worker(args):
     url, url_index = args
     start_time = time.time()
@@ -190,17 +161,9 @@ def clean_html_worker(args):
             }
         
         response = requests.get(url, **request_kwargs)
-        response.encoding = response.apparent_encoding  # 인코딩 자동 감지 추가
-        soup = BeautifulSoup(response.text, "html.parser")
-        
-        # 불필요한 태그 제거
-        for tag in soup(["script", "style", "footer", "nav", "form", "header", "aside", "iframe"]):
-            tag.decompose()
-        
-        # 텍스트 추출 및 정리
-        text = soup.get_text(separator=" ", strip=True)
-        # 한글, 영문, 숫자, 공백, 일부 특수문자만 남기기
-        text = re.sub(r'[^가-힣a-zA-Z0-9 .,!?\n\r\t]', '', text)
+        # 선언된 인코딩(헤더 → meta) 우선, 전체 본문 chardet 추정은 하지 않음
+        html = decode_html(response.content, header_charset(response.headers.get("Content-Type")))
+        text = extract_text_from_html(html)
         
         elapsed = time.time() - start_time
         if SHOW_DETAILED_PROGRESS:
@@ -238,13 +201,18 @@ def clean_html_worker(args):
         }
 
 def check_robots_for_urls(urls):
-    """URL 목록에 대해 robots.txt 확인"""
+    """URL 목록에 대해 robots.txt 확인 (도메인별 robots.txt를 먼저 동시에 받아 둔 뒤 메모리에서 판정)"""
     print(f"\n[+] robots.txt 확인 중... ({len(urls)}개 사이트)")
     
+    if ROBOTS_CHECK_ENABLED:
+        start_time = time.time()
+        get_robots_service().prefetch(urls)
+        domains = len({urlparse(u).netloc for u in urls})
+        print(f"[+] robots.txt {domains}개 도메인 준비 완료 ({time.time() - start_time:.2f}초)")
+    
     robots_results = []
     for i, url in enumerate(urls):
         domain = urlparse(url).netloc
-        print(f"[{i+1:2d}] robots.txt 확인: {domain}")
         
         is_allowed, reason = check_robots_txt(url)
         robots_results.append({
@@ -409,37 +377,8 @@ def clean_html_parallel(urls):
     return results
 
 def filter_noise(text):
-    ad_patterns = [
-        r"배너\s?(광고|클릭)", r"광고문의", r"마케팅\s?문의",
-        r"제휴\s?(문의|링크)", r"구매\s?링크", r"프로모션", r"스폰서", r"광고\s?수익",
-        r"후원\s?(계좌|링크|문의|해주시면|받습니다|바랍니다)", r"아래.*후원", r"후원해\s?주세요",
-        r"협찬\s?(문의|링크|해주시면)", r"쿠팡\s?파트너스", r"구매링크",
-        r"이 글은 .*? 광고를 포함하고 있습니다",
-        r"이 포스트는 .*? 후원을 받고 작성되었습니다",
-        r"광고성 문구", r"유료 광고", r"제휴 마케팅", r"체험단",
-        r"Sponsored by", r"이벤트 참여", r"이벤트 안내", r"채널 가입"
-    ]
-    ad_regex = re.compile("|".join(ad_patterns), re.IGNORECASE)
-    lines = text.split('\n')
-    filtered = []
-    for line in lines:
-        line_stripped = line.strip()
-        # 1. 너무 짧은 줄 제거
-        if len(line_stripped) <= 30:
-            continue
-        # 2. 광고/스팸 패턴 제거
-        if ad_regex.search(line_stripped):
-            continue
-        # 3. 이메일, 오픈채팅, 연락처 등 제거
-        if re.search(r'([a-zA-Z0-9_.+-]+@[a-zA-Z0-9-]+\.[a-zA-Z0-9-.]+)|(오픈채팅)|(카톡)|(연락처)|(문의:)', line_stripped):
-            continue
-        # 4. 알파벳/숫자 비율이 80% 이상이면 제거 (난수/해시/코드 등)
-        if len(line_stripped) > 10:
-            ratio = sum(c.isalnum() for c in line_stripped) / len(line_stripped)
-            if ratio > 0.8:
-                continue
-        filtered.append(line_stripped)
-    return "\n".join(filtered)
+    # 규칙/정규식은 noise_filter에서 한 번만 컴파일해 공유
+    return filter_text(text)
 
 def print_texts(text_list, url_list):
     """수집된 텍스트를 print문으로 출력"""
@@ -569,13 +508,15 @@ if __name__ == "__main__":
     domain_count_final = defaultdict(int)
     
     print(f"[+] 크롤링 결과 분석 중...")
+    # 성공한 문서를 한 번에 필터링 (문서 간 중복 줄 제거 포함)
+    filtered_texts = filter_noise_batch([r['text'] if r['success'] else "" for r in crawl_results])
     for i, result in enumerate(crawl_results):
         url = result['url']
         domain = urlparse(url).netloc
         domain_count_raw[domain] += 1
         
         if result['success']:
-            filtered = filter_noise(result['text'])
+            filtered = filtered_texts[i]
             if len(filtered) > MIN_TEXT_LENGTH:
                 texts.append(filtered)
                 used_urls.append(url)
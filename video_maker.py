@@ -3,7 +3,6 @@ from moviepy import (
     CompositeVideoClip, TextClip, ColorClip, CompositeAudioClip
 )
 import os
-import random
 import subprocess
 import numpy as np
 from moviepy.audio.AudioClip import AudioArrayClip, concatenate_audioclips
@@ -18,25 +17,11 @@ except Exception:
     except Exception:
         audio_loop = None
 
-from PIL import Image
-import hashlib
+from image_prep import prepare_images
+from motion_renderer import make_motion_clip
 
-_IMG_CACHE_DIR = os.path.join("assets", "cache_img")
-os.makedirs(_IMG_CACHE_DIR, exist_ok=True)
-
-def _precompress_img(src, max_w=720, max_h=1080, quality=85):
-    try:
-        sig = f"{src}:{os.path.getsize(src)}"
-        h = hashlib.md5(sig.encode()).hexdigest()[:12]
-        dst = os.path.join(_IMG_CACHE_DIR, f"{h}.jpg")
-        if os.path.exists(dst):
-            return dst
-        im = Image.open(src).convert("RGB")
-        im.thumbnail((max_w, max_h), Image.LANCZOS)  # 720x1080 캡
-        im.save(dst, "JPEG", quality=quality, optimize=True, progressive=True)
-        return dst
-    except Exception:
-        return src
+# 간단 모션(드리프트) 이동량(px). 전처리 단계에서 이만큼 여유를 두고 크롭
+_DRIFT_PX = 12
 
 def _st(msg):
     try:
@@ -57,126 +42,12 @@ def _loop_audio_manual(clip, duration):
     return looped.subclip(0, duration)
 
 def create_motion_clip(img_path, duration, width, height):
-    base_clip_original_size = ImageClip(img_path)
-
-    # 이미지 초기 리사이징 전략 변경: '커버' 방식으로 항상 화면을 가득 채움
-    scale_w = width / base_clip_original_size.w
-    scale_h = height / base_clip_original_size.h
-    
-    # 두 스케일 중 더 큰 값을 선택하여, 이미지가 비디오 프레임을 완전히 덮도록 함
-    scale_factor_cover = max(scale_w, scale_h)
-    
-    # Round를 사용하여 소수점 처리 오류 방지, 최소 크기 1 보장
-    resized_w_cover = max(1, round(base_clip_original_size.w * scale_factor_cover))
-    resized_h_cover = max(1, round(base_clip_original_size.h * scale_factor_cover))
-
-    # 새로운 '커버' 방식으로 리사이즈된 base_clip 생성
-    base_clip = base_clip_original_size.resized((resized_w_cover, resized_h_cover)).with_duration(duration)
-
-    clip_width = base_clip.w
-    clip_height = base_clip.h
-
-    motion_type = random.choice(["zoom_in_out", "left_to_right", "right_to_left", "static"])
-
-    # 중앙 정렬을 위한 기본 위치
-    center_x = round((width - clip_width) / 2)
-    center_y = round((height - clip_height) / 2)
-
-    if motion_type == "zoom_in_out":
-        start_scale = 1.0
-        end_scale = 1.05
-        scale_diff = end_scale - start_scale
-
-        # 화면에 꽉 채우도록 커버 리사이즈 먼저 진행
-        scale_w = width / base_clip_original_size.w
-        scale_h = height / base_clip_original_size.h
-        base_scale = max(scale_w, scale_h)
-
-        base_clip = base_clip_original_size.resized(base_scale).with_duration(duration)
-
-        def zoom_factor(t):
-            return start_scale + scale_diff * (t / duration)
-
-        def position(t):
-            scale = zoom_factor(t)
-            w_scaled = base_clip.w * scale
-            h_scaled = base_clip.h * scale
-            x = round((width - w_scaled) / 2)
-            y = round((height - h_scaled) / 2)
-            # y가 음수면 0으로 보정해서 아래 검은 여백 방지
-            if y < 0:
-                y = 0
-            return (x, y)
-
-        zoomed_clip = base_clip.resized(zoom_factor).with_position(position)
-
-        return zoomed_clip
-
-
-    elif motion_type == "left_to_right":
-        if clip_width > width:
-            max_move = clip_width - width
-
-            # 💡 차이가 아주 작으면 거의 고정 (예: 30픽셀 이하)
-            if max_move < 30:
-                return base_clip.with_position((center_x, center_y))
-
-            start_ratio = 0.3
-            end_ratio = 0.6
-            move_ratio = end_ratio - start_ratio
-
-            start_offset = -max_move * start_ratio
-            move_distance = max_move * move_ratio
-
-            def ease_in_out(t):
-                progress = t / duration
-                return 3 * (progress ** 2) - 2 * (progress ** 3)
-
-            def position(t):
-                eased = ease_in_out(t)
-                x = round(start_offset + move_distance * eased)
-                y = center_y
-                return (x, y)
-
-            return base_clip.with_position(position)
-        else:
-            return base_clip.with_position((center_x, center_y))
-
-
-    elif motion_type == "right_to_left":
-        if clip_width > width:
-            max_move = clip_width - width
-
-            # 💡 차이가 아주 작으면 거의 고정
-            if max_move < 30:
-                return base_clip.with_position((center_x, center_y))
-
-            start_ratio = 0.3
-            end_ratio = 0.6
-            move_ratio = end_ratio - start_ratio
-
-            start_offset = -max_move * end_ratio
-            move_distance = max_move * move_ratio
-
-            def ease_in_out(t):
-                progress = t / duration
-                return 3 * (progress ** 2) - 2 * (progress ** 3)
-
-            def position(t):
-                eased = ease_in_out(t)
-                x = round(start_offset - move_distance * eased)
-                y = center_y
-                return (x, y)
-
-            return base_clip.with_position(position)
-        else:
-            return base_clip.with_position((center_x, center_y))
-
-
-    else: # "static" (고정)
-        # 이미지가 프레임 중앙에 고정되어 잘리지 않고 보여집니다.
-        # round()를 사용하여 소수점 처리 오류 방지
-        return base_clip.with_position((center_x, center_y))
+    """
+    랜덤 모션(zoom_in_out / left_to_right / right_to_left / static) 클립.
+    - cover 이미지를 한 번만 만들고 프레임마다 정수 크롭(+줌은 1회 리사이즈)만 수행
+      (ImageClip.resized(시간함수)처럼 매 프레임 전체 이미지를 리샘플하지 않음)
+    """
+    return make_motion_clip(img_path, duration, width, height)
     
 def auto_split_title(text: str, max_first_line_chars=18):
     words = text.split()
@@ -234,24 +105,7 @@ def create_video_with_segments(
         s = Path(p).as_posix()
         return s.replace("'", r"'\''")
 
-    # ---------- 초고해상도 이미지 사전 다운스케일(캐시) ----------
-    _IMG_CACHE_DIR = os.path.join("assets", "cache_img")
-    os.makedirs(_IMG_CACHE_DIR, exist_ok=True)
-
-    def _precompress_img(src, max_w=720, max_h=1080, quality=85):
-        try:
-            sig = f"{src}:{os.path.getsize(src)}"
-            h = hashlib.md5(sig.encode()).hexdigest()[:12]
-            dst = os.path.join(_IMG_CACHE_DIR, f"{h}.jpg")
-            if os.path.exists(dst):
-                return dst
-            im = Image.open(src).convert("RGB")
-            im.thumbnail((max_w, max_h), Image.LANCZOS)
-            im.save(dst, "JPEG", quality=quality, optimize=True, progressive=True)
-            return dst
-        except Exception:
-            return src
-
+    # ---------- 이미지 사전 처리: cover 크롭 + 다운스케일(콘텐츠 해시 캐시, 프로세스 풀) ----------
     def _normalize_image_paths(paths, n_needed):
         paths = list(paths or [])
         if len(paths) < n_needed:
@@ -259,22 +113,16 @@ def create_video_with_segments(
             paths += [last_valid] * (n_needed - len(paths))
         elif len(paths) > n_needed:
             paths = paths[:n_needed]
-        return [(_precompress_img(p) if p and os.path.exists(p) else None) for p in paths]
+        # 드리프트 여유분(_DRIFT_PX)까지 포함한 cover 프레임으로 한 번에 처리
+        return prepare_images(paths, size=(W + _DRIFT_PX, H + _DRIFT_PX))
 
     image_paths = _normalize_image_paths(image_paths, len(segments))
 
     # ---------- 간단 모션(케빈 번즈) ----------
     def create_motion_clip(img_path, duration, width, height):
+        # 전처리된 (W+드리프트, H+드리프트) 이미지에서 매 프레임 정수 크롭만 → 리사이즈/할당 없음
         try:
-            base = ImageClip(img_path)
-            scale = max(width / base.w, height / base.h)
-            clip = base.resized(scale).with_duration(duration)
-            def pos(t):
-                if duration <= 0:
-                    return (0, 0)
-                prog = t / duration
-                return (-12 * (1 - prog), -12 * (1 - prog))
-            return clip.with_position(pos)
+            return make_motion_clip(img_path, duration, width, height, motion="static", drift_px=_DRIFT_PX)
         except Exception:
             return ColorClip(size=(width, height), color=(0, 0, 0)).with_duration(duration)
 